@@ -0,0 +1,33 @@
+"""Add composite index on transactions (portfolio_id, trade_date, created_at)
+
+Revision ID: 4b7e2d91c0a3
+Revises: 826f690d3c45
+Create Date: 2026-10-19 10:12:31.418206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2d91c0a3'
+down_revision: Union[str, Sequence[str], None] = '826f690d3c45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_portfolio_trade_created',
+        'transactions',
+        ['portfolio_id', 'trade_date', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_portfolio_trade_created', table_name='transactions')
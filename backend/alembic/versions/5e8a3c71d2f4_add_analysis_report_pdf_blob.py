@@ -0,0 +1,30 @@
+"""Add PDF blob reference to analysis_reports
+
+Revision ID: 5e8a3c71d2f4
+Revises: 9c1f4e6a2b7d
+Create Date: 2026-10-19 16:20:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a3c71d2f4'
+down_revision: Union[str, Sequence[str], None] = '9c1f4e6a2b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analysis_reports', sa.Column('pdf_blob_key', sa.String(length=500), nullable=True))
+    op.add_column('analysis_reports', sa.Column('pdf_sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analysis_reports', 'pdf_sha256')
+    op.drop_column('analysis_reports', 'pdf_blob_key')
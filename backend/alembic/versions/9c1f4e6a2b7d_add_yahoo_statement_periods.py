@@ -0,0 +1,35 @@
+"""Add yahoo_statement_periods table
+
+Revision ID: 9c1f4e6a2b7d
+Revises: 4b7e2d91c0a3
+Create Date: 2026-10-19 14:05:12.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1f4e6a2b7d'
+down_revision: Union[str, Sequence[str], None] = '4b7e2d91c0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('yahoo_statement_periods',
+    sa.Column('ticker', sa.String(length=20), nullable=False),
+    sa.Column('statement', sa.String(length=20), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('line_items', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('ticker', 'statement', 'period', name='yahoo_statement_periods_pk')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('yahoo_statement_periods')
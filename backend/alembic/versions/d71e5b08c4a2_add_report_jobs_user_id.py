@@ -0,0 +1,34 @@
+"""Scope report_jobs to their owner
+
+Revision ID: d71e5b08c4a2
+Revises: b3d9f2a6e817
+Create Date: 2026-10-19 19:05:12.402318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71e5b08c4a2'
+down_revision: Union[str, Sequence[str], None] = 'b3d9f2a6e817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # jobs queued before ownership existed cannot be attributed to anyone
+    op.execute("DELETE FROM report_jobs")
+    op.add_column('report_jobs', sa.Column('user_id', sa.UUID(), nullable=False))
+    op.create_index(op.f('ix_report_jobs_user_id'), 'report_jobs', ['user_id'], unique=False)
+    op.create_foreign_key('report_jobs_user_id_fkey', 'report_jobs', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('report_jobs_user_id_fkey', 'report_jobs', type_='foreignkey')
+    op.drop_index(op.f('ix_report_jobs_user_id'), table_name='report_jobs')
+    op.drop_column('report_jobs', 'user_id')
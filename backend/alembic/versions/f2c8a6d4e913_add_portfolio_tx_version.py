@@ -0,0 +1,28 @@
+"""Add tx_version to portfolios
+
+Revision ID: f2c8a6d4e913
+Revises: d71e5b08c4a2
+Create Date: 2026-10-19 19:31:47.220915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a6d4e913'
+down_revision: Union[str, Sequence[str], None] = 'd71e5b08c4a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('portfolios', sa.Column('tx_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('portfolios', 'tx_version')
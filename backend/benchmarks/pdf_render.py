@@ -0,0 +1,306 @@
+# benchmarks/pdf_render.py
+"""
+Render-cost benchmark for pdf.generator.EnhancedPDFGenerator.
+
+Fixture reports are built offline from synthetic statements (4 or 10 years, 10 quarters)
+through the same metrics, DCF and EPS code as /yahoo-profile, then rendered per scenario.
+Each run is split into the Sections.* builders the template calls and the doc.build
+(layout + drawing) phase; peak Python memory comes from a separate tracemalloc run.
+
+    cd backend && python -m benchmarks.pdf_render [--repeat 5] [--scenario standard-10y]
+                                                  [--save baseline.json] [--compare baseline.json]
+
+--check-static instead verifies the pre-rendered static sections (pdf/static_sections.py)
+against their live Sections builders for every template; run it after upgrading ReportLab.
+"""
+import argparse
+import base64
+import inspect
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+import reportlab
+from reportlab.platypus import SimpleDocTemplate
+
+import pdf.generator
+from pdf.generator import EnhancedPDFGenerator
+from pdf.sections import Sections
+from pdf.static_sections import STATIC_SECTIONS
+from routers.report_batch import profile_to_report
+from routers.yahoo_fetcher import profile_from_financials
+from services.yahoo_financials import QUARTERLY_ROW_MAP
+
+# name -> (template_type, years of annual data)
+SCENARIOS = {
+    "small": ("executive", 4),
+    "standard-4y": ("standard", 4),
+    "standard-10y": ("standard", 10),
+    "detailed-4y": ("detailed", 4),
+    "detailed-10y": ("detailed", 10),
+}
+
+LAST_YEAR = 2024
+
+
+def fixture_financials(years: int, seed: int = 0) -> dict:
+    """fetch_yahoo_financials()-shaped result for a steadily growing company (crores)."""
+    rng = np.random.default_rng(seed)
+    labels = [f"Mar-{y}" for y in range(LAST_YEAR - years + 1, LAST_YEAR + 1)]
+    growth = np.cumprod(1 + rng.normal(0.12, 0.05, years))
+    sales = (20000 * growth).round(2)
+
+    def share(pct, noise=0.01):
+        return list((sales * (pct + rng.normal(0, noise, years))).round(2))
+
+    ebit = np.array(share(0.18))
+    interest = np.array(share(0.015, 0.002))
+    tax = ((ebit - interest) * 0.25).round(2)
+    pnl = {
+        "Sales": list(sales),
+        "EBITDA": share(0.22),
+        "EBIT": list(ebit),
+        "Interest": list(interest),
+        "Net profit": list((ebit - interest - tax).round(2)),
+        "Tax": list(tax),
+        "Depreciation": share(0.04, 0.003),
+    }
+    balance_sheet = {
+        "Equity Share Capital": share(0.6, 0.05),
+        "Borrowings": share(0.2, 0.03),
+        "Investments": share(0.05, 0.01),
+        "Cash & Bank": share(0.08, 0.02),
+        "Net Block": share(0.45, 0.03),
+        "Capital Work in Progress": share(0.03, 0.01),
+        "No. of Equity Shares": [3.6e9] * years,
+    }
+    cashflow = {
+        "Cash from Operating Activity": share(0.16),
+        "Cash from Investing Activity": [-v for v in share(0.09)],
+        "Cash from Financing Activity": [-v for v in share(0.05)],
+        "Net Cash Flow": share(0.02, 0.01),
+    }
+
+    qtrs = [f"{m}-{y}" for y in (LAST_YEAR - 2, LAST_YEAR - 1, LAST_YEAR) for m in ("Mar", "Jun", "Sep", "Dec")][-10:]
+    q_sales = sales[-1] / 4 * np.linspace(0.85, 1.05, len(qtrs))
+    ratios = {"Sales": 1.0, "Operating Profit": 0.22, "Depreciation": 0.04, "Interest": 0.015, "Net profit": 0.11}
+    quarters = {item: list((q_sales * ratios[item]).round(2)) for item in QUARTERLY_ROW_MAP}
+
+    return {
+        "company_info": {"name": f"Fixture Industries {years}Y", "ticker": "FIXTURE.NS", "sector": "Industrials"},
+        "info": {"currentPrice": 1850.0, "marketCap": 6.6e12},
+        "pnl": pnl, "balance_sheet": balance_sheet, "cashflow": cashflow, "quarters": quarters,
+        "years": labels, "qtrs": qtrs,
+        "periods": {"pnl": labels, "balance_sheet": labels, "cashflow": labels},
+    }
+
+
+def fixture_report(years: int, seed: int = 0) -> dict:
+    report = profile_to_report("FIXTURE.NS", profile_from_financials(fixture_financials(years, seed)))
+    report["executiveSummary"] = {"recommendation": "BUY", "highlights": {"Moat": "Cost leadership", "Balance sheet": "Low leverage"}}
+    return report
+
+
+class _Recorder:
+    """Times top-level Sections.* calls and SimpleDocTemplate.build; nested calls count toward their caller."""
+
+    def __init__(self):
+        self.sections = defaultdict(float)
+        self.build = 0.0
+        self.pages = 0
+        self._depth = 0
+
+    def _timed(self, name, fn):
+        def wrapper(*args, **kwargs):
+            if self._depth:
+                return fn(*args, **kwargs)
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._depth -= 1
+                if name == "doc.build":
+                    self.build += elapsed
+                    self.pages = args[0].page
+                else:
+                    self.sections[name] += elapsed
+        return wrapper
+
+
+@contextmanager
+def recording():
+    recorder = _Recorder()
+    originals = {}
+    for name, attr in list(vars(Sections).items()):
+        if name.startswith("_"):
+            continue
+        # a few builders are plain functions on the class rather than staticmethods
+        fn = attr.__func__ if isinstance(attr, staticmethod) else attr if inspect.isfunction(attr) else None
+        if fn is not None:
+            originals[name] = attr
+            setattr(Sections, name, staticmethod(recorder._timed(name, fn)))
+    build = SimpleDocTemplate.build
+    SimpleDocTemplate.build = recorder._timed("doc.build", build)
+    try:
+        yield recorder
+    finally:
+        SimpleDocTemplate.build = build
+        for name, attr in originals.items():
+            setattr(Sections, name, attr)
+
+
+def run_scenario(report: dict, template_type: str, repeat: int) -> dict:
+    generator = EnhancedPDFGenerator()
+    generator.generate_pdf(report, template_type)  # warm-up: imports, font metrics
+
+    totals, builds, per_section = [], [], defaultdict(list)
+    for _ in range(repeat):
+        with recording() as rec:
+            started = time.perf_counter()
+            pdf_bytes = generator.generate_pdf(report, template_type)
+            totals.append(time.perf_counter() - started)
+        builds.append(rec.build)
+        for name, elapsed in rec.sections.items():
+            per_section[name].append(elapsed)
+
+    tracemalloc.start()
+    generator.generate_pdf(report, template_type)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = lambda values: round(statistics.median(values) * 1000, 2)
+    return {
+        "template": template_type,
+        "total_ms": ms(totals),
+        "build_ms": ms(builds),
+        "sections_ms": {name: ms(values) for name, values in sorted(per_section.items(), key=lambda kv: -statistics.median(kv[1]))},
+        "pages": rec.pages,
+        "bytes": len(pdf_bytes),
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+def _streams(pdf_bytes: bytes) -> list:
+    """Decoded content of every stream in a ReportLab PDF (Flate, optionally ASCII85 on top)."""
+    out = []
+    for m in re.finditer(rb"<<(.*?)>>\s*stream\r?\n(.*?)endstream", pdf_bytes, re.S):
+        header, body = m.group(1), m.group(2)
+        if b"ASCII85Decode" in header:
+            body = base64.a85decode(body.strip(), adobe=True)
+        if b"FlateDecode" in header:
+            body = zlib.decompress(body)
+        out.append((header, body))
+    return out
+
+
+def check_static_sections() -> list:
+    """
+    Render the fixture report through the pre-rendered static sections and through their live
+    Sections builders; returns a list of problems (empty when they agree). The recording copies
+    ReportLab internals (canvas operators, frame cursor, font mapping), so this guards upgrades.
+    """
+    report = fixture_report(4)
+    generator = EnhancedPDFGenerator()
+    live = lambda name: STATIC_SECTIONS[name][1]()
+    problems = []
+    for template_type in ("standard", "executive", "detailed", "valuation_focused"):
+        static_pdf = generator.generate_pdf(report, template_type)
+        stitched = pdf.generator.static_section
+        pdf.generator.static_section = live
+        try:
+            live_pdf = generator.generate_pdf(report, template_type)
+        finally:
+            pdf.generator.static_section = stitched
+
+        pages = [len(re.findall(rb"/Type /Page\b", b)) for b in (static_pdf, live_pdf)]
+        if pages[0] != pages[1]:
+            problems.append(f"{template_type}: {pages[0]} pages with static sections, {pages[1]} with live builders")
+        for name in STATIC_SECTIONS:
+            if f"/FormXob.static_{name}_".encode() not in static_pdf:
+                problems.append(f"{template_type}: no form for static section {name}")
+        forms = b"".join(body for header, body in _streams(static_pdf) if b"/Subtype /Form" in header)
+        missing = set(re.findall(rb"/(F\d+) [\d.]+ Tf", forms)) - set(re.findall(rb"/(F\d+) \d+ 0 R", static_pdf))
+        if missing:
+            problems.append(f"{template_type}: forms use undefined fonts {sorted(missing)}")
+        text = lambda pdf_bytes: re.findall(rb"\((.*?)\) Tj", b"".join(body for _, body in _streams(pdf_bytes)))
+        lost = set(text(live_pdf)) - set(text(static_pdf))
+        if lost:
+            problems.append(f"{template_type}: text missing with static sections: {sorted(lost)[:3]}")
+    return problems
+
+
+def _delta(new, old) -> str:
+    if not old:
+        return ""
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="default: all")
+    parser.add_argument("--sections", type=int, default=6, help="slowest Sections.* builders to list per scenario")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="show changes against a saved baseline")
+    parser.add_argument("--check-static", action="store_true", help="verify pre-rendered static sections and exit")
+    args = parser.parse_args()
+
+    if args.check_static:
+        problems = check_static_sections()
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        print(f"static sections: {'FAILED' if problems else 'ok'} (reportlab {reportlab.Version})")
+        sys.exit(1 if problems else 0)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["scenarios"]
+
+    results = {}
+    reports = {}
+    for name in args.scenario or SCENARIOS:
+        template_type, years = SCENARIOS[name]
+        if years not in reports:
+            reports[years] = fixture_report(years)
+        results[name] = run_scenario(reports[years], template_type, args.repeat)
+
+    print(f"median of {args.repeat} runs; peak = tracemalloc peak of one run")
+    print(f"{'scenario':<14}{'template':<11}{'pages':>6}{'KB':>7}{'total ms':>10}{'build ms':>10}{'sections ms':>13}{'peak MiB':>10}")
+    for name, r in results.items():
+        old = baseline.get(name, {})
+        sections_ms = sum(r["sections_ms"].values())
+        print(
+            f"{name:<14}{r['template']:<11}{r['pages']:>6}{r['bytes'] / 1024:>7.0f}"
+            f"{r['total_ms']:>10.1f}{r['build_ms']:>10.1f}{sections_ms:>13.1f}{r['peak_mib']:>10.2f}"
+            + (f"   total {_delta(r['total_ms'], old.get('total_ms'))}, build {_delta(r['build_ms'], old.get('build_ms'))},"
+               f" peak {_delta(r['peak_mib'], old.get('peak_mib'))}" if old else "")
+        )
+    for name, r in results.items():
+        slowest = list(r["sections_ms"].items())[: args.sections]
+        print(f"\n{name}: " + ", ".join(f"{section} {value:.1f}" for section, value in slowest))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "reportlab": reportlab.Version,
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "scenarios": results,
+            }, f, indent=2)
+        print(f"\nbaseline written to {args.save}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,52 @@ class Settings(BaseSettings):
     SMTP_PASS: Optional[str] = os.getenv("SMTP_PASS")
     FROM_EMAIL: Optional[str] = os.getenv("FROM_EMAIL")
 
+    # ===== Market data / caching =====
+    QUOTE_TTL_SECONDS: int = int(os.getenv("QUOTE_TTL_SECONDS", 60))           # last-price freshness window
+    SUMMARY_CACHE_MAX_ENTRIES: int = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", 512))
+    YAHOO_STATEMENTS_TTL_SECONDS: int = int(os.getenv("YAHOO_STATEMENTS_TTL_SECONDS", 6 * 60 * 60))  # annual + quarterly statements
+    YAHOO_STATEMENTS_CACHE_MAX_ENTRIES: int = int(os.getenv("YAHOO_STATEMENTS_CACHE_MAX_ENTRIES", 256))
+    YAHOO_HISTORY_YEARS: int = int(os.getenv("YAHOO_HISTORY_YEARS", 4))           # default annual depth, as before; /yahoo-profile?years= for more
+
+    # ===== Worker pools =====
+    UPLOAD_WORKERS: int = int(os.getenv("UPLOAD_WORKERS", 2))                  # processes for /upload-excel
+    UPLOAD_MAX_PENDING: int = int(os.getenv("UPLOAD_MAX_PENDING", 8))          # running + queued before 429
+    UPLOAD_TIMEOUT_SECONDS: float = float(os.getenv("UPLOAD_TIMEOUT_SECONDS", 60))
+
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", 25 * 1024 * 1024))                     # per workbook
+    UPLOAD_SPOOL_THRESHOLD_BYTES: int = int(os.getenv("UPLOAD_SPOOL_THRESHOLD_BYTES", 1024 * 1024))  # larger uploads go to disk
+    UPLOAD_SPOOL_DIR: Optional[str] = os.getenv("UPLOAD_SPOOL_DIR")                                # default: system temp dir
+
+    UPLOAD_BATCH_MAX_FILES: int = int(os.getenv("UPLOAD_BATCH_MAX_FILES", 200))
+    UPLOAD_BATCH_MAX_BYTES: int = int(os.getenv("UPLOAD_BATCH_MAX_BYTES", 200 * 1024 * 1024))  # uncompressed total
+
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", 2))                        # processes for report rendering
+    PDF_MAX_PENDING: int = int(os.getenv("PDF_MAX_PENDING", 6))                # running + queued before 429
+    PDF_TIMEOUT_SECONDS: float = float(os.getenv("PDF_TIMEOUT_SECONDS", 90))
+
+    REPORT_JOB_CONCURRENCY: int = int(os.getenv("REPORT_JOB_CONCURRENCY", 1))                  # PDF workers queued jobs may occupy
+    REPORT_JOB_TIMEOUT_SECONDS: float = float(os.getenv("REPORT_JOB_TIMEOUT_SECONDS", 600))
+    REPORT_JOB_STALE_SECONDS: float = float(os.getenv("REPORT_JOB_STALE_SECONDS", 120))        # no progress this long: worker lost, re-run
+    REPORT_JOB_MAX_ATTEMPTS: int = int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", 3))
+    REPORT_JOB_MAX_ACTIVE_PER_USER: int = int(os.getenv("REPORT_JOB_MAX_ACTIVE_PER_USER", 5))  # queued + running before 429
+    REPORT_JOB_RETENTION_SECONDS: float = float(os.getenv("REPORT_JOB_RETENTION_SECONDS", 7 * 24 * 3600))  # finished jobs + PDFs
+
+    REPORT_BATCH_MAX_ITEMS: int = int(os.getenv("REPORT_BATCH_MAX_ITEMS", 50))                  # reports per /reports/batch
+    REPORT_BATCH_FETCH_CONCURRENCY: int = int(os.getenv("REPORT_BATCH_FETCH_CONCURRENCY", 4))  # parallel Yahoo profile lookups
+
+    # ===== Upload cache =====
+    WORKBOOK_CACHE_MAX_ENTRIES: int = int(os.getenv("WORKBOOK_CACHE_MAX_ENTRIES", 256))
+    WORKBOOK_CACHE_MAX_BYTES: int = int(os.getenv("WORKBOOK_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    # ===== Report cache =====
+    PDF_CACHE_DIR: Optional[str] = os.getenv("PDF_CACHE_DIR")                                  # default: <temp>/fundaiq-report-cache
+    PDF_CACHE_MAX_ENTRIES: int = int(os.getenv("PDF_CACHE_MAX_ENTRIES", 1000))
+    PDF_CACHE_MAX_BYTES: int = int(os.getenv("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+    # ===== Report storage =====
+    REPORT_BLOB_BACKEND: str = os.getenv("REPORT_BLOB_BACKEND", "local")
+    REPORT_BLOB_DIR: str = os.getenv("REPORT_BLOB_DIR", str(BACKEND_ROOT / "user_reports"))  # local backend root
+
     # Pydantic settings
     model_config = SettingsConfigDict(
         env_file=str(ENV_PATH),          # also read backend/.env if present
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Iterable, Optional
 
 from sqlalchemy.orm import Session
 from sqlalchemy import select
@@ -92,3 +92,36 @@ def get_fx_rate(db: Session, base: str, quote: str, as_of: date) -> Decimal:
         return v
 
     raise RuntimeError(f"FX rate not available for {base}/{quote} on {as_of}")
+
+def get_fx_rates(db: Session, pairs: Iterable[tuple[str, str, date]]) -> dict[tuple[str, str, date], Decimal]:
+    """
+    Batched get_fx_rate for many (base, quote, as_of) triples.
+    Cached rates are read with a single query; only the misses go through get_fx_rate.
+    Keys in the result are upper-cased.
+    """
+    wanted = {(b.upper(), q.upper(), d) for b, q, d in pairs}
+    out: dict[tuple[str, str, date], Decimal] = {}
+    pending = set()
+    for key in wanted:
+        if key[0] == key[1]:
+            out[key] = Decimal("1")
+        else:
+            pending.add(key)
+
+    if pending:
+        rows = db.execute(
+            select(FXRate.base, FXRate.quote, FXRate.as_of, FXRate.rate).where(
+                FXRate.base.in_({k[0] for k in pending}),
+                FXRate.quote.in_({k[1] for k in pending}),
+                FXRate.as_of.in_({k[2] for k in pending}),
+            )
+        ).all()
+        for base, quote, as_of, rate in rows:
+            key = (base, quote, as_of)
+            if key in pending:
+                out[key] = Decimal(rate)
+                pending.discard(key)
+
+    for base, quote, as_of in pending:
+        out[(base, quote, as_of)] = get_fx_rate(db, base, quote, as_of)
+    return out
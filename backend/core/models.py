@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, TIMESTAMP, func, ForeignKey, Column, Integer, Boolean, DateTime
+from typing import Optional
+from sqlalchemy import String, TIMESTAMP, func, ForeignKey, Column, Integer, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -57,6 +58,7 @@ class Portfolio(Base):
     owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)  # Changed to match User.id type
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     base_currency: Mapped[str] = mapped_column(String(6), nullable=False, default="INR")
+    tx_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")  # bumped with every transaction write
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
     owner: Mapped["User"] = relationship()
@@ -82,6 +84,11 @@ class Transaction(Base):
 
     portfolio: Mapped["Portfolio"] = relationship(back_populates="transactions")
 
+    __table_args__ = (
+        # Matches the (trade_date, created_at) ordering used by list_tx and compute_positions
+        Index("ix_transactions_portfolio_trade_created", "portfolio_id", "trade_date", "created_at"),
+    )
+
 
 class FXRate(Base):
     __tablename__ = "fx_rates"
@@ -96,6 +103,41 @@ class FXRate(Base):
     )
 
 
+class YahooStatementPeriod(Base):
+    """One parsed Yahoo statement period for a ticker; history accumulates across refreshes."""
+    __tablename__ = "yahoo_statement_periods"
+
+    ticker: Mapped[str] = mapped_column(String(20), nullable=False)     # upper-cased, e.g. TCS.NS
+    statement: Mapped[str] = mapped_column(String(20), nullable=False)  # pnl / balance_sheet / cashflow / quarters
+    period: Mapped[datetime] = mapped_column(Date, nullable=False)      # first day of the period's label month
+    line_items: Mapped[str] = mapped_column(Text, nullable=False)       # JSON {item: value}, crores
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("ticker", "statement", "period", name="yahoo_statement_periods_pk"),
+    )
+
+
+class ReportJob(Base):
+    """Queued PDF build; a pool worker claims the row, writes progress and stores the result blob."""
+    __tablename__ = "report_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued", index=True)  # queued / running / done / failed
+    template_type: Mapped[str] = mapped_column(String(32), nullable=False, default="standard")
+    payload: Mapped[str] = mapped_column(Text, nullable=False)                                   # JSON report data
+    sections_built: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pages_rendered: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    pdf_blob_key: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    pdf_size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)    # heartbeat while running
+    finished_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+
+
 class EmailVerification(Base):
     __tablename__ = "email_verifications"
     id = Column(Integer, primary_key=True)
@@ -127,6 +169,8 @@ class AnalysisReport(Base):
     # PDF metadata
     pdf_file_name: Mapped[str] = mapped_column(String(500), nullable=False)
     pdf_size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    pdf_blob_key: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # services.blob_store key; None until rendered
+    pdf_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -2,26 +2,29 @@
 from __future__ import annotations
 from collections import defaultdict, deque
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable, Iterable
 from datetime import date
 
 from sqlalchemy.orm import Session
 from core.models import Transaction
-from core.prices import get_last_price
-from core.fx import get_fx_rate
+from core.prices import get_last_price, get_last_prices
+from core.fx import get_fx_rate, get_fx_rates
 
 D = Decimal
 
+NOTE = "FIFO realized P&L uses trade-date FX for proceeds/cost; unrealized uses today's FX for market value."
+
 def _dec(x) -> Decimal:
     return D(str(x)) if x is not None else D("0")
 
-def compute_positions(db: Session, portfolio_id) -> dict[str, Any]:
+def _trade_ccy(tx) -> str:
+    return (tx.trade_ccy or "INR").upper()
+
+def _replay_fifo(txs: Iterable, fx_at: Callable[[str, date], Decimal]):
     """
-    FIFO lots with INR normalization:
-      - BUY: push lot (qty, unit_cost_in_inr) using trade-date FX (or stored fx_rate).
-      - SELL: pop from FIFO lots, compute realized P&L in INR vs. sold proceeds in INR.
-    Unrealized = remaining lots market value (today's FX) minus remaining cost.
-    Returns per-holding and totals in INR.
+    Replay transactions (already in trade order) into FIFO lots.
+    fx_at(ccy, trade_date) supplies the trade-date rate when tx.fx_rate is not stored.
+    Returns (lots, realized_by_symbol) with everything in INR.
     """
     # FIFO lots per symbol: deque of {"qty": Decimal, "unit_cost_in_inr": Decimal}
     lots: dict[str, deque] = defaultdict(deque)
@@ -30,25 +33,18 @@ def compute_positions(db: Session, portfolio_id) -> dict[str, Any]:
     realized_by_symbol: dict[str, Decimal] = defaultdict(D)
     fees_in_inr_by_symbol: dict[str, Decimal] = defaultdict(D)
 
-    txs = (
-        db.query(Transaction)
-        .filter(Transaction.portfolio_id == portfolio_id)
-        .order_by(Transaction.trade_date.asc(), Transaction.created_at.asc())
-        .all()
-    )
-
     for tx in txs:
         side = (tx.side or "").upper()
         qty = _dec(tx.quantity)
         price = _dec(tx.price)
         fees = _dec(tx.fees)
-        tccy = (tx.trade_ccy or "INR").upper()
+        tccy = _trade_ccy(tx)
 
         # FX at trade date (for costs/proceeds)
         if tccy == "INR":
             fx_td = D("1")
         else:
-            fx_td = _dec(tx.fx_rate) if tx.fx_rate else get_fx_rate(db, tccy, "INR", tx.trade_date)
+            fx_td = _dec(tx.fx_rate) if tx.fx_rate else fx_at(tccy, tx.trade_date)
 
         if side == "BUY":
             # total cash out in INR
@@ -84,8 +80,15 @@ def compute_positions(db: Session, portfolio_id) -> dict[str, Any]:
 
         # DIV/SPLIT/BONUS/FEE can be added later
 
-    # Build holdings with LTP and unrealized P&L in INR
-    today = date.today()
+    return lots, realized_by_symbol
+
+def _summarize(
+    lots: dict[str, deque],
+    realized_by_symbol: dict[str, Decimal],
+    quote_for: Callable[[str], tuple],
+    fx_today: Callable[[str], Decimal],
+) -> dict[str, Any]:
+    """Value remaining lots with quote_for(symbol) -> (ltp, ccy) and fx_today(ccy) -> INR rate."""
     holdings = []
     total_value_inr = D("0")
     total_cost_inr = D("0")
@@ -102,12 +105,12 @@ def compute_positions(db: Session, portfolio_id) -> dict[str, Any]:
             continue
 
         # price + FX today for value
-        ltp, ltp_ccy = get_last_price(symbol)
+        ltp, ltp_ccy = quote_for(symbol)
         ltp_ccy = (ltp_ccy or "INR").upper()
         ltp_dec = _dec(ltp) if ltp is not None else None
         if ltp_dec is not None:
-            fx_today = D("1") if ltp_ccy == "INR" else get_fx_rate(db, ltp_ccy, "INR", today)
-            value_in_inr = (rem_qty * ltp_dec * fx_today).quantize(D("0.01"))
+            fx_now = D("1") if ltp_ccy == "INR" else fx_today(ltp_ccy)
+            value_in_inr = (rem_qty * ltp_dec * fx_now).quantize(D("0.01"))
         else:
             value_in_inr = None
 
@@ -149,7 +152,100 @@ def compute_positions(db: Session, portfolio_id) -> dict[str, Any]:
             str((total_value_inr - total_cost_inr).quantize(D("0.01"))) if total_value_inr > 0 else None
         ),
         "realized_pnl_in_inr": str(total_realized_inr.quantize(D("0.01"))),
-        "note": "FIFO realized P&L uses trade-date FX for proceeds/cost; unrealized uses today's FX for market value."
+        "note": NOTE,
     }
 
     return {"holdings": holdings, "totals": totals}
+
+def compute_positions(db: Session, portfolio_id) -> dict[str, Any]:
+    """
+    FIFO lots with INR normalization:
+      - BUY: push lot (qty, unit_cost_in_inr) using trade-date FX (or stored fx_rate).
+      - SELL: pop from FIFO lots, compute realized P&L in INR vs. sold proceeds in INR.
+    Unrealized = remaining lots market value (today's FX) minus remaining cost.
+    Returns per-holding and totals in INR.
+    """
+    txs = (
+        db.query(Transaction)
+        .filter(Transaction.portfolio_id == portfolio_id)
+        .order_by(Transaction.trade_date.asc(), Transaction.created_at.asc())
+        .all()
+    )
+
+    lots, realized_by_symbol = _replay_fifo(
+        txs, lambda ccy, as_of: get_fx_rate(db, ccy, "INR", as_of)
+    )
+
+    # Build holdings with LTP and unrealized P&L in INR
+    today = date.today()
+    return _summarize(
+        lots,
+        realized_by_symbol,
+        get_last_price,
+        lambda ccy: get_fx_rate(db, ccy, "INR", today),
+    )
+
+def compute_household_positions(db: Session, portfolio_ids: list) -> dict[str, Any]:
+    """
+    Combined INR summary across several portfolios in one pass:
+    one transaction query, one batched trade-date FX lookup, one batched quote fetch
+    and one batched FX lookup for today's rates.
+    FIFO matching stays within each portfolio; remaining lots are then pooled per symbol.
+    Returns the combined holdings/totals plus per-portfolio totals.
+    """
+    if not portfolio_ids:
+        return {**_summarize({}, {}, lambda symbol: (None, None), lambda ccy: D("1")), "by_portfolio": {}}
+
+    txs = (
+        db.query(Transaction)
+        .filter(Transaction.portfolio_id.in_(portfolio_ids))
+        .order_by(Transaction.trade_date.asc(), Transaction.created_at.asc())
+        .all()
+    )
+
+    # trade-date FX for every row that does not carry its own rate
+    trade_fx = get_fx_rates(db, {
+        (_trade_ccy(tx), "INR", tx.trade_date)
+        for tx in txs
+        if _trade_ccy(tx) != "INR" and not tx.fx_rate
+    })
+
+    txs_by_portfolio: dict[str, list] = {str(pid): [] for pid in portfolio_ids}
+    for tx in txs:
+        txs_by_portfolio[str(tx.portfolio_id)].append(tx)
+
+    replayed = {
+        pid: _replay_fifo(rows, lambda ccy, as_of: trade_fx[(ccy, "INR", as_of)])
+        for pid, rows in txs_by_portfolio.items()
+    }
+
+    # one quote fetch for every symbol still held anywhere, then today's FX for their currencies
+    held = [
+        symbol
+        for lots, _ in replayed.values()
+        for symbol, dq in lots.items()
+        if sum((lot["qty"] for lot in dq), D("0")) > 0
+    ]
+    quotes = get_last_prices(held)
+    today = date.today()
+    today_fx = get_fx_rates(db, {
+        ((ccy or "INR").upper(), "INR", today) for _, ccy in quotes.values()
+    })
+
+    def quote_for(symbol):
+        return quotes.get(symbol, (None, None))
+
+    def fx_today(ccy):
+        return today_fx[(ccy, "INR", today)]
+
+    combined_lots: dict[str, deque] = defaultdict(deque)
+    combined_realized: dict[str, Decimal] = defaultdict(D)
+    by_portfolio: dict[str, Any] = {}
+    for pid, (lots, realized) in replayed.items():
+        by_portfolio[pid] = _summarize(lots, realized, quote_for, fx_today)["totals"]
+        for symbol, dq in lots.items():
+            combined_lots[symbol].extend(dict(lot) for lot in dq)
+        for symbol, amount in realized.items():
+            combined_realized[symbol] += amount
+
+    return {**_summarize(combined_lots, combined_realized, quote_for, fx_today), "by_portfolio": by_portfolio}
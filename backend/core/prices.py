@@ -1,9 +1,23 @@
 # core/prices.py
 from __future__ import annotations
+import threading
+import time
 from typing import Optional, Tuple
 
-def get_last_price(symbol: str) -> Tuple[Optional[float], Optional[str]]:
-    """Returns (last_price, currency) using yfinance."""
+from core.config import settings
+
+# symbol -> (quote_epoch, (last_price, currency))
+_QUOTES: dict[str, tuple[int, Tuple[Optional[float], Optional[str]]]] = {}
+_QUOTES_LOCK = threading.Lock()
+
+
+def quote_epoch(now: Optional[float] = None) -> int:
+    """Index of the current QUOTE_TTL_SECONDS window; quotes are reused within one epoch."""
+    ttl = max(1, settings.QUOTE_TTL_SECONDS)
+    return int((time.time() if now is None else now) // ttl)
+
+
+def _fetch_last_price(symbol: str) -> Tuple[Optional[float], Optional[str]]:
     try:
         import yfinance as yf
         t = yf.Ticker(symbol)
@@ -20,3 +34,46 @@ def get_last_price(symbol: str) -> Tuple[Optional[float], Optional[str]]:
         return None, None
     except Exception:
         return None, None
+
+
+def get_last_price(symbol: str) -> Tuple[Optional[float], Optional[str]]:
+    """Returns (last_price, currency) using yfinance, cached for the current quote epoch."""
+    epoch = quote_epoch()
+    with _QUOTES_LOCK:
+        hit = _QUOTES.get(symbol)
+    if hit and hit[0] == epoch:
+        return hit[1]
+
+    quote = _fetch_last_price(symbol)
+    if quote[0] is not None:
+        with _QUOTES_LOCK:
+            _QUOTES[symbol] = (epoch, quote)
+    return quote
+
+
+def get_last_prices(symbols, max_workers: int = 8) -> dict[str, Tuple[Optional[float], Optional[str]]]:
+    """
+    Batched get_last_price: symbols are de-duplicated, served from the quote cache where
+    possible, and the misses are fetched concurrently in one pass.
+    """
+    epoch = quote_epoch()
+    out: dict[str, Tuple[Optional[float], Optional[str]]] = {}
+    missing: list[str] = []
+    with _QUOTES_LOCK:
+        for symbol in dict.fromkeys(symbols):
+            hit = _QUOTES.get(symbol)
+            if hit and hit[0] == epoch:
+                out[symbol] = hit[1]
+            else:
+                missing.append(symbol)
+
+    if missing:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+            fetched = list(pool.map(_fetch_last_price, missing))
+        with _QUOTES_LOCK:
+            for symbol, quote in zip(missing, fetched):
+                out[symbol] = quote
+                if quote[0] is not None:
+                    _QUOTES[symbol] = (epoch, quote)
+    return out
@@ -0,0 +1,84 @@
+# core/serialization.py
+"""
+One JSON layer for API payloads.
+
+  json_safe(obj)    - plain-Python copy: NaN/inf -> None, NumPy scalars/arrays -> int/float/list,
+                      datetimes/Timestamps -> ISO strings (NaT -> None), Decimal -> float,
+                      tuples/sets -> lists
+  dumps(obj)        - UTF-8 JSON bytes with the same rules in a single pass; uses orjson when it
+                      is installed (it handles floats, NumPy and containers natively), otherwise
+                      the stdlib encoder over json_safe(). The two agree byte for byte except on
+                      np.float32 (scalars and arrays): orjson writes the shortest float32 repr
+                      (1.1), the stdlib path widens to float64 first (1.100000023841858).
+  FastJSONResponse  - JSONResponse rendered with dumps(). Return it directly from a route: a
+                      returned dict would still go through FastAPI's jsonable_encoder walk first.
+"""
+from __future__ import annotations
+
+import json
+import math
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib path is slower and widens float32 (see above)
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Builtin stand-in for a value neither orjson nor json encodes itself."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date, time)):
+        # pandas.NaT is a datetime that is not equal to itself
+        return None if obj != obj else obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj) if obj.is_finite() else None
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_safe(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [json_safe(v) for v in obj]
+    if isinstance(obj, float):
+        # also np.float64, which subclasses float
+        return float(obj) if math.isfinite(obj) else None
+    if obj is None or isinstance(obj, (str, int)):
+        return obj
+    return json_safe(_default(obj))
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. non-contiguous or object-dtype arrays, ints past 64 bits
+            return _stdlib_dumps(obj)
+else:
+    def dumps(obj: Any) -> bytes:
+        return _stdlib_dumps(obj)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        json_safe(obj), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,53 @@
+# core/summary_cache.py
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.models import Portfolio
+from core.prices import quote_epoch
+
+# In-process cache of compute_positions() results.
+# Key: (portfolio_id, transaction version, quote epoch). The version is portfolios.tx_version,
+# bumped in the same DB transaction as every transaction write, so a write made through any
+# API process changes the key every process computes; a new quote epoch starts every
+# QUOTE_TTL_SECONDS. Stale entries are never served; they simply age out of the LRU.
+_lock = threading.Lock()
+_entries: "OrderedDict[tuple[str, int, int], dict[str, Any]]" = OrderedDict()
+
+
+def bump_tx_version(db: Session, portfolio_id) -> None:
+    """Call with every transaction write for the portfolio, before the session commits."""
+    db.execute(update(Portfolio).where(Portfolio.id == portfolio_id).values(tx_version=Portfolio.tx_version + 1))
+
+
+def summary_key(portfolio: Portfolio) -> tuple[str, int, int]:
+    return (str(portfolio.id), portfolio.tx_version, quote_epoch())
+
+
+def get_summary(key: tuple[str, int, int]) -> Optional[dict[str, Any]]:
+    with _lock:
+        data = _entries.get(key)
+        if data is not None:
+            _entries.move_to_end(key)
+        return data
+
+
+def put_summary(key: tuple[str, int, int], data: dict[str, Any]) -> None:
+    with _lock:
+        _entries[key] = data
+        _entries.move_to_end(key)
+        while len(_entries) > max(1, settings.SUMMARY_CACHE_MAX_ENTRIES):
+            _entries.popitem(last=False)
+
+
+def invalidate_portfolio(portfolio_id) -> None:
+    """Drop every cached summary for the portfolio (e.g. when it is deleted)."""
+    pid = str(portfolio_id)
+    with _lock:
+        for key in [k for k in _entries if k[0] == pid]:
+            del _entries[key]
@@ -6,13 +6,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.config import settings
+from services.worker_pool import shutdown_pools
+from services.report_jobs import start_sweeper
 from routers import (
     dcf,
     sensitivity,
     upload,
     eps,
     yahoo_fetcher,
-    
+    analysis_reports,
+    report_jobs,
+    report_batch,
 )
 
 app = FastAPI(title="FundaIQ API")
@@ -51,9 +55,20 @@ def read_root():
 def health():
     return {"ok": True}
 
+@app.on_event("startup")
+async def _resume_report_jobs():
+    start_sweeper()
+
+@app.on_event("shutdown")
+def _shutdown_worker_pools():
+    shutdown_pools()
+
 # ----- Routers -----
 app.include_router(upload.router, prefix="/api")
 app.include_router(dcf.router, prefix="/api")
 app.include_router(sensitivity.router, prefix="/api")
 app.include_router(eps.router, prefix="/api")
 app.include_router(yahoo_fetcher.router, prefix="/api")
+app.include_router(analysis_reports.router, prefix="/api")
+app.include_router(report_jobs.router, prefix="/api")
+app.include_router(report_batch.router, prefix="/api")
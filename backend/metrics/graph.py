@@ -0,0 +1,93 @@
+# metrics/graph.py
+"""
+Lazily evaluated dependency graph of named values.
+
+A node is a function registered with the names it provides; its parameter names are the
+names it depends on. `evaluate(targets, inputs)` runs only the nodes needed for
+`targets`, in dependency order, each at most once. Execution plans are cached per
+(targets, inputs) so repeated requests for the same field set skip the graph walk.
+"""
+from __future__ import annotations
+
+import inspect
+import threading
+from typing import Any, Callable, Iterable
+
+
+class _Node:
+    __slots__ = ("fn", "params", "provides")
+
+    def __init__(self, fn: Callable, params: tuple, provides: tuple):
+        self.fn = fn
+        self.params = params
+        self.provides = provides
+
+
+class MetricGraph:
+    def __init__(self):
+        self._producer: dict[str, _Node] = {}
+        self._plans: dict[tuple, list[_Node]] = {}
+        self._lock = threading.Lock()
+
+    def node(self, *provides: str):
+        """Register fn as the producer of `provides`; a multi-name node returns a tuple in that order."""
+        def register(fn: Callable) -> Callable:
+            params = tuple(inspect.signature(fn).parameters)
+            node = _Node(fn, params, provides)
+            for name in provides:
+                if name in self._producer:
+                    raise ValueError(f"'{name}' is already provided by {self._producer[name].fn.__name__}")
+                self._producer[name] = node
+            return fn
+        return register
+
+    @property
+    def names(self) -> set[str]:
+        return set(self._producer)
+
+    def plan(self, targets: Iterable[str], inputs: Iterable[str]) -> list[_Node]:
+        """Nodes needed for targets, dependencies first."""
+        key = (frozenset(targets), frozenset(inputs))
+        cached = self._plans.get(key)
+        if cached is not None:
+            return cached
+
+        available = set(key[1])
+        order: list[_Node] = []
+        done: set[int] = set()
+        visiting: set[int] = set()
+
+        def visit(name: str) -> None:
+            if name in available:
+                return
+            node = self._producer.get(name)
+            if node is None:
+                raise KeyError(f"Unknown metric '{name}'")
+            if id(node) in done:
+                return
+            if id(node) in visiting:
+                raise ValueError(f"Metric dependency cycle through '{name}'")
+            visiting.add(id(node))
+            for param in node.params:
+                visit(param)
+            visiting.discard(id(node))
+            done.add(id(node))
+            order.append(node)
+
+        for name in sorted(key[0]):
+            visit(name)
+
+        with self._lock:
+            self._plans[key] = order
+        return order
+
+    def evaluate(self, targets: Iterable[str], inputs: dict[str, Any]) -> dict[str, Any]:
+        """Values for targets (plus every intermediate computed on the way)."""
+        values = dict(inputs)
+        for node in self.plan(targets, inputs):
+            result = node.fn(*[values[p] for p in node.params])
+            if len(node.provides) == 1:
+                values[node.provides[0]] = result
+            else:
+                values.update(zip(node.provides, result))
+        return values
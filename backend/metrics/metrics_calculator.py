@@ -1,3 +1,10 @@
+import numpy as np
+
+from metrics.graph import MetricGraph
+from metrics.statements import Statements, statements_from_tables
+from metrics.utils import round2
+
+
 def safe_divide(numerator, denominator):
     try:
         return float(numerator) / float(denominator) if denominator not in (0, None) else 0.0
@@ -7,429 +14,435 @@ def safe_divide(numerator, denominator):
 def safe_last(lst):
     return lst[-1] if lst and len(lst) else 0
 
-def calculate_metrics(pnl, bs, cf, qtr_results, years, qtrs, meta, source="excel", yahoo_info=None,):
-    #print(f"ℹ️ [Backend Metric Calculator] Calculation Starts !!!!!!!!!!!")
-
-    def get_values_qtr(table, label):
-        values = table.get(label, [0] * len(qtrs))[:len(qtrs)]
-        # Clean values - convert 'NaT', None, empty strings, and non-numeric to 0
-        cleaned_values = []
-        for val in values:
-            if val == 'NaT' or val is None or val == '' or str(val).lower() == 'nan':
-                cleaned_values.append(0)
-            else:
-                try:
-                    cleaned_values.append(float(val))
-                except:
-                    cleaned_values.append(0)
-        return cleaned_values
-
-    def get_values(table, label):
-        values = table.get(label, [0] * len(years))[:len(years)]
-        # Clean values - convert 'NaT', None, empty strings, and non-numeric to 0
-        cleaned_values = []
-        for val in values:
-            if val == 'NaT' or val is None or val == '' or str(val).lower() == 'nan':
-                cleaned_values.append(0)
-            else:
-                try:
-                    cleaned_values.append(float(val))
-                except:
-                    cleaned_values.append(0)
-        return cleaned_values
-    
-    def sum_last_4(lst):
-        if not lst:
-            return 0
-        if len(lst) < 4:
-            return sum(lst)  # Sum all elements if less than 4
-        return sum(lst[-4:])
-
-    def calculate_growth(series):
-        result = []
-        for prev, curr in zip(series[:-1], series[1:]):
-            if prev == 0 or prev is None:
-                result.append(0.0)
-            elif (prev < 0 < curr) or (prev > 0 > curr):
-                # Sign change: calculate as improvement/deterioration from baseline
-                growth = safe_divide(curr - prev, abs(prev)) * 100
-                result.append(round(growth, 2))
-            else:
-                # Same sign: normal percentage calculation
-                growth = (safe_divide(curr , prev) - 1) * 100
-                result.append(round(growth, 2))
-        return result
-
-    #************* Get Meta Data ******************************************    
-    
-    market_cap = float(meta.get("Market Capitalization", 0))
-    #print(f"ℹ️ [Backend Metric Calculator] market_cap : {market_cap} ")
-
-    current_price = float(meta.get("Current Price", 0))
-    #print(f"ℹ️ [Backend Metric Calculator] current_price : {current_price} ")
-    
-    #************* Get P&L Data ******************************************    
-    
-    revenue = get_values(pnl, "Sales")
-    #print(f"ℹ️ [Backend Metric Calculator] revenue : {revenue} ")
-
-    latest_revenue = revenue[-1] if revenue else 0
-    #print(f"ℹ️ [Backend Metric Calculator] latest_revenue : {latest_revenue} ")
-
-    raw_material_cost = get_values(pnl, "Raw Material Cost")
-    #print(f"ℹ️ [Backend Metric Calculator] raw_material_cost : {raw_material_cost} ")
-
-    change_in_inventory = get_values(pnl, "Change in Inventory")
-    #print(f"ℹ️ [Backend Metric Calculator] change_in_inventory : {change_in_inventory} ")
-
-    power_fule = get_values(pnl, "Power and Fuel")
-    #print(f"ℹ️ [Backend Metric Calculator] power_fule : {power_fule} ")
-
-    other_mfr_exp = get_values(pnl, "Other Mfr. Exp")
-    #print(f"ℹ️ [Backend Metric Calculator] other_mfr_exp : {other_mfr_exp} ")
-
-    emp_cost = get_values(pnl, "Employee Cost")
-    #print(f"ℹ️ [Backend Metric Calculator] emp_cost : {emp_cost} ")
-
-    selling_admin = get_values(pnl, "Selling and admin")
-    #print(f"ℹ️ [Backend Metric Calculator] selling_admin : {selling_admin} ")
-
-    other_exp = get_values(pnl, "Other Expenses")
-    #print(f"ℹ️ [Backend Metric Calculator] other_exp : {other_exp} ")
-    
-    other_income = get_values(pnl, "Other Income")[:len(revenue)]
-    #print(f"ℹ️ [Backend Metric Calculator] other_income : {other_income} ")
-
-    net_profit = get_values(pnl, "Net profit")
-    #print(f"ℹ️ [Backend Metric Calculator] net_profit : {net_profit} ")
-    
-    interest = get_values(pnl, "Interest")
-    #print(f"ℹ️ [Backend Metric Calculator] interest : {interest} ")
-
-    depreciation = get_values(pnl, "Depreciation")
-    #print(f"ℹ️ [Backend Metric Calculator] depreciation : {depreciation} ")
-
-    div_amount = get_values(pnl, "Dividend Amount")
-    #print(f"ℹ️ [Backend Metric Calculator] div_amount : {div_amount} ")
-    
-    tax_values = get_values(pnl, "Tax")
-    #print(f"ℹ️ [Backend Metric Calculator] tax_values : {tax_values} ")
-
-    #************* Get Balancesheet Data ******************************************    
-    
-    reserves = get_values(bs, "Reserves")
-    #print(f"ℹ️ [Backend Metric Calculator] reserves : {reserves} ")
-
-    equity_capital = get_values(bs, "Equity Share Capital")
-    #print(f"ℹ️ [Backend Metric Calculator] equity_capital : {equity_capital} ")
-
-    debt = get_values(bs, "Borrowings")
-    #print(f"ℹ️ [Backend Metric Calculator] debt : {debt} ")
-
-    cash = get_values(bs, "Cash & Bank")
-    #print(f"ℹ️ [Backend Metric Calculator] cash : {cash} ")
-
-    investments = get_values(bs, "Investments")
-    #print(f"ℹ️ [Backend Metric Calculator] investments : {investments} ")
-
-    capex = get_values(bs, "Capital Work in Progress")
-    #print(f"ℹ️ [Backend Metric Calculator] capex : {capex} ")
-
-    net_block = get_values(bs, "Net Block")[:len(revenue)]
-    #print(f"ℹ️ [Backend Metric Calculator] net_block : {net_block} ")
-
-    
-    shares = get_values(bs, "No. of Equity Shares")
-    shares = [round(safe_divide(share, 10000000), 2) for share in shares]
-    #print(f"ℹ️ [Backend Metric Calculator] shares : {shares} ")
-    if shares and shares[-1] == 0 and len(shares) > 1:
-        shares[-1] = shares[-2]
-
-    #************* Minimum length of chart series ******************************************    
-    
-    min_len = min(len(revenue), len(net_profit), len(depreciation))
-    #print(f"ℹ️ [Backend Metric Calculator] min_len : {min_len} ")
-    
-    #************* Get Cashflow Data ******************************************    
-    
-    cf_opa = get_values(cf, "Cash from Operating Activity")
-    cf_inva = get_values(cf, "Cash from Investing Activity")
-    cf_fina = get_values(cf, "Cash from Financing Activity")
-    cf_net = get_values(cf, "Net Cash Flow")
-    #************* Get Quarterly Data ******************************************    
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] ttm Calculation Starts !!!!!!!!!!!")
-    
-    q_sales  = get_values_qtr(qtr_results, "Sales")
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] q_sales : {q_sales} ")     
-    
-    q_expenses = get_values_qtr(qtr_results, "Expenses")      
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] q_expenses : {q_expenses} ")     
-    
-    q_other_income = get_values_qtr(qtr_results, "Other Income")       
-    q_depreciation = get_values_qtr(qtr_results, "Depreciation") 
-    q_interest = get_values_qtr(qtr_results, "Interest") 
-    q_pbt = get_values_qtr(qtr_results, "Profit before tax")  
-    q_tax = get_values_qtr(qtr_results, "Tax")   
-    q_np = get_values_qtr(qtr_results, "Net profit")    
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] q_np : {q_np} ")     
-    
-    q_op = get_values_qtr(qtr_results, "Operating Profit")     
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] q_op : {q_op} ")     
-    
-    q_ebit = [round(e + oi - d,2) for e, oi, d in zip(q_op, q_other_income, q_depreciation)]
-    #print(f"ℹ️ [Backend Metric Calculator] q_ebit : {q_ebit} ")
-    
-    #********** Get Chart Series ***************************************
-    
-    #Past Growth
-     
-    net_debt = [round(d-c-i,2) for d, c,i in zip(debt, cash, investments)]
-    #print(f"ℹ️ [Backend Metric Calculator] net_debt : {net_debt} ")
-    
-    cash_and_investments =[round(c+i,2) for c,i in zip( cash, investments)]
-    
-    if source == "excel":
-        ebitda = [round(r - rmc + cii - pf - ome - ec - sa - oe,2) for r, rmc, cii, pf, ome, ec, sa, oe in zip(
-        revenue, raw_material_cost, change_in_inventory, power_fule, other_mfr_exp, emp_cost, selling_admin, other_exp[:min_len])]
-        #print(f"ℹ️ [Backend Metric Calculator] ebitda : {ebitda} ")
-
-        ebit = [round(e + oi - d,2) for e, oi, d in zip(ebitda, other_income, depreciation)]
-        #print(f"ℹ️ [Backend Metric Calculator] ebit : {ebit} ")
-        
-        equity = [round(e + r,2) for e, r in zip(equity_capital, reserves)]
-        #print(f"ℹ️ [Backend Metric Calculator] equity : {equity} ")
-    
-    revenue_growth = calculate_growth(revenue)
-    #print(f"ℹ️ [Backend Metric Calculator] revenue_growth : {revenue_growth} ")
-
-    ebitda_growth = calculate_growth(ebitda)
-    #print(f"ℹ️ [Backend Metric Calculator] ebitda_growth : {ebitda_growth} ")
-
-    net_profit_growth = calculate_growth(net_profit)
-    #print(f"ℹ️ [Backend Metric Calculator] net_profit_growth : {net_profit_growth} ")
-
-    
-    ebitda_margin = [round(safe_divide(e, r) * 100,2) for e, r in zip(ebitda, revenue[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] ebitda_margin : {ebitda_margin} ")
-
-    net_profit_margin = [round(safe_divide(n, r) * 100,2) for n, r in zip(net_profit[:min_len], revenue[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] net_profit_margin : {net_profit_margin} ")
-    
-    roce = [round(safe_divide(e, (eq + d)) * 100,2) for e, eq, d in zip(ebit, equity[:min_len], debt[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] roce : {roce} ")
-
-    roe = [round(safe_divide(n, eq) * 100,2) for n, eq in zip(net_profit[:min_len], equity[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] roe : {roe} ")
-
-    interest_coverage = [round(safe_divide(e, i),2) for e, i in zip(ebit, interest[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] interest_coverage : {interest_coverage} ")
-
-    debt_to_equity = [round(safe_divide(d, eq),2) for d, eq in zip(debt[:min_len], equity[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] debt_to_equity : {debt_to_equity} ")
-    
-    book_values = [round(safe_divide(e, s),2) for e, s in zip(equity, shares)]
-    #print(f"ℹ️ [Backend Metric Calculator] book_value : {book_values} ")
-
-    div_amount_per_share = [round(safe_divide(d, s),2) for d, s in zip(div_amount, shares)]
-    
-    net_asset_values = [round((nb-nd),2) for nb, nd in zip(net_block, net_debt)]
-
-    net_asset_values_per_share = [round(safe_divide(nav, s),2) for nav, s in zip(net_asset_values, shares)]
-
-    #*********** Get latest values what ever is required ***********************************
-
-    div_amount_last = safe_last(div_amount_per_share)
-    #print(f"ℹ️ [Backend Metric Calculator] div_amount_last : {div_amount_last} ")
-
-    latest_net_debt =round(net_debt[-1],2) if net_debt else 0
-    #print(f"ℹ️ [Backend Metric Calculator] latest_net_debt : {latest_net_debt} ")
-    
-
-    eps_values = [safe_divide(n, e) for n, e in zip(net_profit, shares)]
-    eps_cagr_3y = calculate_cagr(eps_values)
-    eps = safe_last(eps_values)
-    pe = safe_divide(current_price, eps)
-    peg_ratio = safe_divide(pe, safe_last(revenue_growth)) if revenue_growth else 0
-    
-    
-    tax_rate = round(safe_divide(safe_last(tax_values), safe_last(ebit)) * 100,2) if ebit else 0
-    capex_pct = round(safe_divide(safe_last(capex), safe_last(revenue)) * 100,2) if capex and revenue else 2.0
-    revenue_cagr_3y = calculate_cagr(revenue)
-    interest_exp_pct = safe_divide(safe_last(interest), safe_last(ebit)) * 100 if ebit else 0
-    
-    ev = round(market_cap + latest_net_debt, 2)
-    price_to_sales = round(safe_divide(market_cap, latest_revenue), 2)
-    
-    # Free cash flow calculation
-    fcf = [round(n + d - c,2) for n, d, c in zip(net_profit[:min_len], depreciation[:min_len], capex[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] fcf : {fcf} ")
-
-    fcf_margin = [round(safe_divide(f, r) * 100,2) for f, r in zip(fcf, revenue[:min_len])]
-    #print(f"ℹ️ [Backend Metric Calculator] fcf_margin : {fcf_margin} ")
-
-    
-    
-    #******************* Analyse Quarterly Data **********************
-    q_sales_growth = calculate_growth(q_sales)
-    #print(f"ℹ️ [Backend Metric Calculator] q_sales_growth : {q_sales_growth} ")
-
-    q_ebitda_margin = [round(safe_divide(e, r) * 100,2) for e, r in zip(q_op, q_sales)]
-     
-    
-    q_net_profit_growth = calculate_growth(q_np)
-    #print(f"ℹ️ [Backend Metric Calculator] q_net_profit_growth : {q_net_profit_growth} ")
-
-    #****************Calculate TTM Numbers**************************** 
+#************* Columnar helpers ******************************************
+# Metrics run on metrics.statements.Statements: the annual statements are one 2-D float
+# array (line items x years) and the quarterly results another. Rows can be shorter than
+# the period axis; each row's valid length is carried alongside and every derived series
+# is cut to the shortest operand, which is exactly what the per-element zip() version
+# produced. Derived series are computed a dependency level at a time as stacked 2-D
+# arrays, so each level costs one divide and one rounding pass however many ratios it holds.
+
+def _divide(numerator, denominator):
+    """Element-wise safe_divide: 0.0 wherever the denominator is 0."""
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=(denominator != 0))
+    return out
+
+def _growth(series):
+    """Period-over-period growth in % for each row, vectorized form of the old calculate_growth."""
+    prev, curr = series[:, :-1], series[:, 1:]
+    sign_change = ((prev < 0) & (0 < curr)) | ((prev > 0) & (0 > curr))
+    # sign change: improvement/deterioration from baseline; same sign: normal percentage
+    growth = np.where(
+        sign_change,
+        _divide(curr - prev, np.abs(prev)) * 100,
+        (_divide(curr, prev) - 1) * 100,
+    )
+    return np.where(prev == 0, 0.0, round2(growth))
+
+def sum_last_4(lst):
+    if not lst:
+        return 0
+    if len(lst) < 4:
+        return sum(lst)  # Sum all elements if less than 4
+    return sum(lst[-4:])
+
+def _cut(values, length):
+    """First `length` entries of a padded row as a list."""
+    return values[:max(length, 0)].tolist()
+
+#************* Metric graph ******************************************
+# Every metric is a node of `graph`; a node's parameters are the names it depends on.
+# The vectorized stages provide several series at once (so a level still costs one divide
+# and one rounding pass); the scalars derived from them are small nodes of their own.
+# calculate_metrics(fields=[...]) evaluates only the requested metrics and their
+# dependencies. "*_row" values are the padded statement-width arrays the stages share.
+
+graph = MetricGraph()
+
+# Output keys, in response order
+METRIC_FIELDS = (
+    "revenue", "revenue_with_ttm", "current_price", "net_profit", "net_profit_with_ttm",
+    "ebit", "ebitda", "ebitda_with_ttm", "net_block", "cwip", "equity", "net_debt",
+    "cash_and_bank", "revenue_growth", "ebitda_growth", "net_profit_growth", "ebitda_margin",
+    "net_profit_margin", "ttm_roce", "ttm_roe", "roce", "roe", "interest_coverage",
+    "ttm_interest_coverage", "debt_to_equity", "fcf", "fcf_margin", "tax_rate", "wacc",
+    "terminal_growth_rate", "years", "years_with_ttm", "ttm_pe", "market_cap", "ttm_pb",
+    "book_value", "net_asset_values_per_share", "net_asset_values_per_share_last",
+    "peg_ratio", "revenue_cagr_3y", "eps_cagr_3y", "div_amount", "div_amount_per_share",
+    "div_amount_last", "div_yield", "price_to_sales", "latest_revenue", "ev", "ev_to_ebit",
+    "ev_to_ebitda", "latest_net_debt", "ebit_margin", "depreciation_pct", "wc_change_pct",
+    "interest_pct", "interest_exp", "interest_exp_pct", "base_year", "growth_x", "growth_y",
+    "period_x", "period_y", "growth_terminal", "capex_pct", "shares_outstanding", "qtrs",
+    "q_sales", "q_op", "q_np", "q_sales_growth", "q_net_profit_growth", "q_ebitda_margin",
+    "cf_opa", "cf_inva", "cf_fina", "cf_net", "fairvalue_pe",
+)
+_METRIC_FIELD_SET = frozenset(METRIC_FIELDS)
+
+# Metrics the DCF / EPS assumptions are built from; always computed when fields= is used
+ASSUMPTION_METRICS = (
+    "current_price", "latest_revenue", "latest_net_debt", "shares_outstanding", "ebit_margin",
+    "depreciation_pct", "capex_pct", "wc_change_pct", "tax_rate", "interest_pct", "growth_x",
+    "growth_y", "growth_terminal", "base_year", "interest_exp_pct", "fairvalue_pe",
+)
+
+@graph.node("wacc", "terminal_growth_rate", "wc_change_pct", "interest_pct", "growth_x",
+            "growth_y", "period_x", "period_y", "growth_terminal", "fairvalue_pe")
+def _constants():
+    return 13, 3.0, 2, 13.0, 12, 9, 5, 15, 3, 20
+
+@graph.node("current_price", "market_cap")
+def _meta(statements):
+    return statements.current_price, statements.market_cap
+
+#************* Load statements ******************************************
+
+@graph.node("annual", "annual_len", "annual_reported", "years")
+def _annual(statements):
+    m = statements.annual
+    return m.rows(), m.lengths, m.reported, m.periods
+
+@graph.node("quarterly", "quarterly_len", "qtrs")
+def _quarterly(statements):
+    m = statements.quarterly
+    return m.rows(), m.lengths, m.periods
+
+@graph.node("min_len", "revenue", "net_profit", "depreciation", "interest", "tax_values", "borrowings",
+            "net_block", "cwip", "div_amount", "cf_opa", "cf_inva", "cf_fina", "cf_net")
+def _statement_series(annual, annual_len):
+    row, n = annual, annual_len
+    n_rev = n["Sales"]
+    return (
+        min(n_rev, n["Net profit"], n["Depreciation"]),
+        _cut(row["Sales"], n_rev),
+        _cut(row["Net profit"], n["Net profit"]),
+        _cut(row["Depreciation"], n["Depreciation"]),
+        _cut(row["Interest"], n["Interest"]),
+        _cut(row["Tax"], n["Tax"]),
+        _cut(row["Borrowings"], n["Borrowings"]),
+        _cut(row["Net Block"], min(n["Net Block"], n_rev)),
+        _cut(row["Capital Work in Progress"], n["Capital Work in Progress"]),
+        _cut(row["Dividend Amount"], n["Dividend Amount"]),
+        _cut(row["Cash from Operating Activity"], n["Cash from Operating Activity"]),
+        _cut(row["Cash from Investing Activity"], n["Cash from Investing Activity"]),
+        _cut(row["Cash from Financing Activity"], n["Cash from Financing Activity"]),
+        _cut(row["Net Cash Flow"], n["Net Cash Flow"]),
+    )
+
+#************* Level 1: sums of raw line items ******************************************
+
+@graph.node("shares_row", "net_debt_row", "ebitda_row", "equity_row",
+            "shares", "net_debt", "cash_and_bank", "ebitda", "equity")
+def _level1(annual, annual_len, annual_reported, min_len):
+    row, n = annual, annual_len
+    if "EBITDA" in annual_reported:
+        ebitda = row["EBITDA"]
+        n_ebitda = n["EBITDA"]
+    else:
+        ebitda = (
+            row["Sales"] - row["Raw Material Cost"] + row["Change in Inventory"] - row["Power and Fuel"]
+            - row["Other Mfr. Exp"] - row["Employee Cost"] - row["Selling and admin"] - row["Other Expenses"]
+        )
+        n_ebitda = min(
+            n["Sales"], n["Raw Material Cost"], n["Change in Inventory"], n["Power and Fuel"],
+            n["Other Mfr. Exp"], n["Employee Cost"], n["Selling and admin"], min(n["Other Expenses"], min_len),
+        )
+    shares, net_debt, cash_and_investments, ebitda, equity = round2(np.array([
+        row["No. of Equity Shares"] / 10000000,
+        row["Borrowings"] - row["Cash & Bank"] - row["Investments"],
+        row["Cash & Bank"] + row["Investments"],
+        ebitda,
+        row["Equity Share Capital"] + row["Reserves"],
+    ]))
+    n_shares = n["No. of Equity Shares"]
+    if n_shares > 1 and shares[n_shares - 1] == 0:
+        shares[n_shares - 1] = shares[n_shares - 2]
+
+    return (
+        shares, net_debt, ebitda, equity,
+        _cut(shares, n_shares),
+        _cut(net_debt, min(n["Borrowings"], n["Cash & Bank"], n["Investments"])),
+        _cut(cash_and_investments, min(n["Cash & Bank"], n["Investments"])),
+        _cut(ebitda, n_ebitda),
+        _cut(equity, min(n["Equity Share Capital"], n["Reserves"])),
+    )
+
+#************* Level 2: ratios on level 1 ******************************************
+
+@graph.node("ebit_row", "net_asset_values_row", "fcf_row", "ebit", "ebitda_margin", "net_profit_margin",
+            "roe", "debt_to_equity", "book_values", "div_amount_per_share", "eps_values", "fcf")
+def _level2(annual, annual_len, annual_reported, min_len, shares_row, net_debt_row, ebitda_row, equity_row,
+            shares, ebitda, equity):
+    row, n = annual, annual_len
+    revenue, net_profit, depreciation = row["Sales"], row["Net profit"], row["Depreciation"]
+    n_ebitda, n_eq, n_shares = len(ebitda), len(equity), len(shares)
+    if "EBIT" in annual_reported:
+        ebit, n_ebit = row["EBIT"], n["EBIT"]
+    else:
+        ebit = ebitda_row + row["Other Income"] - depreciation
+        n_ebit = min(n_ebitda, n["Other Income"], n["Sales"], n["Depreciation"])
+
+    ratios = _divide(
+        np.array([ebitda_row, net_profit, net_profit, row["Borrowings"], equity_row, row["Dividend Amount"], net_profit]),
+        np.array([revenue, revenue, equity_row, equity_row, shares_row, shares_row, shares_row]),
+    )
+    eps_values = ratios[6]
+    ratios[:3] *= 100
+    ebit, net_asset_values, fcf, ebitda_margin, net_profit_margin, roe, debt_to_equity, book_values, div_amount_per_share = round2(
+        np.array([
+            ebit,
+            row["Net Block"] - net_debt_row,
+            net_profit + depreciation - row["Capital Work in Progress"],
+            *ratios[:6],
+        ])
+    )
+
+    return (
+        ebit, net_asset_values, fcf,
+        _cut(ebit, n_ebit),
+        _cut(ebitda_margin, min(n_ebitda, min_len)),
+        _cut(net_profit_margin, min_len),
+        _cut(roe, min(min_len, n_eq)),
+        _cut(debt_to_equity, min(n["Borrowings"], min_len, n_eq)),
+        _cut(book_values, min(n_eq, n_shares)),
+        _cut(div_amount_per_share, min(n["Dividend Amount"], n_shares)),
+        _cut(eps_values, min(n["Net profit"], n_shares)),
+        _cut(fcf, min(min_len, n["Capital Work in Progress"])),
+    )
+
+@graph.node("revenue_growth", "ebitda_growth", "net_profit_growth")
+def _annual_growth(annual, annual_len, ebitda_row, ebitda):
+    row, n = annual, annual_len
+    revenue_growth, ebitda_growth, net_profit_growth = _growth(np.array([row["Sales"], ebitda_row, row["Net profit"]]))
+    return (
+        _cut(revenue_growth, n["Sales"] - 1),
+        _cut(ebitda_growth, len(ebitda) - 1),
+        _cut(net_profit_growth, n["Net profit"] - 1),
+    )
+
+#************* Level 3: ratios on level 2 ******************************************
+
+@graph.node("roce", "interest_coverage", "net_asset_values_per_share", "fcf_margin")
+def _level3(annual, annual_len, min_len, shares_row, equity_row, ebit_row, net_asset_values_row, fcf_row,
+            ebit, equity, shares, net_debt, net_block):
+    row, n = annual, annual_len
+    roce, interest_coverage, net_asset_values_per_share, fcf_margin = round2(_divide(
+        np.array([ebit_row, ebit_row, net_asset_values_row, fcf_row]),
+        np.array([equity_row + row["Borrowings"], row["Interest"], shares_row, row["Sales"]]),
+    ) * np.array([[100], [1], [1], [100]]))
+
+    n_ebit = len(ebit)
+    return (
+        _cut(roce, min(n_ebit, len(equity), n["Borrowings"], min_len)),
+        _cut(interest_coverage, min(n_ebit, n["Interest"], min_len)),
+        _cut(net_asset_values_per_share, min(len(net_block), len(net_debt), len(shares))),
+        _cut(fcf_margin, min(min_len, n["Capital Work in Progress"])),
+    )
+
+#************* Quarterly ******************************************
+
+@graph.node("q_sales", "q_op", "q_np", "q_interest", "q_ebit", "q_ebitda_margin", "q_sales_growth", "q_net_profit_growth")
+def _quarterly_series(quarterly, quarterly_len):
+    row, n = quarterly, quarterly_len
+    q_sales, q_op, q_np = row["Sales"], row["Operating Profit"], row["Net profit"]
+    q_ebit, q_ebitda_margin = round2(np.array([
+        q_op + row["Other Income"] - row["Depreciation"],
+        _divide(q_op, q_sales) * 100,
+    ]))
+    q_sales_growth, q_net_profit_growth = _growth(np.array([q_sales, q_np]))
+    return (
+        _cut(q_sales, n["Sales"]),
+        _cut(q_op, n["Operating Profit"]),
+        _cut(q_np, n["Net profit"]),
+        _cut(row["Interest"], n["Interest"]),
+        _cut(q_ebit, min(n["Operating Profit"], n["Other Income"], n["Depreciation"])),
+        _cut(q_ebitda_margin, min(n["Operating Profit"], n["Sales"])),
+        _cut(q_sales_growth, n["Sales"] - 1),
+        _cut(q_net_profit_growth, n["Net profit"] - 1),
+    )
+
+#************* TTM (last four quarters, annual fallback) ****************************
+
+@graph.node("latest_revenue")
+def _ttm_sales(q_sales, revenue):
     ttm_sales = round(sum_last_4(q_sales),2)
-    if ttm_sales == 0:
-        ttm_sales = revenue[-1]
+    return revenue[-1] if ttm_sales == 0 else ttm_sales
 
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] ttm_sales : {ttm_sales}" )
-    
+@graph.node("ttm_op")
+def _ttm_op(q_op, ebitda):
     ttm_op = round(sum_last_4(q_op),2)
-    if ttm_op==0:
-        ttm_op = safe_last(ebitda)
+    return safe_last(ebitda) if ttm_op == 0 else ttm_op
 
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] ttm_op : {ttm_op}" )
-    
+@graph.node("ttm_np")
+def _ttm_np(q_np, net_profit):
     ttm_np = round(sum_last_4(q_np),2)
-    if ttm_np ==0:
-        ttm_np = safe_last(net_profit)
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] ttm_np : {ttm_np}" )
+    return safe_last(net_profit) if ttm_np == 0 else ttm_np
 
+@graph.node("ttm_ebit")
+def _ttm_ebit(q_ebit, ebit):
     ttm_ebit = round(sum_last_4(q_ebit),2)
-    
-    if ttm_ebit == 0:
-        ttm_ebit = safe_last(ebit)
-    #print(f"ℹ️ [Backend Metric Calculator] ttm_ebit : {ttm_ebit} ")
-    
-    ebit_margin = round(safe_divide(ttm_ebit, ttm_sales) * 100,2)
-
-    #print(f"ℹ️ [Backend Metric Calculator] ebit_margin : {ebit_margin} ")
-    
-    ttm_roce  = round(safe_divide(ttm_ebit, (safe_last(equity) + safe_last(debt))) * 100,2)
-    #print(f"ℹ️ [Backend Metric Calculator] ttm_roce : {ttm_roce} ")
-    
-    ttm_roe = round(safe_divide(ttm_np, safe_last(equity)) * 100,2)
-    #print(f"ℹ️ [Backend Metric Calculator] ttm_roe : {ttm_roe} ")
-    
-    ttm_interest= round(sum_last_4(q_interest),2)
-    ttm_interest_coverage = round(safe_divide(ttm_ebit, ttm_interest),2)
-    #print(f"ℹ️ [Backend Metric Calculator] ttm_interest_coverage : {ttm_interest_coverage} ")
-    
-    ttm_interest_exp_pct = round(safe_divide(ttm_interest, ttm_ebit) * 100,2) if ttm_ebit else 0
-
-    price_to_sales = round(safe_divide(market_cap, ttm_sales), 2)
-    ev_to_ebit = round(safe_divide(ev, ttm_ebit), 2)
-    ev_to_ebitda = round(safe_divide(ev, ttm_op), 2)
-
-    #print(f"ℹ️ [Backend Metric Calculator] ttm Calculation End !!!!!!!!!!!")    
-    
-    ttm_eps = round(safe_divide(ttm_np, shares[-1]),2)
-    
-
-    revenue_with_ttm = revenue + [ttm_sales]
-    ebitda_with_ttm = ebitda + [ttm_op]
-    net_profit_with_ttm  = net_profit + [ttm_np]
-    years_with_ttm = years +["TTM"] 
-
-    ttm_pe = round(safe_divide(market_cap, ttm_np),2)
-    
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] revenue_with_ttm : {revenue_with_ttm}" )
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] ebitda_with_ttm : {ebitda_with_ttm}" )
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] net_profit_with_ttm : {net_profit_with_ttm}" )
-    #print(f"ℹ️ [Backend Metric Calculator - ttm calc] years_with_ttm : {years_with_ttm}" )
-
-    #print(f"ℹ️ [Backend Metric Calculator] Calculation Ends !!!!!!!!!!!")
-
-    # Calculate missing variables
-    book_value = safe_last(book_values)
-    ttm_pb = round(safe_divide(current_price, safe_last(book_values)), 2)
-    net_asset_values_per_share_last = safe_last(net_asset_values_per_share)
-    div_yield = round(safe_divide(div_amount_last, current_price) * 100, 2) if current_price else 0
-
-    calculated_metrics = {
-        "revenue": revenue,
-        "revenue_with_ttm" : revenue_with_ttm,
-        "current_price": current_price,
-        "net_profit": net_profit,
-        "net_profit_with_ttm" : net_profit_with_ttm,
-        "ebit": ebit,
-        "ebitda": ebitda,
-        "ebitda_with_ttm": ebitda_with_ttm,
-        "net_block": net_block,
-        "cwip": capex,
-        "equity": equity,
-        "net_debt": net_debt,
-        "cash_and_bank": cash_and_investments,
-        "revenue_growth": revenue_growth,
-        "ebitda_growth": ebitda_growth,
-        "net_profit_growth": net_profit_growth,
-        "ebitda_margin": ebitda_margin,
-        "net_profit_margin": net_profit_margin,
-        "ttm_roce": ttm_roce,
-        "ttm_roe": ttm_roe,
-        "roce": roce,
-        "roe": roe,
-        "interest_coverage": interest_coverage,
-        "ttm_interest_coverage": ttm_interest_coverage,
-        "debt_to_equity": debt_to_equity,
-        "fcf": fcf,
-        "fcf_margin": fcf_margin,
-        "tax_rate": tax_rate,
-        "wacc": 12.0,
-        "terminal_growth_rate": 3.0,
-        "years": years,
-        "years_with_ttm": years_with_ttm,
-        "ttm_pe": ttm_pe,
-        "market_cap": market_cap,
-        "ttm_pb": ttm_pb if ttm_pb is not None else 0,
-        "book_value": round(book_value, 2) if book_value is not None else 0,
-        "net_asset_values_per_share": net_asset_values_per_share if net_asset_values_per_share is not None else 0,
-        "net_asset_values_per_share_last": net_asset_values_per_share_last if net_asset_values_per_share_last is not None else 0,
-        "peg_ratio": round(peg_ratio, 2) if peg_ratio is not None else 0,
-        "revenue_cagr_3y": round(revenue_cagr_3y,2),
-        "eps_cagr_3y": round(eps_cagr_3y, 2) if eps_cagr_3y is not None else 0, 
-        "div_amount": div_amount,
-        "div_amount_per_share": div_amount_per_share,
-        "div_amount_last": round(div_amount_last,2),
-        "div_yield": round(div_yield, 2) if div_yield is not None else 0,
-        "price_to_sales":price_to_sales,
-        "latest_revenue": ttm_sales,
-        "ev":ev,
-        "ev_to_ebit":ev_to_ebit,
-        "ev_to_ebitda":ev_to_ebitda,
-        "latest_net_debt": latest_net_debt,
-        "ebit_margin": ebit_margin,
-        "depreciation_pct": round(safe_divide(safe_last(depreciation), safe_last(revenue)) * 100, 2) if depreciation and revenue else 0,
-        "wc_change_pct": 2,
-        "interest_pct": 13.0,
-        "interest_exp": ttm_interest,
-        "interest_exp_pct": ttm_interest_exp_pct,
-        "base_year": safe_last(years),
-        "wacc": 13,
-        "growth_x": 12,
-        "growth_y": 9,
-        "period_x": 5,
-        "period_y": 15,
-        "growth_terminal": 3,
-        "capex_pct": capex_pct if capex_pct else 0,
-        "shares_outstanding": shares[-1],
-        "qtrs": qtrs,
-        "q_sales" : q_sales,
-        "q_op" : q_op,
-        "q_np":q_np,
-        "q_sales_growth": q_sales_growth,
-        "q_net_profit_growth": q_net_profit_growth,
-        "q_ebitda_margin": q_ebitda_margin,
-        "cf_opa": cf_opa,
-        "cf_inva": cf_inva,
-        "cf_fina":cf_fina,
-        "cf_net":cf_net,
-        "fairvalue_pe":20,
-    }
-    
-    return calculated_metrics,
+    return safe_last(ebit) if ttm_ebit == 0 else ttm_ebit
+
+@graph.node("interest_exp")
+def _ttm_interest(q_interest):
+    return round(sum_last_4(q_interest),2)
+
+@graph.node("revenue_with_ttm")
+def _revenue_with_ttm(revenue, latest_revenue):
+    return revenue + [latest_revenue]
+
+@graph.node("ebitda_with_ttm")
+def _ebitda_with_ttm(ebitda, ttm_op):
+    return ebitda + [ttm_op]
+
+@graph.node("net_profit_with_ttm")
+def _net_profit_with_ttm(net_profit, ttm_np):
+    return net_profit + [ttm_np]
+
+@graph.node("years_with_ttm")
+def _years_with_ttm(years):
+    return years +["TTM"]
+
+@graph.node("ebit_margin")
+def _ebit_margin(ttm_ebit, latest_revenue):
+    return round(safe_divide(ttm_ebit, latest_revenue) * 100,2)
+
+@graph.node("ttm_roce")
+def _ttm_roce(ttm_ebit, equity, borrowings):
+    return round(safe_divide(ttm_ebit, (safe_last(equity) + safe_last(borrowings))) * 100,2)
+
+@graph.node("ttm_roe")
+def _ttm_roe(ttm_np, equity):
+    return round(safe_divide(ttm_np, safe_last(equity)) * 100,2)
+
+@graph.node("ttm_interest_coverage")
+def _ttm_interest_coverage(ttm_ebit, interest_exp):
+    return round(safe_divide(ttm_ebit, interest_exp),2)
+
+@graph.node("interest_exp_pct")
+def _interest_exp_pct(interest_exp, ttm_ebit):
+    return round(safe_divide(interest_exp, ttm_ebit) * 100,2) if ttm_ebit else 0
+
+@graph.node("ttm_pe")
+def _ttm_pe(market_cap, ttm_np):
+    return round(safe_divide(market_cap, ttm_np),2)
+
+#************* Valuation scalars ******************************************
+
+@graph.node("latest_net_debt")
+def _latest_net_debt(net_debt):
+    return round(net_debt[-1],2) if net_debt else 0
+
+@graph.node("ev")
+def _ev(market_cap, latest_net_debt):
+    return round(market_cap + latest_net_debt, 2)
+
+@graph.node("price_to_sales")
+def _price_to_sales(market_cap, latest_revenue):
+    return round(safe_divide(market_cap, latest_revenue), 2)
+
+@graph.node("ev_to_ebit")
+def _ev_to_ebit(ev, ttm_ebit):
+    return round(safe_divide(ev, ttm_ebit), 2)
+
+@graph.node("ev_to_ebitda")
+def _ev_to_ebitda(ev, ttm_op):
+    return round(safe_divide(ev, ttm_op), 2)
+
+@graph.node("shares_outstanding")
+def _shares_outstanding(shares):
+    return shares[-1]
+
+@graph.node("book_value")
+def _book_value(book_values):
+    return round(safe_last(book_values), 2)
+
+@graph.node("ttm_pb")
+def _ttm_pb(current_price, book_values):
+    return round(safe_divide(current_price, safe_last(book_values)), 2)
+
+@graph.node("net_asset_values_per_share_last")
+def _net_asset_values_per_share_last(net_asset_values_per_share):
+    return safe_last(net_asset_values_per_share)
+
+@graph.node("div_amount_last")
+def _div_amount_last(div_amount_per_share):
+    return round(safe_last(div_amount_per_share),2)
+
+@graph.node("div_yield")
+def _div_yield(div_amount_per_share, current_price):
+    return round(safe_divide(safe_last(div_amount_per_share), current_price) * 100, 2) if current_price else 0
+
+@graph.node("eps_cagr_3y")
+def _eps_cagr_3y(eps_values):
+    return round(calculate_cagr(eps_values), 2)
+
+@graph.node("peg_ratio")
+def _peg_ratio(eps_values, current_price, revenue_growth):
+    pe = safe_divide(current_price, safe_last(eps_values))
+    return round(safe_divide(pe, safe_last(revenue_growth)) if revenue_growth else 0, 2)
+
+@graph.node("revenue_cagr_3y")
+def _revenue_cagr_3y(revenue):
+    return round(calculate_cagr(revenue),2)
+
+@graph.node("tax_rate")
+def _tax_rate(tax_values, ebit):
+    return round(safe_divide(safe_last(tax_values), safe_last(ebit)) * 100,2) if ebit else 0
+
+@graph.node("capex_pct")
+def _capex_pct(cwip, revenue):
+    capex_pct = round(safe_divide(safe_last(cwip), safe_last(revenue)) * 100,2) if cwip and revenue else 2.0
+    return capex_pct if capex_pct else 0
+
+@graph.node("depreciation_pct")
+def _depreciation_pct(depreciation, revenue):
+    return round(safe_divide(safe_last(depreciation), safe_last(revenue)) * 100, 2) if depreciation and revenue else 0
+
+@graph.node("base_year")
+def _base_year(years):
+    return safe_last(years)
+
+def parse_metric_fields(raw):
+    """'a,b, c' -> ['a', 'b', 'c'] (None when no selector was given); unknown names raise ValueError."""
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = set(fields) - _METRIC_FIELD_SET
+    if unknown:
+        raise ValueError(f"Unknown metric fields: {', '.join(sorted(unknown))}")
+    return fields or None
+
+def with_assumption_metrics(fields):
+    """fields plus what the valuation assumptions need (None stays None = everything)."""
+    return None if fields is None else set(fields) | set(ASSUMPTION_METRICS)
+
+def select_metrics(metrics, fields):
+    """Metrics limited to fields (None = all), in response order."""
+    return {k: metrics[k] for k in METRIC_FIELDS if k in metrics and (fields is None or k in fields)}
+
+@np.errstate(all="ignore")
+def metrics_from_statements(statements: Statements, fields=None) -> dict:
+    """
+    Metrics dict for one company. fields (names from METRIC_FIELDS) limits the result to
+    those keys and computes only them and their dependencies; None returns every metric.
+    """
+    if fields is None:
+        wanted = _METRIC_FIELD_SET
+    else:
+        wanted = frozenset(fields)
+        unknown = wanted - _METRIC_FIELD_SET
+        if unknown:
+            raise ValueError(f"Unknown metric fields: {', '.join(sorted(unknown))}")
+
+    values = graph.evaluate(wanted, {"statements": statements})
+    return {k: values[k] for k in METRIC_FIELDS if k in wanted}
+
+def calculate_metrics(pnl, bs, cf, qtr_results, years, qtrs, meta, source="excel", yahoo_info=None, fields=None):
+    """Table-based entry point; see metrics_from_statements."""
+    #print(f"ℹ️ [Backend Metric Calculator] Calculation Starts !!!!!!!!!!!")
+    statements = statements_from_tables(pnl, bs, cf, qtr_results, years, qtrs, meta, source=source)
+    return metrics_from_statements(statements, fields),
 
 
 def calculate_cagr(values):
@@ -440,31 +453,3 @@ def calculate_cagr(values):
             return 0.0
     except:
         return 0.0
-
-
-def make_json_safe(data):
-    import numpy as np
-    import pandas as pd
-    import math
-    import json
-
-    def safe_convert(obj):
-        if isinstance(obj, (np.int64, np.int32)):
-            return int(obj)
-        if isinstance(obj, (np.float64, np.float32, float)):
-            if math.isnan(obj) or math.isinf(obj):
-                return 0
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, (set, tuple)):
-            return list(obj)
-        if isinstance(obj, (pd.Timestamp, pd.Timedelta)):
-            return str(obj)
-        return str(obj)
-
-    try:
-        return json.loads(json.dumps(data, default=safe_convert))
-    except Exception as e:
-        print("⚠️ JSON serialization error:", e)
-        raise
\ No newline at end of file
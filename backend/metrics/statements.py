@@ -0,0 +1,169 @@
+# metrics/statements.py
+"""
+Canonical financial statements shared by every metrics source.
+
+A StatementMatrix is one float array keyed by line item x period. Missing and non-numeric
+cells are 0; every item keeps the number of leading periods its source row covered, so
+metrics can stop a series where its data stops. Statements bundles the annual and
+quarterly matrices with the price inputs.
+
+Adapters:
+  statements_from_workbook(parsed)  - routers.upload_parser.parse_excel() output
+  statements_from_yahoo(result)     - services.yahoo_financials.fetch_yahoo_financials() output
+  statements_from_tables(...)       - loose {item: [values]} tables (legacy call signature)
+  yahoo_meta(info)                  - price / market cap block from a yfinance info dict
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# Screener "Data Sheet" line items; Yahoo statements are mapped onto the same names
+PNL_ITEMS = (
+    "Sales", "Raw Material Cost", "Change in Inventory", "Power and Fuel", "Other Mfr. Exp",
+    "Employee Cost", "Selling and admin", "Other Expenses", "Other Income", "Net profit",
+    "Interest", "Depreciation", "Dividend Amount", "Tax",
+    # reported directly by some sources instead of being derived from the cost lines
+    "EBITDA", "EBIT",
+)
+BS_ITEMS = (
+    "Reserves", "Equity Share Capital", "Borrowings", "Cash & Bank", "Investments",
+    "Capital Work in Progress", "Net Block", "No. of Equity Shares",
+)
+CF_ITEMS = (
+    "Cash from Operating Activity", "Cash from Investing Activity",
+    "Cash from Financing Activity", "Net Cash Flow",
+)
+QUARTERLY_ITEMS = ("Sales", "Other Income", "Depreciation", "Interest", "Net profit", "Operating Profit")
+
+
+def _clean_value(val):
+    # 'NaT', None, empty strings, NaN and non-numeric cells count as 0
+    if val == 'NaT' or val is None or val == '' or str(val).lower() == 'nan':
+        return 0
+    try:
+        return float(val)
+    except:
+        return 0
+
+
+@dataclass
+class StatementMatrix:
+    periods: list
+    values: np.ndarray          # len(items) x len(periods)
+    row_of: dict                # item -> row index
+    lengths: dict               # item -> leading periods covered
+    reported: frozenset         # items the source actually supplied
+
+    @classmethod
+    def from_tables(cls, tables, periods) -> "StatementMatrix":
+        """
+        tables: [(table, items), ...] sharing `periods`, each table {item: [values]}.
+        Items a table lacks are all-zero over every period; rows longer than the period
+        axis are cut, shorter ones keep their length.
+        """
+        n_periods = len(periods)
+        rows = []
+        row_of = {}
+        reported = set()
+        for table, items in tables:
+            for item in items:
+                row_of[item] = len(rows)
+                values = table.get(item)
+                if values is None:
+                    values = [0] * n_periods
+                else:
+                    reported.add(item)
+                rows.append(values[:n_periods])
+        lengths = {item: len(rows[i]) for item, i in row_of.items()}
+        padded = [r if len(r) == n_periods else list(r) + [0] * (n_periods - len(r)) for r in rows]
+        try:
+            # numeric cells (and None -> NaN) convert in a single call
+            data = np.array(padded, dtype=float)
+        except (TypeError, ValueError):
+            # text such as 'NaT' or '' somewhere in the statement
+            data = np.array([[_clean_value(v) for v in r] for r in padded], dtype=float)
+        data = data.reshape(len(rows), n_periods)
+        data[np.isnan(data)] = 0.0
+        return cls(periods, data, row_of, lengths, frozenset(reported))
+
+    def rows(self) -> dict:
+        """{item: row array} views into values."""
+        return {item: self.values[i] for item, i in self.row_of.items()}
+
+
+@dataclass
+class Statements:
+    annual: StatementMatrix
+    quarterly: StatementMatrix
+    current_price: float = 0.0
+    market_cap: float = 0.0      # crores, like the Screener meta block
+    source: str = "excel"
+
+    @property
+    def years(self) -> list:
+        return self.annual.periods
+
+    @property
+    def qtrs(self) -> list:
+        return self.quarterly.periods
+
+
+def statements_from_tables(pnl, bs, cf, qtr_results, years, qtrs, meta, source="excel") -> Statements:
+    return Statements(
+        annual=StatementMatrix.from_tables([(pnl, PNL_ITEMS), (bs, BS_ITEMS), (cf, CF_ITEMS)], years),
+        quarterly=StatementMatrix.from_tables([(qtr_results, QUARTERLY_ITEMS)], qtrs),
+        current_price=float(meta.get("Current Price", 0)),
+        market_cap=float(meta.get("Market Capitalization", 0)),
+        source=source,
+    )
+
+
+def statements_from_workbook(parsed: dict) -> Statements:
+    return statements_from_tables(
+        parsed["pnl"], parsed["balance_sheet"], parsed["cashflow"], parsed["quarters"],
+        parsed["years"], parsed["qtrs"], parsed["meta"], source="excel",
+    )
+
+
+def _align(table: dict, periods: Optional[list], target: list) -> dict:
+    """Re-key a table whose columns are `periods` onto the `target` period axis (0 where absent)."""
+    if not periods or list(periods) == list(target):
+        return table
+    position = {p: i for i, p in enumerate(periods)}
+    index = [position.get(p) for p in target]
+    return {
+        item: [values[i] if i is not None and i < len(values) else 0 for i in index]
+        for item, values in table.items()
+    }
+
+
+def yahoo_meta(info: Optional[dict]) -> dict:
+    """Screener-style meta block from a yfinance info dict (market cap in crores)."""
+    info = info or {}
+    return {
+        "Current Price": info.get("currentPrice") or 0,
+        "Market Capitalization": (info.get("marketCap") or 0) / 1e7,
+    }
+
+
+def statements_from_yahoo(result: dict) -> Statements:
+    """
+    Statements arrive scaled to crores (share counts unscaled) from fetch_yahoo_financials.
+    Balance sheet / cash flow columns are aligned to the P&L years when Yahoo reports a
+    different set of periods for them.
+    """
+    years = result.get("years") or []
+    periods = result.get("periods") or {}
+    return statements_from_tables(
+        _align(result.get("pnl") or {}, periods.get("pnl"), years),
+        _align(result.get("balance_sheet") or {}, periods.get("balance_sheet"), years),
+        _align(result.get("cashflow") or {}, periods.get("cashflow"), years),
+        result.get("quarters") or {},
+        years,
+        result.get("qtrs") or [],
+        yahoo_meta(result.get("info")),
+        source="yahoo",
+    )
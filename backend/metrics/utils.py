@@ -1,6 +1,20 @@
 import numpy as np
 
 
+def round2(values):
+    """
+    Element-wise round(x, 2) on a float array with Python's result. np.round can pick the
+    other side of a near-halfway value, so those few elements are re-rounded with round().
+    """
+    rounded = values.round(2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-7 + np.abs(scaled) * 1e-14
+    if np.count_nonzero(near_half):
+        for i in np.flatnonzero(near_half):
+            rounded.flat[i] = round(float(values.flat[i]), 2)
+    return rounded
+
+
 def safe_divide(a, b):
     try:
         return a / b if b else 0
@@ -19,18 +33,3 @@ def calculate_cagr(start_value, end_value, periods):
         return ((end_value / start_value) ** (1 / periods) - 1) * 100
     except:
         return 0
-
-def make_json_safe(data):
-    import numpy as np
-
-    if isinstance(data, dict):
-        return {k: make_json_safe(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [make_json_safe(i) for i in data]
-    elif isinstance(data, (np.integer, int)):
-        return int(data)
-    elif isinstance(data, (np.floating, float)):
-        if np.isnan(data) or np.isinf(data):
-            return None  # ✅ Safely replace NaN and inf
-        return float(data)
-    return data
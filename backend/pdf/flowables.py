@@ -266,4 +266,46 @@ class LineChartFlowable(_ChartBase):
             c.setFillColor(colors.black)
             c.drawString(x - lw / 2, y + 6, label)
 
-        self._draw_x_labels(c)
\ No newline at end of file
+        self._draw_x_labels(c)
+
+class ChartGridFlowable(Flowable):
+    """
+    Charts laid out in fixed-size cells, `per_row` across, drawn directly on the canvas.
+    Each chart is sized to its cell up front, so layout is a single wrap with no nested
+    Table measuring; page breaks fall between rows.
+    """
+
+    def __init__(self, charts: List[_ChartBase], per_row: int, width: float, cell_pad: int = 6, row_gap: int = 8):
+        self.charts = list(charts)
+        self.per_row = max(1, per_row)
+        self.width = width
+        self.cell_pad = cell_pad
+        self.row_gap = row_gap
+        self.col_width = width / self.per_row
+        for chart in self.charts:
+            chart.width = int(self.col_width) - 2 * cell_pad
+        self.row_height = max((c.height for c in self.charts), default=0) + row_gap
+        self.height = self._rows() * self.row_height
+
+    def _rows(self) -> int:
+        return -(-len(self.charts) // self.per_row)
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fit = int(availHeight // self.row_height) if self.row_height else 0
+        if fit < 1 or fit >= self._rows():
+            return []
+        cut = fit * self.per_row
+        return [
+            ChartGridFlowable(self.charts[:cut], self.per_row, self.width, self.cell_pad, self.row_gap),
+            ChartGridFlowable(self.charts[cut:], self.per_row, self.width, self.cell_pad, self.row_gap),
+        ]
+
+    def draw(self):
+        for i, chart in enumerate(self.charts):
+            row, col = divmod(i, self.per_row)
+            x = col * self.col_width + self.cell_pad
+            y = self.height - (row + 1) * self.row_height + self.row_gap / 2
+            chart.drawOn(self.canv, x, y)
@@ -4,8 +4,9 @@ This replaces your current generator.py with enhanced valuation visualizations
 """
 
 from io import BytesIO
-from typing import Dict, Any, List
-from reportlab.platypus import SimpleDocTemplate
+from typing import Dict, Any, List, Callable, Optional
+from reportlab.platypus import SimpleDocTemplate, Flowable, Paragraph, Spacer, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from datetime import datetime
@@ -13,9 +14,53 @@ import logging
 
 # Import the sections with enhanced valuation capabilities
 from .sections import Sections
+from .static_sections import static_section
 
 logger = logging.getLogger(__name__)
 
+# progress(sections_built, pages_rendered)
+ProgressCallback = Callable[[int, int], None]
+
+
+class _SectionList(list):
+    """Template content list that reports every section a template adds (one extend() each)."""
+
+    def __init__(self, on_section: ProgressCallback):
+        super().__init__()
+        self.sections = 0
+        self._on_section = on_section
+
+    def extend(self, flowables):
+        super().extend(flowables)
+        self.sections += 1
+        self._on_section(self.sections, 0)
+
+
+class _TOCMarker(Flowable):
+    """Zero-size flowable placed where a company's report starts in a combined document."""
+
+    def __init__(self, title: str, key: str):
+        super().__init__()
+        self.title = title
+        self.key = key
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+class _CombinedDocTemplate(SimpleDocTemplate):
+    """Registers each _TOCMarker as a bookmark, outline entry and table-of-contents line."""
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, _TOCMarker):
+            self.canv.bookmarkPage(flowable.key)
+            self.canv.addOutlineEntry(flowable.title, flowable.key, level=0)
+            self.notify('TOCEntry', (0, flowable.title, self.page, flowable.key))
+
+
 class EnhancedPDFGenerator:
     """
     Enhanced PDF generator with Phase 2: Professional Valuation Analysis
@@ -35,18 +80,37 @@ class EnhancedPDFGenerator:
             'left': 50,     # Professional margins
             'right': 50
         }
+        self._progress: Optional[ProgressCallback] = None
     
-    def generate_pdf(self, data: Dict[str, Any], template_type: str = "standard") -> bytes:
+    def _content(self) -> List:
+        return _SectionList(self._progress) if self._progress else []
+
+    def _on_page(self, draw, sections: int):
+        """Page decorator that also reports pages rendered so far."""
+        if not self._progress:
+            return draw
+        progress = self._progress
+
+        def on_page(canv, doc):
+            draw(canv, doc)
+            progress(sections, doc.page)
+        return on_page
+
+    def generate_pdf(self, data: Dict[str, Any], template_type: str = "standard",
+                     progress: Optional[ProgressCallback] = None) -> bytes:
         """
         Generate enhanced PDF with Phase 2 valuation analysis improvements
         
         Args:
             data: Financial analysis data
             template_type: 'standard' | 'executive' | 'detailed' | 'valuation_focused'
+            progress: optional progress(sections_built, pages_rendered), called as each
+                section is built and each page is drawn
             
         Returns:
             bytes: PDF content with enhanced valuation analysis
         """
+        self._progress = progress
         try:
             buffer = BytesIO()
             
@@ -72,19 +136,21 @@ class EnhancedPDFGenerator:
             else:  # standard
                 content = self._build_standard_template(data)
 
+            sections = getattr(content, 'sections', 0)
+
             # Build PDF with branded header/footer
             try:
                 doc.build(
                     content, 
-                    onFirstPage=Sections.branded_header_footer, 
-                    onLaterPages=Sections.branded_header_footer
+                    onFirstPage=self._on_page(Sections.branded_header_footer, sections), 
+                    onLaterPages=self._on_page(Sections.branded_header_footer, sections)
                 )
             except AttributeError:
                 # Fallback to legacy header/footer
                 doc.build(
                     content, 
-                    onFirstPage=Sections.header_footer, 
-                    onLaterPages=Sections.header_footer
+                    onFirstPage=self._on_page(Sections.header_footer, sections), 
+                    onLaterPages=self._on_page(Sections.header_footer, sections)
                 )
             
             pdf_bytes = buffer.getvalue()
@@ -96,6 +162,8 @@ class EnhancedPDFGenerator:
         except Exception as e:
             logger.error(f"Enhanced PDF generation failed: {str(e)}")
             raise
+        finally:
+            self._progress = None
 
     def _get_document_title(self, data: Dict[str, Any]) -> str:
         """Generate document title from company data"""
@@ -109,7 +177,7 @@ class EnhancedPDFGenerator:
 
     def _build_standard_template(self, data: Dict[str, Any]) -> List:
         """Build standard template with enhanced valuation analysis"""
-        content = []
+        content = self._content()
         
         # Get data sections for legacy methods
         valuation = data.get('valuationResults', {})
@@ -149,17 +217,14 @@ class EnhancedPDFGenerator:
         content.extend(Sections.metrics_grid(metrics, assumptions))
         content.extend(Sections.financial_health(metrics))
         
-        # Enhanced disclaimer
-        try:
-            content.extend(Sections.enhanced_disclaimer(data))
-        except AttributeError:
-            content.extend(Sections.disclaimer())
+        # Enhanced disclaimer (pre-rendered, see static_sections)
+        content.extend(static_section('enhanced_disclaimer'))
         
         return content
 
     def _build_executive_template(self, data: Dict[str, Any]) -> List:
         """Build executive template focused on key insights"""
-        content = []
+        content = self._content()
         
         # Get data for legacy methods
         valuation = data.get('valuationResults', {})
@@ -193,17 +258,14 @@ class EnhancedPDFGenerator:
         except AttributeError:
             content.extend(Sections.financial_health(metrics))
         
-        # Enhanced disclaimer
-        try:
-            content.extend(Sections.enhanced_disclaimer(data))
-        except AttributeError:
-            content.extend(Sections.disclaimer())
+        # Enhanced disclaimer (pre-rendered, see static_sections)
+        content.extend(static_section('enhanced_disclaimer'))
         
         return content
 
     def _build_detailed_template(self, data: Dict[str, Any]) -> List:
         """Build detailed template with comprehensive analysis"""
-        content = []
+        content = self._content()
         
         # Get data sections
         valuation = data.get('valuationResults', {})
@@ -248,17 +310,14 @@ class EnhancedPDFGenerator:
         except AttributeError:
             content.extend(Sections.financial_health(metrics))
             
-        # Enhanced disclaimer
-        try:
-            content.extend(Sections.enhanced_disclaimer(data))
-        except AttributeError:
-            content.extend(Sections.disclaimer())
+        # Enhanced disclaimer (pre-rendered, see static_sections)
+        content.extend(static_section('enhanced_disclaimer'))
         
         return content
 
     def _build_valuation_focused_template(self, data: Dict[str, Any]) -> List:
         """NEW: Build valuation-focused template - highlights analytical findings"""
-        content = []
+        content = self._content()
         
         valuation = data.get('valuationResults', {})
         metrics = data.get('metrics', {}) or {}
@@ -293,14 +352,57 @@ class EnhancedPDFGenerator:
         # Key assumptions
         content.extend(Sections.assumptions_block(assumptions))
         
-        # Enhanced disclaimer
-        try:
-            content.extend(Sections.enhanced_disclaimer(data))
-        except AttributeError:
-            content.extend(Sections.disclaimer())
+        # Enhanced disclaimer (pre-rendered, see static_sections)
+        content.extend(static_section('enhanced_disclaimer'))
         
         return content
 
+    def generate_combined_pdf(self, reports: List[Dict[str, Any]], template_type: str = "standard",
+                              title: str = "FundalQ Coverage Pack") -> bytes:
+        """
+        One PDF holding several reports: a table of contents page, then each report's
+        template content on fresh pages, with a bookmark per company.
+        """
+        from .styles import STYLES
+
+        buffer = BytesIO()
+        doc = _CombinedDocTemplate(
+            buffer,
+            pagesize=A4,
+            topMargin=self.page_margins['top'],
+            bottomMargin=self.page_margins['bottom'],
+            leftMargin=self.page_margins['left'],
+            rightMargin=self.page_margins['right'],
+            title=title,
+            author="FundalQ - Understand the Why, Before the Buy"
+        )
+
+        toc = TableOfContents()
+        toc.levelStyles[0].fontSize = 11
+        content = [Paragraph(title, STYLES['Title']), Spacer(1, 12), toc]
+
+        builders = {
+            "valuation_focused": self._build_valuation_focused_template,
+            "executive": self._build_executive_template,
+            "detailed": self._build_detailed_template,
+        }
+        build = builders.get(template_type, self._build_standard_template)
+        for i, data in enumerate(reports):
+            content.append(PageBreak())
+            content.append(_TOCMarker(self._get_document_title(data).replace(" - FundalQ Valuation Report", ""), f"report-{i}"))
+            content.extend(build(data))
+
+        doc.multiBuild(
+            content,
+            onFirstPage=Sections.branded_header_footer,
+            onLaterPages=Sections.branded_header_footer
+        )
+        pdf_bytes = buffer.getvalue()
+        buffer.close()
+
+        logger.info(f"Combined PDF with {len(reports)} reports generated ({len(pdf_bytes)} bytes)")
+        return pdf_bytes
+
     def validate_data(self, data: Dict[str, Any]) -> bool:
         """Validate input data structure"""
         required_sections = ['companyInfo']
@@ -343,6 +445,16 @@ def generate_fundalq_report(data: Dict[str, Any], template_type: str = 'standard
     
     return generator.generate_pdf(data, template_type)
 
+def generate_combined_fundalq_report(reports: List[Dict[str, Any]], template_type: str = 'standard') -> bytes:
+    """Generate one FundalQ branded PDF with a table of contents over several reports"""
+    generator = EnhancedPDFGenerator()
+
+    for data in reports:
+        if not generator.validate_data(data):
+            raise ValueError("Invalid data structure for PDF generation")
+
+    return generator.generate_combined_pdf(reports, template_type)
+
 def generate_valuation_focused_report(data: Dict[str, Any]) -> bytes:
     """Generate valuation-focused report - NEW template for analytical findings"""
     return generate_fundalq_report(data, 'valuation_focused')
\ No newline at end of file
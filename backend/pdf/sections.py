@@ -29,12 +29,31 @@ class Sections:
     """Static builders returning arrays of flowables (Paragraph, Table, Spacer...)."""
 
     @staticmethod
-    def header_footer(canv, doc):
+    def _stamp(canv, form_name: str, draw_static) -> None:
+        """
+        Draw the page-independent artwork into a form XObject on the document's first page,
+        then reference it from every page; only per-page text is drawn afterwards.
+        """
+        if not canv.hasForm(form_name):
+            canv.beginForm(form_name)
+            draw_static(canv)
+            canv.endForm()
+        canv.doForm(form_name)
+
+    @staticmethod
+    def _header_footer_static(canv):
         canv.saveState()
         canv.setFont('Helvetica-Bold', 10)
         canv.drawString(30, A4[1] - 30, "Financial Analysis Report")
         canv.drawString(A4[0] - 150, A4[1] - 30, f"Generated: {datetime.now():%Y-%m-%d}")
         canv.drawString(30, 30, "Confidential - For Internal Use Only")
+        canv.restoreState()
+
+    @staticmethod
+    def header_footer(canv, doc):
+        Sections._stamp(canv, "header_footer", Sections._header_footer_static)
+        canv.saveState()
+        canv.setFont('Helvetica-Bold', 10)
         canv.drawString(A4[0] - 100, 30, f"Page {doc.page}")
         canv.restoreState()
 
@@ -651,7 +670,7 @@ class Sections:
         if not metrics:
             return []
 
-        from .flowables import BarChartFlowable, LineChartFlowable
+        from .flowables import BarChartFlowable, ChartGridFlowable, LineChartFlowable
 
         def _listify(x):
             if x is None:
@@ -679,38 +698,19 @@ class Sections:
             parts.append(Paragraph(section_title, STYLES['Heading3']))
             parts.append(Spacer(1, 4))
 
-            row_cells = []
-            col_width = (A4[0] - (0.75 * inch) * 2) / per_row  # rough fit across printable width
-
-            def _mk_cell(flow):
-                # Wrap each chart in a one-cell table to keep layout tidy
-                t = Table([[flow]], colWidths=[col_width])
-                t.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP')]))
-                return t
-
-            count = 0
+            grid_width = A4[0] - (0.75 * inch) * 2  # rough fit across printable width
+            charts = []
             for label, key, kind in entries:
                 is_percent = key in percent_keys
                 y_lbls, series = _align_series_exact(key)   # <- use exact alignment
                 if not y_lbls or not series:
                     continue
-                flow = BarChartFlowable(label, y_lbls, series, width=int(col_width)-8, height=140, y_is_percent=is_percent) \
-                    if kind == 'bar' else \
-                    LineChartFlowable(label, y_lbls, series, width=int(col_width)-8, height=140, y_is_percent=is_percent)
-
-                row_cells.append(_mk_cell(flow))
-                count += 1
-
-                if count % per_row == 0:
-                    parts.append(Table([row_cells], colWidths=[col_width]*per_row, style=table_style(0)))
-                    parts.append(Spacer(1, 6))
-                    row_cells = []
-
-            if row_cells:
-                # pad remaining columns for consistent width
-                while len(row_cells) < per_row:
-                    row_cells.append(Table([[""]], colWidths=[col_width], style=table_style(0)))
-                parts.append(Table([row_cells], colWidths=[col_width]*per_row, style=table_style(0)))
+                # width is set by the grid from its cell size
+                chart_cls = BarChartFlowable if kind == 'bar' else LineChartFlowable
+                charts.append(chart_cls(label, y_lbls, series, height=140, y_is_percent=is_percent))
+
+            if charts:
+                parts.append(ChartGridFlowable(charts, per_row, grid_width))
                 parts.append(Spacer(1, 8))
 
         # 1) Past Growth (bars)
@@ -1390,8 +1390,8 @@ class Sections:
         return parts
 
     @staticmethod
-    def branded_header_footer(canv, doc):
-        """Enhanced header and footer with FundalQ branding"""
+    def _branded_static(canv):
+        """Everything in the branded header/footer except the page number."""
         canv.saveState()
         
         # FundalQ Brand Colors
@@ -1422,11 +1422,22 @@ class Sections:
         canv.setFillColor(colors.HexColor(MEDIUM_GRAY))
         canv.setFont('Helvetica', 8)
         canv.drawString(40, 30, "Confidential - For Internal Use Only")
-        canv.drawRightString(A4[0] - 40, 30, f"Page {doc.page}")
         
         # Footer accent line
         canv.setStrokeColor(colors.HexColor(BLUE_ACCENT))
         canv.setLineWidth(1)
         canv.line(40, 45, A4[0] - 40, 45)
         
-        canv.restoreState()
\ No newline at end of file
+        canv.restoreState()
+
+    @staticmethod
+    def branded_header_footer(canv, doc):
+        """Enhanced header and footer with FundalQ branding"""
+        Sections._stamp(canv, "branded_header_footer", Sections._branded_static)
+        
+        # Page number is the only per-page part
+        canv.saveState()
+        canv.setFillColor(colors.HexColor('#64748b'))
+        canv.setFont('Helvetica', 8)
+        canv.drawRightString(A4[0] - 40, 30, f"Page {doc.page}")
+        canv.restoreState()
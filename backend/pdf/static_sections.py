@@ -0,0 +1,152 @@
+"""
+Pre-rendered boilerplate sections.
+
+Sections whose content does not depend on the report (the disclaimer) are laid out and
+drawn once per process for each (section, version, frame width) onto a scratch canvas;
+the recorded PDF operators are then stitched into every report as one form XObject per
+document. Templates add static_section(name) instead of calling the Sections builder, so
+those Paragraphs are never constructed, wrapped or split again.
+
+The result can still break across pages, at the boundaries between the section's
+top-level flowables. Bump a section's version whenever its builder changes (along with
+REPORT_TEMPLATE_VERSION in services/report_cache.py).
+"""
+from __future__ import annotations
+
+import re
+from io import BytesIO
+from typing import Callable, Dict, List, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, Frame
+
+from .sections import Sections
+
+# name -> (version, builder)
+STATIC_SECTIONS: Dict[str, Tuple[str, Callable[[], List]]] = {
+    "enhanced_disclaimer": ("1", lambda: Sections.enhanced_disclaimer({})),
+}
+
+_SCRATCH_HEIGHT = 100000   # tall enough that nothing splits while recording
+_BLEED = 24                # room for backgrounds drawn outside a flowable's box
+_FONT_REF = re.compile(r"/F\d+(?=\s+[\d.]+\s+Tf)")
+
+
+# The recording reads ReportLab internals (canv._code, frame._y, canv._doc.fontMapping) and
+# rewrites the recorded /Fn font references for each document. Written against the
+# reportlab==4.0.4 pin in requirements.txt: after changing that pin, run
+# `python -m benchmarks.pdf_render --check-static`, which compares every template against the
+# live Sections builders (page count, stitched form, fonts, text) and fails on any drift.
+class _Recording:
+    """Operators and geometry of one section drawn at one width."""
+
+    def __init__(self, name: str, version: str, width: float):
+        self.form_name = f"static_{name}_v{version}_{width:.2f}".replace(".", "_")
+        self.width = width
+        self.items: List[Tuple[float, float, float, float]] = []   # (top, bottom, spaceBefore, spaceAfter)
+
+        canv = Canvas(BytesIO(), pagesize=A4)
+        frame = Frame(0, 0, width, _SCRATCH_HEIGHT, leftPadding=0, rightPadding=0,
+                      topPadding=0, bottomPadding=0)
+        start = len(canv._code)
+        for i, flowable in enumerate(STATIC_SECTIONS[name][1]()):
+            before = frame._y
+            space_before = flowable.getSpaceBefore()
+            if not frame.add(flowable, canv, trySplit=0):
+                raise ValueError(f"Static section {name} does not fit the scratch frame")
+            space_after = flowable.getSpaceAfter()
+            top = before - (space_before if i else 0)
+            self.items.append((top, frame._y + space_after, space_before, space_after))
+        # ReportLab has no public accessor for the operators drawn so far (see the note above)
+        self.code = canv._code[start:]
+        self.fonts = {internal: font for font, internal in canv._doc.fontMapping.items()}
+        self.bottom = min((bottom for _, bottom, _, _ in self.items), default=_SCRATCH_HEIGHT)
+
+    def define_form(self, canv) -> None:
+        """Add the recording to canv's document as a form, once per document."""
+        if canv.hasForm(self.form_name):
+            return
+        fonts = {internal: canv._doc.getInternalFontName(font) for internal, font in self.fonts.items()}
+        canv.beginForm(self.form_name, -_BLEED, self.bottom - _BLEED, self.width + _BLEED, _SCRATCH_HEIGHT + _BLEED)
+        for line in self.code:
+            canv.addLiteral(_FONT_REF.sub(lambda m: fonts.get(m.group(0), m.group(0)), line))
+        canv.endForm()
+
+
+_recordings: Dict[Tuple[str, str, float], _Recording] = {}
+
+
+def _recording(name: str, width: float) -> _Recording:
+    version = STATIC_SECTIONS[name][0]
+    key = (name, version, round(width, 2))
+    rec = _recordings.get(key)
+    if rec is None:
+        rec = _recordings[key] = _Recording(name, version, round(width, 2))
+    return rec
+
+
+class StaticSectionFlowable(Flowable):
+    """
+    A run of a static section's top-level flowables, drawn from the pre-rendered form
+    clipped to their band. Splits between flowables, never inside one.
+    """
+
+    def __init__(self, name: str, start: int = 0, end: int = None):
+        super().__init__()
+        self.name = name
+        self.start = start
+        self.end = end
+        self._rec = None
+
+    def _items(self):
+        return self._rec.items[self.start:self.end]
+
+    def wrap(self, availWidth, availHeight):
+        if self._rec is None or self._rec.width != round(availWidth, 2):
+            self._rec = _recording(self.name, availWidth)
+        items = self._items()
+        self.width = self._rec.width
+        self.height = items[0][0] - items[-1][1] if items else 0
+        return self.width, self.height
+
+    def getSpaceBefore(self):
+        items = self._items() if self._rec else None
+        return items[0][2] if items else 0
+
+    def getSpaceAfter(self):
+        items = self._items() if self._rec else None
+        return items[-1][3] if items else 0
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        items = self._items()
+        top = items[0][0] if items else 0
+        fit = 0
+        while fit < len(items) and top - items[fit][1] <= availHeight:
+            fit += 1
+        if fit < 1 or fit >= len(items):
+            return []
+        cut = self.start + fit
+        return [StaticSectionFlowable(self.name, self.start, cut), StaticSectionFlowable(self.name, cut, self.end)]
+
+    def draw(self):
+        items = self._items()
+        if not items:
+            return
+        (_, _, space_before, _), (_, bottom, _, space_after) = items[0], items[-1]
+        canv = self.canv
+        self._rec.define_form(canv)
+        canv.saveState()
+        # the gap between two bands is split at the flowables' own spacing
+        path = canv.beginPath()
+        path.rect(-_BLEED, -space_after, self.width + 2 * _BLEED, self.height + space_before + space_after)
+        canv.clipPath(path, stroke=0, fill=0)
+        canv.translate(0, -bottom)
+        canv.doForm(self._rec.form_name)
+        canv.restoreState()
+
+
+def static_section(name: str) -> List[Flowable]:
+    """Flowables for a pre-rendered static section, in place of its Sections builder."""
+    return [StaticSectionFlowable(name)]
@@ -0,0 +1,207 @@
+# routers/analysis_reports.py
+"""
+Saved analysis reports (frontend: src/lib/analysisReportsApi.ts).
+
+The PDF is rendered once, on create, and kept in the blob store; downloads stream the
+stored bytes (with Range support) instead of re-running the generator. Rows saved before
+the blob column existed are rendered from report_data on first download and backfilled.
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from hashlib import sha256
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.deps import get_db, get_current_user
+from core.models import AnalysisReport
+from services import report_cache
+from services.blob_store import BlobNotFound, get_blob_store
+from services.pdf_rendering import ascii_filename, content_disposition, render_report_cached
+from services.worker_pool import PoolSaturated, WorkerCrashed
+
+router = APIRouter(prefix="/analysis-reports", tags=["analysis-reports"])
+
+
+class ReportCreate(BaseModel):
+    company_name: str = Field(min_length=1, max_length=200)
+    ticker_symbol: str = Field(min_length=1, max_length=20)
+    report_title: str = Field(min_length=1, max_length=300)
+    report_data: Dict[str, Any] = Field(default_factory=dict)
+
+
+def _summary(r: AnalysisReport) -> dict:
+    return {
+        "id": str(r.id),
+        "company_name": r.company_name,
+        "ticker_symbol": r.ticker_symbol,
+        "report_title": r.report_title,
+        "pdf_file_name": r.pdf_file_name,
+        "pdf_size_bytes": r.pdf_size_bytes,
+        "created_at": r.created_at.isoformat(),
+    }
+
+
+def _get_owned(db: Session, user, report_id: str) -> AnalysisReport:
+    try:
+        rid = uuid.UUID(report_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid id")
+    r = db.get(AnalysisReport, rid)
+    if not r or r.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Not found")
+    return r
+
+
+def _render_payload(company_name: str, ticker_symbol: str, report_data: dict) -> dict:
+    """report_data plus the companyInfo block the generator titles the report with."""
+    company_info = {"name": company_name, "ticker": ticker_symbol, **(report_data.get("companyInfo") or {})}
+    return {**report_data, "companyInfo": company_info}
+
+
+async def _render_and_store(r: AnalysisReport, report_data: dict) -> bytes:
+    payload = _render_payload(r.company_name, r.ticker_symbol, report_data)
+    template_type = payload.get("template_type", "standard")
+    try:
+        _, pdf_bytes = await render_report_cached(payload, template_type)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except WorkerCrashed as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"PDF generation exceeded {settings.PDF_TIMEOUT_SECONDS}s")
+
+    key = f"{r.user_id}/{r.id}.pdf"
+    get_blob_store().put(key, pdf_bytes)
+    r.pdf_blob_key = key
+    r.pdf_sha256 = sha256(pdf_bytes).hexdigest()
+    r.pdf_size_bytes = len(pdf_bytes)
+    return pdf_bytes
+
+
+def _byte_range(header: Optional[str], size: int) -> Optional[tuple]:
+    """(start, end) inclusive for a single 'bytes=' range; None means the whole blob."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None  # multi-range requests get the full body, which RFC 9110 allows
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+@router.post("", status_code=201)
+async def create_report(payload: ReportCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    r = AnalysisReport(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        company_name=payload.company_name,
+        ticker_symbol=payload.ticker_symbol,
+        report_title=payload.report_title,
+        report_data=json.dumps(payload.report_data),
+        pdf_file_name=ascii_filename(f"{payload.company_name}_{payload.ticker_symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"),
+        pdf_size_bytes=0,
+    )
+    await _render_and_store(r, payload.report_data)
+    db.add(r)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        get_blob_store().delete(r.pdf_blob_key)
+        raise
+    db.refresh(r)
+    return {**_summary(r), "updated_at": r.updated_at.isoformat()}
+
+
+@router.get("")
+def list_reports(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    rows = (
+        db.query(AnalysisReport)
+        .filter(AnalysisReport.user_id == user.id)
+        .order_by(AnalysisReport.created_at.desc())
+        .offset(skip).limit(limit).all()
+    )
+    return [_summary(r) for r in rows]
+
+
+@router.get("/count")
+def count_reports(db: Session = Depends(get_db), user=Depends(get_current_user)):
+    total = db.query(func.count(AnalysisReport.id)).filter(AnalysisReport.user_id == user.id).scalar()
+    return {"total_reports": total or 0}
+
+
+@router.get("/{report_id}")
+def get_report(report_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    return _get_owned(db, user, report_id).to_dict()
+
+
+@router.get("/{report_id}/download")
+async def download_report(report_id: str, request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    r = _get_owned(db, user, report_id)
+    store = get_blob_store()
+
+    size = None
+    if r.pdf_blob_key:
+        try:
+            size = store.size(r.pdf_blob_key)
+        except BlobNotFound:
+            size = None
+    if size is None:
+        # saved before PDFs were stored, or the blob was lost: render once and keep it
+        await _render_and_store(r, json.loads(r.report_data) if r.report_data else {})
+        db.commit()
+        size = r.pdf_size_bytes
+
+    headers = {
+        "Content-Disposition": content_disposition(r.pdf_file_name),
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{r.pdf_sha256}"',
+    }
+    if report_cache.matches(request.headers.get("if-none-match"), r.pdf_sha256):
+        return Response(status_code=304, headers={"ETag": headers["ETag"]})
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range == headers["ETag"]:
+        byte_range = _byte_range(request.headers.get("range"), size)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(store.read_range(r.pdf_blob_key), media_type="application/pdf", headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        store.read_range(r.pdf_blob_key, start, end), status_code=206, media_type="application/pdf", headers=headers
+    )
+
+
+@router.delete("/{report_id}")
+def delete_report(report_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    r = _get_owned(db, user, report_id)
+    blob_key = r.pdf_blob_key
+    db.delete(r)
+    db.commit()
+    if blob_key:
+        get_blob_store().delete(blob_key)
+    return {"message": "Report deleted"}
@@ -1,35 +1,44 @@
 # Replace your existing complex code with:
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import Response
-from services.enhanced_pdf_generator import EnhancedPDFGenerator
+from core.config import settings
+from services import report_cache
+from services.pdf_rendering import content_disposition, render_report_cached, report_filename
+from services.worker_pool import PoolSaturated, WorkerCrashed
 from typing import Dict, Any
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Initialize the generator once
-pdf_generator = EnhancedPDFGenerator()
-
 @router.post("/generate-enhanced-report")
-async def generate_enhanced_report(data: Dict[str, Any]):
-    """Simple enhanced endpoint"""
+async def generate_enhanced_report(data: Dict[str, Any], request: Request):
+    """Simple enhanced endpoint; rendering runs in the PDF worker pool"""
     try:
         template_type = data.get('template_type', 'standard')
-        pdf_bytes = pdf_generator.generate_pdf(data, template_type)
+        key, pdf_bytes = await render_report_cached(data, template_type, request.headers.get("if-none-match"))
+        if pdf_bytes is None:
+            return Response(status_code=304, headers={"ETag": report_cache.etag(key)})
         
-        company_name = data.get('companyInfo', {}).get('name', 'Report')
-        ticker = data.get('companyInfo', {}).get('ticker', '')
-        filename = f"{company_name.replace(' ', '_')}_{ticker}_Report.pdf"
+        filename = report_filename(data)
         
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(pdf_bytes))
+                "Content-Disposition": content_disposition(filename),
+                "Content-Length": str(len(pdf_bytes)),
+                "ETag": report_cache.etag(key),
+                "Cache-Control": "private, no-cache",
             }
         )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except WorkerCrashed as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"PDF generation exceeded {settings.PDF_TIMEOUT_SECONDS}s")
     except Exception as e:
         logger.error(f"PDF generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -5,8 +5,11 @@ from core.deps import get_db, get_current_user
 from core.models import Portfolio
 import uuid
 # --- Summary endpoint ---
-from core.positions import compute_positions
+from core.positions import compute_positions, compute_household_positions
 from core.models import Portfolio
+from core import summary_cache
+from core.serialization import FastJSONResponse
+import time
 
 router = APIRouter(prefix="/portfolios", tags=["portfolios"])
 
@@ -40,10 +43,26 @@ def delete_portfolio(pid: str, db: Session = Depends(get_db), user=Depends(get_c
     if not p or p.owner_id != user.id:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(p); db.commit()
+    summary_cache.invalidate_portfolio(pid_uuid)
     return {"ok": True}
 
 
-@router.get("/{pid}")
+@router.get("/aggregate", response_class=FastJSONResponse)
+def get_household_summary(db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Combined INR summary across all of the user's portfolios."""
+    rows = db.query(Portfolio).filter(Portfolio.owner_id == user.id).order_by(Portfolio.created_at.desc()).all()
+    data = compute_household_positions(db, [r.id for r in rows])
+    by_portfolio = data.pop("by_portfolio")
+    return FastJSONResponse({
+        "portfolios": [
+            {"id": str(r.id), "name": r.name, "base_currency": r.base_currency, "totals": by_portfolio.get(str(r.id))}
+            for r in rows
+        ],
+        **data
+    })
+
+
+@router.get("/{pid}", response_class=FastJSONResponse)
 def get_portfolio_summary(pid: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
     # ownership check
     import uuid
@@ -56,10 +75,23 @@ def get_portfolio_summary(pid: str, db: Session = Depends(get_db), user=Depends(
     if not p or p.owner_id != user.id:
         raise HTTPException(status_code=404, detail="Not found")
 
-    data = compute_positions(db, p.id)
-    return {
+    # cached per (portfolio, transaction version, quote epoch)
+    started = time.perf_counter()
+    headers = {}
+    key = summary_cache.summary_key(p)
+    data = summary_cache.get_summary(key)
+    if data is None:
+        data = compute_positions(db, p.id)
+        summary_cache.put_summary(key, data)
+        headers["X-Cache"] = "MISS"
+    else:
+        headers["X-Cache"] = "HIT"
+    headers["X-Summary-Version"] = f"{key[1]}.{key[2]}"
+    headers["Server-Timing"] = f"summary;dur={(time.perf_counter() - started) * 1000:.2f}"
+
+    return FastJSONResponse({
         "id": str(p.id),
         "name": p.name,
         "base_currency": p.base_currency,
         **data
-    }
+    }, headers=headers)
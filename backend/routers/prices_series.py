@@ -4,6 +4,8 @@ from typing import List, Literal, Optional
 from datetime import datetime, timedelta
 import yfinance as yf
 
+from core.serialization import FastJSONResponse
+
 BENCHMARK_MAP = {
     # Feel free to adjust if you prefer different tickers
     "nifty50": "^NSEI",
@@ -30,7 +32,7 @@ def _range_to_period_and_interval(r: Range):
     if r == "MAX":  return ("max", "1mo")
     return ("1y", "1d")
 
-@router.get("/price-series/{ticker}")
+@router.get("/price-series/{ticker}", response_class=FastJSONResponse)
 def get_price_series(
     ticker: str,
     range: Range = "1Y",
@@ -68,12 +70,12 @@ def get_price_series(
         if not data:
             raise HTTPException(status_code=404, detail="No price data points after normalization")
 
-        return {
+        return FastJSONResponse({
             "ticker": ticker.upper(),
             "range": range,
             "interval": interval,
             "points": data,
-        }
+        })
 
     except HTTPException:
         raise
@@ -109,7 +111,7 @@ def _fetch_history_series(ticker: str, period: str, interval: str):
         data.append({"date": date_str, "close": close_f, "volume": vol_i})
     return data
 
-@router.get("/price-series/benchmark/{code}")
+@router.get("/price-series/benchmark/{code}", response_class=FastJSONResponse)
 def get_benchmark_series(code: str, range: Range = "1Y", interval: Optional[Interval] = None):
     code_key = code.lower()
     y_ticker = BENCHMARK_MAP.get(code_key)
@@ -123,13 +125,13 @@ def get_benchmark_series(code: str, range: Range = "1Y", interval: Optional[Inte
         points = _fetch_history_series(y_ticker, period, interval)
         if not points:
             raise HTTPException(status_code=404, detail="No price data found")
-        return {
+        return FastJSONResponse({
             "code": code_key,
             "ticker": y_ticker,
             "range": range,
             "interval": interval,
             "points": points,
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,199 @@
+# routers/report_batch.py
+"""
+Coverage packs: many reports in one download.
+
+POST /reports/batch takes report payloads and/or tickers (resolved through the Yahoo
+profile pipeline) and returns either a ZIP with one PDF per company, streamed as the
+PDF workers finish them, or a single PDF with a table of contents.
+"""
+import asyncio
+import io
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.db import SessionLocal
+from routers.yahoo_fetcher import build_yahoo_profile
+from services.pdf_rendering import pdf_pool, render_combined_report, render_fundalq_report, report_filename
+from services.worker_pool import PoolSaturated, WorkerCrashed
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+_SKIPPED_HEADER_MAX = 2048   # bytes of X-Batch-Skipped; X-Batch-Skipped-Count has the full count
+
+
+class ReportBatchRequest(BaseModel):
+    reports: List[Dict[str, Any]] = Field(default_factory=list)   # /generate-enhanced-report payloads
+    tickers: List[str] = Field(default_factory=list)              # Yahoo tickers, e.g. TCS.NS
+    template_type: str = "standard"
+    format: Literal["zip", "pdf"] = "zip"
+
+
+def profile_to_report(ticker: str, profile: dict) -> dict:
+    """Report payload from a /yahoo-profile result."""
+    info = profile.get("company_info") or {}
+    return {
+        "companyInfo": {**info, "name": info.get("name") or ticker, "ticker": ticker},
+        "metrics": profile.get("metrics") or {},
+        "assumptions": profile.get("assumptions") or {},
+        "valuationResults": profile.get("valuationResults") or {},
+    }
+
+
+def _label(item) -> str:
+    return item if isinstance(item, str) else (item.get("companyInfo") or {}).get("name")
+
+
+def _skipped_header(labels: List[str]) -> str:
+    """
+    Skipped tickers/company names for a header: each percent-encoded (headers are latin-1,
+    names need not be) and comma-separated, stopping before _SKIPPED_HEADER_MAX bytes.
+    """
+    parts, size = [], 0
+    for label in labels:
+        part = quote(str(label)[:100], safe="")
+        size += len(part) + 1
+        if size > _SKIPPED_HEADER_MAX:
+            break
+        parts.append(part)
+    return ",".join(parts)
+
+
+def _resolve_ticker(ticker: str) -> dict:
+    db = SessionLocal()
+    try:
+        return profile_to_report(ticker, build_yahoo_profile(ticker, db=db))
+    finally:
+        db.close()
+
+
+async def _payload(item, fetch_slots: asyncio.Semaphore) -> dict:
+    if isinstance(item, dict):
+        return item
+    async with fetch_slots:
+        return await run_in_threadpool(_resolve_ticker, item)
+
+
+async def _render(fn, *args, timeout: Optional[float] = None) -> bytes:
+    while True:
+        try:
+            return await pdf_pool.run(fn, *args, timeout=timeout)
+        except PoolSaturated:
+            # interactive renders hold the remaining slots; wait for one to free up
+            await asyncio.sleep(0.5)
+
+
+async def _batch_item(index: int, item, template_type: str, fetch_slots: asyncio.Semaphore, slots: asyncio.Semaphore) -> dict:
+    label = _label(item)
+    try:
+        payload = await _payload(item, fetch_slots)
+        async with slots:
+            pdf_bytes = await _render(render_fundalq_report, payload, template_type)
+        return {"index": index, "name": f"{index + 1:02d}_{report_filename(payload)}", "pdf": pdf_bytes}
+    except asyncio.TimeoutError:
+        return {"index": index, "error": f"{label}: PDF generation exceeded {settings.PDF_TIMEOUT_SECONDS}s"}
+    except Exception as e:
+        return {"index": index, "error": f"{label}: {e}"}
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only stream that hands back what ZipFile wrote since the last drain()."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        out, self._chunks = b"".join(self._chunks), []
+        return out
+
+
+@router.post("/batch")
+async def generate_report_batch(request: ReportBatchRequest):
+    """
+    ZIP (default): PDFs rendered in parallel in the PDF worker pool and streamed in
+    completion order; failures are listed in errors.txt inside the archive.
+    PDF: every report in one document with a table of contents and bookmarks.
+    """
+    items = list(request.reports) + [t.strip() for t in request.tickers if t and t.strip()]
+    if not items:
+        return JSONResponse(content={"error": "Provide reports or tickers"}, status_code=400)
+    if len(items) > settings.REPORT_BATCH_MAX_ITEMS:
+        return JSONResponse(content={"error": f"Batch exceeds {settings.REPORT_BATCH_MAX_ITEMS} reports"}, status_code=413)
+    for i, report in enumerate(request.reports):
+        if not (report.get("companyInfo") or {}).get("name"):
+            return JSONResponse(content={"error": f"reports[{i}]: companyInfo.name is required"}, status_code=400)
+
+    fetch_slots = asyncio.Semaphore(settings.REPORT_BATCH_FETCH_CONCURRENCY)
+    stamp = datetime.now().strftime('%Y%m%d')
+
+    if request.format == "pdf":
+        payloads, skipped, errors = [], [], []
+        results = await asyncio.gather(*(_payload(item, fetch_slots) for item in items), return_exceptions=True)
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                skipped.append(_label(item))
+                errors.append(f"{_label(item)}: {result}")
+            else:
+                payloads.append(result)
+        if not payloads:
+            return JSONResponse(content={"error": "No reports could be built", "skipped": errors}, status_code=400)
+        try:
+            pdf_bytes = await _render(render_combined_report, payloads, request.template_type,
+                                      timeout=settings.REPORT_JOB_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return JSONResponse(content={"error": f"PDF generation exceeded {settings.REPORT_JOB_TIMEOUT_SECONDS}s"}, status_code=504)
+        except WorkerCrashed as e:
+            return JSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "5"})
+        headers = {
+            "Content-Disposition": f"attachment; filename=FundalQ_Coverage_{stamp}.pdf",
+            "Content-Length": str(len(pdf_bytes)),
+        }
+        if skipped:
+            headers["X-Batch-Skipped-Count"] = str(len(skipped))
+            headers["X-Batch-Skipped"] = _skipped_header(skipped)
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+    async def stream():
+        # leave one PDF worker (if there is more than one) free so single reports still get through
+        slots = asyncio.Semaphore(max(1, pdf_pool.max_workers - 1))
+        tasks = [
+            asyncio.create_task(_batch_item(i, item, request.template_type, fetch_slots, slots))
+            for i, item in enumerate(items)
+        ]
+        sink = _ZipSink()
+        errors = []
+        try:
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    if "error" in result:
+                        errors.append(result)
+                        continue
+                    zf.writestr(result["name"], result["pdf"])
+                    yield sink.drain()
+                if errors:
+                    zf.writestr("errors.txt", "\n".join(e["error"] for e in sorted(errors, key=lambda e: e["index"])) + "\n")
+            yield sink.drain()
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=FundalQ_Coverage_{stamp}.zip"},
+    )
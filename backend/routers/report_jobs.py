@@ -0,0 +1,68 @@
+# routers/report_jobs.py
+"""
+Queued report generation: POST returns a job id at once, GET polls status and progress,
+/download streams the finished PDF. Jobs are visible only to the user who queued them.
+See services/report_jobs.py.
+"""
+import json
+import uuid
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from core.deps import get_db, get_current_user
+from core.models import ReportJob
+from services import report_jobs
+from services.blob_store import BlobNotFound, get_blob_store
+from services.pdf_rendering import content_disposition, report_filename
+
+router = APIRouter(prefix="/reports/jobs", tags=["reports"])
+
+
+def _get_owned(db: Session, user, job_id: str) -> ReportJob:
+    try:
+        jid = uuid.UUID(job_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid id")
+    job = db.get(ReportJob, jid)
+    if not job or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Not found")
+    return job
+
+
+@router.post("", status_code=202)
+async def create_job(data: Dict[str, Any], db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Queue a PDF build; poll GET /reports/jobs/{id} for progress."""
+    try:
+        job = await report_jobs.enqueue(db, user.id, data, data.get('template_type', 'standard'))
+    except report_jobs.TooManyJobs as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return report_jobs.to_dict(job)
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    return report_jobs.to_dict(_get_owned(db, user, job_id))
+
+
+@router.get("/{job_id}/download")
+def download_job(job_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    job = _get_owned(db, user, job_id)
+    if job.status != report_jobs.DONE:
+        raise HTTPException(status_code=409, detail=f"Report job is {job.status}")
+    try:
+        chunks = get_blob_store().read_range(job.pdf_blob_key)
+    except BlobNotFound:
+        raise HTTPException(status_code=410, detail="Report file is no longer available")
+
+    filename = report_filename(json.loads(job.payload))
+    return StreamingResponse(
+        chunks,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(filename),
+            "Content-Length": str(job.pdf_size_bytes),
+        },
+    )
@@ -1,7 +1,8 @@
 # routers/safe_metrics_wrapper.py
 
 import math
-from metrics.metrics_calculator import calculate_metrics as original_calculate_metrics
+from metrics.metrics_calculator import ASSUMPTION_METRICS, metrics_from_statements
+from metrics.statements import statements_from_tables, yahoo_meta
 
 def safe_numeric(value):
     """Convert any value to a safe numeric value"""
@@ -30,43 +31,28 @@ def clean_financial_data(data):
     else:
         return safe_numeric(data)
 
-def safe_calculate_metrics(pnl, bs, cf, years, source="excel", yahoo_info=None):
+def safe_calculate_metrics(pnl, bs, cf, years, source="excel", yahoo_info=None, qtr_results=None, qtrs=None):
     """
-    Wrapper around calculate_metrics that handles None values gracefully
+    Wrapper around the metrics path that handles None values gracefully.
+    Statement cells are cleaned once while building the canonical statements (None, NaN
+    and text become 0, short rows keep their length), so no recursive pre/post cleaning.
     """
+    years_clean = years if years else []
     try:
-        # Clean all input data
-        pnl_clean = clean_financial_data(pnl) if pnl else {}
-        bs_clean = clean_financial_data(bs) if bs else {}
-        cf_clean = clean_financial_data(cf) if cf else {}
-        years_clean = years if years else []
-        
-        # Ensure all financial statement items have the right number of years
-        for table in [pnl_clean, bs_clean, cf_clean]:
-            for key, values in table.items():
-                if not isinstance(values, list):
-                    values = [values] if values is not None else []
-                
-                # Pad or trim to match years length
-                while len(values) < len(years_clean):
-                    values.append(0)
-                table[key] = values[:len(years_clean)]
-        
-        # Call original function with cleaned data
-        calculated_metrics, assumptions = original_calculate_metrics(
-            pnl_clean, bs_clean, cf_clean, years_clean, source=source, yahoo_info=yahoo_info
+        statements = statements_from_tables(
+            pnl or {}, bs or {}, cf or {}, qtr_results or {}, years_clean, qtrs or [], yahoo_meta(yahoo_info),
+            source=source,
         )
-        
-        # Clean the results as well
-        calculated_metrics = clean_financial_data(calculated_metrics)
-        assumptions = clean_financial_data(assumptions)
-        
+        calculated_metrics = metrics_from_statements(statements)
+        assumptions = {k: calculated_metrics[k] for k in ASSUMPTION_METRICS}
+
         return calculated_metrics, assumptions
-        
+
     except Exception as e:
         print(f"Error in safe_calculate_metrics: {e}")
         
         # Return basic fallback structure
+        pnl_clean = clean_financial_data(pnl) if pnl else {}
         revenue_values = pnl_clean.get("Sales", pnl_clean.get("Revenue", [0] * len(years_clean)))
         net_profit_values = pnl_clean.get("Net profit", pnl_clean.get("Net Income", [0] * len(years_clean)))
         
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, validator
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
+import base64
 from core.deps import get_db, get_current_user
 from core.models import Portfolio, Transaction
+from core.summary_cache import bump_tx_version
 import uuid
 
 router = APIRouter(prefix="/portfolios/{pid}/tx", tags=["transactions"])
@@ -64,16 +67,72 @@ def _tx_out(r: Transaction) -> TxOut:
         trade_ccy=r.trade_ccy, fx_rate=r.fx_rate, notes=r.notes
     )
 
+# Columns needed for TxOut; list_tx selects these directly instead of hydrating ORM objects
+_TX_FIELDS = ("id", "trade_date", "symbol", "side", "quantity", "price", "fees", "trade_ccy", "fx_rate", "notes")
+_TX_COLUMNS = tuple(getattr(Transaction, f) for f in _TX_FIELDS)
+
+def _tx_row_out(row) -> dict:
+    out = dict(zip(_TX_FIELDS, row))
+    out["id"] = str(out["id"])
+    return out
+
+def _encode_cursor(trade_date: date, created_at: datetime, tx_id) -> str:
+    raw = f"{trade_date.isoformat()}|{created_at.isoformat()}|{tx_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        td, ca, tid = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+        return date.fromisoformat(td), datetime.fromisoformat(ca), uuid.UUID(tid)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("", response_model=list[TxOut])
-def list_tx(pid: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def list_tx(
+    pid: str,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
+    symbol: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Newest-first transaction listing with keyset pagination on (trade_date, created_at, id).
+    Without `limit` every matching row is returned. With `limit`, the `X-Next-Cursor`
+    response header carries the cursor for the next page (absent on the last page).
+    """
     p = _get_owned_portfolio(db, user.id, pid)
-    rows = (
-        db.query(Transaction)
-        .filter(Transaction.portfolio_id == p.id)
-        .order_by(Transaction.trade_date.desc(), Transaction.id.desc())
-        .all()
-    )
-    return [_tx_out(r) for r in rows]
+    q = db.query(*_TX_COLUMNS, Transaction.created_at).filter(Transaction.portfolio_id == p.id)
+
+    if symbol:
+        q = q.filter(func.upper(Transaction.symbol) == symbol.strip().upper())
+    if date_from:
+        q = q.filter(Transaction.trade_date >= date_from)
+    if date_to:
+        q = q.filter(Transaction.trade_date <= date_to)
+    if cursor:
+        td, ca, tid = _decode_cursor(cursor)
+        q = q.filter(
+            tuple_(Transaction.trade_date, Transaction.created_at, Transaction.id) < tuple_(td, ca, tid)
+        )
+
+    q = q.order_by(Transaction.trade_date.desc(), Transaction.created_at.desc(), Transaction.id.desc())
+
+    if limit is None:
+        rows = q.all()
+    else:
+        # fetch one extra row to know whether another page exists
+        rows = q.limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            response.headers["X-Next-Cursor"] = _encode_cursor(last.trade_date, last.created_at, last.id)
+
+    return [_tx_row_out(r) for r in rows]
 
 @router.post("", response_model=TxOut, status_code=201)
 def create_tx(pid: str, payload: TxIn, db: Session = Depends(get_db), user=Depends(get_current_user)):
@@ -83,7 +142,9 @@ def create_tx(pid: str, payload: TxIn, db: Session = Depends(get_db), user=Depen
         side=payload.side, quantity=payload.quantity, price=payload.price,
         fees=payload.fees, trade_ccy=payload.trade_ccy, fx_rate=payload.fx_rate, notes=payload.notes
     )
-    db.add(r); db.commit(); db.refresh(r)
+    db.add(r)
+    bump_tx_version(db, p.id)
+    db.commit(); db.refresh(r)
     return _tx_out(r)
 
 @router.patch("/{txid}", response_model=TxOut)
@@ -108,12 +169,14 @@ def update_tx(pid: str, txid: str, payload: TxPatch, db: Session = Depends(get_d
     for k, v in data.items():
         setattr(r, k, v)
 
-    db.add(r); db.commit(); db.refresh(r)
+    db.add(r)
+    bump_tx_version(db, p.id)
+    db.commit(); db.refresh(r)
     return _tx_out(r)
 
 @router.delete("/{txid}")
 def delete_tx(pid: str, txid: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    _get_owned_portfolio(db, user.id, pid)
+    p = _get_owned_portfolio(db, user.id, pid)
     try:
         tx_uuid = uuid.UUID(txid)
     except Exception:
@@ -121,5 +184,7 @@ def delete_tx(pid: str, txid: str, db: Session = Depends(get_db), user=Depends(g
     r = db.get(Transaction, tx_uuid)
     if not r or str(r.portfolio_id) != pid:
         raise HTTPException(status_code=404, detail="Not found")
-    db.delete(r); db.commit()
+    db.delete(r)
+    bump_tx_version(db, p.id)
+    db.commit()
     return {"ok": True}
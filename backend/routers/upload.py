@@ -1,134 +1,200 @@
 # upload.py
 
-from fastapi import APIRouter, UploadFile, File
-from fastapi.responses import JSONResponse
-from .upload_parser import parse_excel
-from metrics.metrics_calculator import calculate_metrics
-from metrics.metrics_input_mapper import extract_inputs
-from metrics.utils import make_json_safe
-from routers.dcf import calculate_dcf as run_dcf
-from routers.sensitivity import dcf_sensitivity as run_dcf_sensitivity
-from calculators.eps_calculator import project_eps as run_eps
-from routers.dcf import DCFInput  # import your model
-from routers.sensitivity import SensitivityInput
-from routers.eps import EPSProjectionRequest
-
-import pandas as pd
-
-router = APIRouter()
-import math
-
-def clean_dict(d):
-    for k, v in d.items():
-        if isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
-            d[k] = 0
-    return d
-
-import math
-
-def deep_clean_dict(obj):
-    if isinstance(obj, dict):
-        return {k: deep_clean_dict(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [deep_clean_dict(i) for i in obj]
-    elif isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
-        return 0
-    return obj
-
-@router.post("/upload-excel")
-async def upload_excel(file: UploadFile = File(...)):
+import asyncio
+import io
+import posixpath
+import zipfile
+
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from core.config import settings
+from core.serialization import FastJSONResponse, dumps
+from services import workbook_cache
+from services.upload_intake import (
+    CappedBodyRoute, SpooledUpload, UploadTooLarge, max_body, spool_upload, spool_zip_member,
+)
+from metrics.metrics_calculator import parse_metric_fields
+from services.upload_pipeline import analyze_workbook, build_upload_response, complete_analysis
+from services.worker_pool import BoundedProcessPool, PoolSaturated, WorkerCrashed
+
+router = APIRouter(route_class=CappedBodyRoute)
+
+upload_pool = BoundedProcessPool(
+    "upload",
+    max_workers=settings.UPLOAD_WORKERS,
+    max_pending=settings.UPLOAD_MAX_PENDING,
+    timeout=settings.UPLOAD_TIMEOUT_SECONDS,
+)
+
+@router.post("/upload-excel", response_class=FastJSONResponse)
+@max_body(settings.UPLOAD_MAX_BYTES)
+async def upload_excel(
+    file: UploadFile = File(...),
+    fields: Optional[str] = Query(None, description="Comma-separated metric names; default is every metric"),
+):
     try:
-        contents = await file.read()
-        parsed = parse_excel(contents)
-
-        company_name = parsed["company_name"]
-        #print(f"ℹ️ [BACKEND DEBUG] company_name : {company_name}")
-        meta = parsed["meta"]
-        #print(f"ℹ️ [BACKEND DEBUG] Meta data: {meta}")
-        pnl = parsed["pnl"]
-        #print(f"ℹ️ [BACKEND DEBUG] pnl data: {pnl}")
-        bs = parsed["balance_sheet"]
-        #print(f"ℹ️ [BACKEND DEBUG] bs data: {bs}")
-        cf = parsed["cashflow"]
-        #print(f"ℹ️ [BACKEND DEBUG] cf data: {cf}")
-        qtr_results = parsed["quarters"]
-        #print(f"ℹ️ [BACKEND DEBUG] quarters data: {qtr_results}")
-        years = parsed["years"]
-        #print(f"ℹ️ [BACKEND DEBUG] years data: {years}")
-        
-        qtrs = parsed["qtrs"]
-        #print(f"ℹ️ [BACKEND DEBUG] Quarters data: {qtrs}")
-        
-        calculated_metrics = calculate_metrics(pnl, bs, cf, qtr_results, years, qtrs, meta, source="excel")[0]
-        
-        #print(f"ℹ️ [BACKEND DEBUG]  calculated_metrics: {calculated_metrics}")
-
-         # Derive assumptions from metrics
-        assumptions = {
-            "current_price": calculated_metrics["current_price"],
-            "base_revenue": calculated_metrics["latest_revenue"],
-            "latest_net_debt": calculated_metrics["latest_net_debt"],
-            "shares_outstanding": calculated_metrics["shares_outstanding"],
-            "ebit_margin": calculated_metrics["ebit_margin"],
-            "depreciation_pct": calculated_metrics["depreciation_pct"],
-            "capex_pct": calculated_metrics["capex_pct"],
-            "wc_change_pct": calculated_metrics["wc_change_pct"],
-            "tax_rate": calculated_metrics["tax_rate"],
-            "interest_pct": calculated_metrics["interest_pct"],
-            "x_years": 3,
-            "growth_x": calculated_metrics["growth_x"],
-            "y_years": 10,
-            "growth_y": calculated_metrics["growth_y"],
-            "growth_terminal": calculated_metrics["growth_terminal"],
-            "base_year": calculated_metrics["base_year"],
-            "interest_exp_pct": calculated_metrics["interest_exp_pct"],
-            "fairvalue_pe":calculated_metrics["fairvalue_pe"],
-        }
-        #print(f"ℹ️ [BACKEND DEBUG] assumptions: {assumptions}")
-        # Run DCF and Sensitivity
-        
-        dcf_result = run_dcf(DCFInput(**assumptions))
-        #print(f"ℹ️ [BACKEND DEBUG] dcf_result: {dcf_result}")
-        dcf_sens_result = run_dcf_sensitivity(SensitivityInput(**assumptions))
-        #print(f"ℹ️ [BACKEND DEBUG] dcf_sens_result: {dcf_sens_result}")
-        # Run EPS projection
-        eps_input = {
-            "base_revenue": assumptions["base_revenue"],
-            "projection_years": 3,
-            "revenue_growth": assumptions["growth_x"],
-            "ebit_margin": assumptions["ebit_margin"],
-            "interest_exp_pct": assumptions["interest_exp_pct"],
-            "tax_rate": assumptions["tax_rate"],
-            "shares_outstanding": assumptions["shares_outstanding"],
-            "current_price": assumptions["current_price"],
-            "base_year": assumptions["base_year"],
-            "fairvalue_pe":assumptions["fairvalue_pe"],
-        }
-        #print(f"ℹ️ [BACKEND DEBUG] eps_input: {eps_input}")
-        eps_result = run_eps(
-            eps_input["base_revenue"],
-            eps_input["projection_years"],
-            eps_input["revenue_growth"],
-            eps_input["ebit_margin"],
-            eps_input["interest_exp_pct"],
-            eps_input["tax_rate"],
-            eps_input["shares_outstanding"],
-            eps_input["current_price"],
-            eps_input["base_year"],
-            eps_input["fairvalue_pe"],                        
-        )
-        #print(f"ℹ️ [BACKEND DEBUG] eps_result: {eps_result}")
-        return make_json_safe({
-            "company_info": company_name,
-            "metrics": calculated_metrics,
-            "assumptions": assumptions,
-            "valuationResults": {
-                "dcf": dcf_result,
-                "dcf_sensitivity": dcf_sens_result,
-                "eps": eps_result
-            }
-        })
-        
+        fields = parse_metric_fields(fields)
+        headers = {}
 
+        # the body was size-capped while it arrived (CappedBodyRoute); the chunked copy hashes
+        # it and spools it to disk past the threshold
+        with await spool_upload(file) as upload:
+            # identical bytes -> reuse parsed statements + metrics
+            key = upload.digest
+            analysis = workbook_cache.get(key)
+            cached = analysis is not None
+            if not cached:
+                # parse + metrics run in a worker process so the event loop stays free;
+                # large uploads are passed by path rather than pickled across
+                analysis = await upload_pool.run(analyze_workbook, upload.source, fields)
+            headers["X-Cache"] = "HIT" if cached else "MISS"
+            headers["X-Content-Digest"] = f"sha256={key}"
+
+        body = await run_in_threadpool(_respond, key, analysis, cached, fields)
+        # serialized in one pass, skipping FastAPI's jsonable_encoder walk
+        return FastJSONResponse(body, headers=headers)
+
+    except UploadTooLarge as e:
+        return JSONResponse(content={"error": str(e)}, status_code=413)
+    except PoolSaturated as e:
+        return JSONResponse(content={"error": str(e)}, status_code=429, headers={"Retry-After": "5"})
+    except WorkerCrashed as e:
+        return JSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "5"})
+    except asyncio.TimeoutError:
+        return JSONResponse(
+            content={"error": f"Workbook processing exceeded {settings.UPLOAD_TIMEOUT_SECONDS}s"},
+            status_code=504,
+        )
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=400)
+
+
+def _respond(key: str, analysis: dict, cached: bool, fields=None) -> dict:
+    """
+    Caches a fresh analysis, or adds the metrics a cached one lacks, then builds the
+    valuations. Blocking (metrics, DCF, pickling for the cache): run off the event loop.
+    """
+    if not cached:
+        workbook_cache.put(key, analysis)
+    else:
+        # statements are cached; metrics a previous request did not select are added here
+        completed = complete_analysis(analysis, fields)
+        if completed is not None:
+            analysis = completed
+            workbook_cache.put(key, analysis)
+    return build_upload_response(analysis, fields)
+
+
+def _workbooks_from_upload(upload: SpooledUpload) -> list[SpooledUpload]:
+    """
+    The upload itself if it is an .xlsx, or every .xlsx inside it if it is a ZIP.
+    Blocking (reads and decompresses the archive): run off the event loop.
+    """
+    name = (upload.filename or "").lower()
+    opened = lambda: upload.path if upload.on_disk else io.BytesIO(upload.source)
+    if not name.endswith(".zip") and not zipfile.is_zipfile(opened()):
+        return [upload]
+    # an .xlsx is itself a zip; only treat it as an archive if it contains workbooks
+    extracted = []
+    try:
+        with zipfile.ZipFile(opened()) as zf:
+            members = [
+                m for m in zf.infolist()
+                if not m.is_dir()
+                and m.filename.lower().endswith(".xlsx")
+                and not posixpath.basename(m.filename).startswith((".", "~$"))
+                and not m.filename.startswith("__MACOSX/")
+            ]
+            if not members and not name.endswith(".zip"):
+                return [upload]
+            for m in members:
+                extracted.append(spool_zip_member(zf, m))
+    except BaseException:
+        # a corrupt archive or a member over the limit: the caller never sees these spools
+        _cleanup(extracted)
+        upload.cleanup()
+        raise
+    upload.cleanup()
+    return extracted
+
+def _cleanup(uploads) -> None:
+    for u in uploads:
+        u.cleanup()
+
+async def _process_batch_item(upload: SpooledUpload, slots: asyncio.Semaphore) -> dict:
+    async with slots:
+        try:
+            key = upload.digest
+            analysis = workbook_cache.get(key)
+            cached = analysis is not None
+            if not cached:
+                while True:
+                    try:
+                        analysis = await upload_pool.run(analyze_workbook, upload.source)
+                        break
+                    except PoolSaturated:
+                        # interactive uploads hold the remaining slots; wait for one to free up
+                        await asyncio.sleep(0.5)
+            result = await run_in_threadpool(_respond, key, analysis, cached)
+            return {"file": upload.filename, "status": "ok", "cache": "HIT" if cached else "MISS", "result": result}
+        except asyncio.TimeoutError:
+            return {"file": upload.filename, "status": "error", "error": f"Workbook processing exceeded {settings.UPLOAD_TIMEOUT_SECONDS}s"}
+        except Exception as e:
+            return {"file": upload.filename, "status": "error", "error": str(e)}
+        finally:
+            upload.cleanup()
+
+@router.post("/upload-excel/batch")
+@max_body(settings.UPLOAD_BATCH_MAX_BYTES)
+async def upload_excel_batch(files: list[UploadFile] = File(...)):
+    """
+    Several .xlsx files and/or ZIPs of them. Workbooks are processed in parallel in the
+    upload worker pool and streamed back as NDJSON, one line per workbook in completion
+    order, followed by a summary line.
+    """
+    items: list[SpooledUpload] = []
+    try:
+        total_bytes = 0
+        for f in files:
+            upload = await spool_upload(f, max_bytes=settings.UPLOAD_BATCH_MAX_BYTES)
+            # the ZIP walk and member decompression are blocking file I/O
+            workbooks = await run_in_threadpool(_workbooks_from_upload, upload)
+            items.extend(workbooks)
+            for wb in workbooks:
+                if wb.size > settings.UPLOAD_MAX_BYTES:
+                    raise UploadTooLarge(wb.filename, settings.UPLOAD_MAX_BYTES)
+                total_bytes += wb.size
+            if len(items) > settings.UPLOAD_BATCH_MAX_FILES:
+                raise ValueError(f"Batch exceeds {settings.UPLOAD_BATCH_MAX_FILES} workbooks")
+            if total_bytes > settings.UPLOAD_BATCH_MAX_BYTES:
+                raise UploadTooLarge("Batch", settings.UPLOAD_BATCH_MAX_BYTES)
+        if not items:
+            raise ValueError("No .xlsx workbooks found in upload")
+    except UploadTooLarge as e:
+        _cleanup(items)
+        return JSONResponse(content={"error": str(e)}, status_code=413)
+    except (ValueError, zipfile.BadZipFile) as e:
+        _cleanup(items)
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    async def stream():
+        # keep at most one batch job per worker in flight so single uploads still get through
+        slots = asyncio.Semaphore(upload_pool.max_workers)
+        tasks = [asyncio.create_task(_process_batch_item(upload, slots)) for upload in items]
+        ok = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                ok += line["status"] == "ok"
+                yield dumps(line) + b"\n"
+            yield dumps({"done": True, "total": len(items), "ok": ok, "failed": len(items) - ok}) + b"\n"
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    # spool files of items that never started (client went away) are removed after the response
+    return StreamingResponse(stream(), media_type="application/x-ndjson", background=BackgroundTask(_cleanup, items))
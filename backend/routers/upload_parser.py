@@ -1,23 +1,51 @@
 # upload_parser.py
 
+import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
 import io
+from datetime import date, datetime
 from collections import Counter
 
+# Column-0 labels that open each section of the Screener "Data Sheet"
+SECTION_ANCHORS = ("PROFIT & LOSS", "BALANCE SHEET", "CASH FLOW:", "Quarters", "META")
+
+def _format_header(h):
+    # Fallback for non-date cells: same rules the sheet has always used
+    try:
+        return pd.to_datetime(h).strftime("%b-%Y")
+    except Exception:
+        if pd.notnull(h) and str(h).strip():
+            return str(h)
+        return None
+
 def format_column_headers(headers):
-    formatted = []
-    blank_counter = 1
-    for h in headers:
+    headers = list(headers)
+    formatted = [None] * len(headers)
+
+    # Screener header rows are date cells: convert them in one DatetimeIndex call
+    date_pos = [
+        i for i, h in enumerate(headers)
+        if isinstance(h, (datetime, date, np.datetime64)) and not pd.isna(h)
+    ]
+    if date_pos:
         try:
-            h_parsed = pd.to_datetime(h)
-            formatted.append(h_parsed.strftime("%b-%Y"))
-        except:
-            if pd.notnull(h) and str(h).strip():
-                formatted.append(str(h))
-            else:
-                formatted.append(f"Unnamed_{blank_counter}")
-                blank_counter += 1
+            labels = pd.DatetimeIndex([headers[i] for i in date_pos]).strftime("%b-%Y")
+            for i, label in zip(date_pos, labels):
+                formatted[i] = label
+        except Exception:
+            date_pos = []
+    converted = set(date_pos)
+    for i, h in enumerate(headers):
+        if i not in converted:
+            formatted[i] = _format_header(h)
+
+    blank_counter = 1
+    for i, h in enumerate(formatted):
+        if h is None:
+            formatted[i] = f"Unnamed_{blank_counter}"
+            blank_counter += 1
+
     counts = Counter()
     unique = []
     for h in formatted:
@@ -25,8 +53,9 @@ def format_column_headers(headers):
         unique.append(f"{h}_{counts[h]}" if counts[h] > 1 else h)
     return unique
 
-def extract_table(df, start_label, start_row_offset, col_count=11):
-    start_row = df[df.iloc[:, 0] == start_label].index[0]
+def extract_table(df, start_label, start_row_offset, col_count=11, start_row=None):
+    if start_row is None:
+        start_row = int(np.flatnonzero(df.iloc[:, 0].to_numpy(dtype=object) == start_label)[0])
     header_row = start_row + start_row_offset
     headers_raw = df.iloc[header_row, 1:col_count].tolist()
     formatted_headers = format_column_headers(headers_raw)
@@ -34,17 +63,21 @@ def extract_table(df, start_label, start_row_offset, col_count=11):
     # Keep only valid columns (non-Unnamed)
     valid_indices = [i for i, h in enumerate(formatted_headers) if not str(h).startswith("Unnamed_")]
     years = [formatted_headers[i] for i in valid_indices]
+
+    # The table runs until the first blank label; slice that block out once
+    labels = df.iloc[header_row + 1:, 0].to_numpy(dtype=object)
+    blank = np.flatnonzero(pd.isna(labels))
+    n_rows = int(blank[0]) if len(blank) else len(labels)
+    block = df.iloc[header_row + 1:header_row + 1 + n_rows, [1 + j for j in valid_indices]].to_numpy(dtype=object)
+
     data_rows = {}
-    for i in range(header_row + 1, df.shape[0]):
-        row_label = df.iloc[i, 0]
-        row_values = [df.iloc[i, 1 + j] for j in valid_indices]
-        if pd.isna(row_label):
-            break
+    for row_label, row_values in zip(labels[:n_rows], block.tolist()):
         data_rows[str(row_label).strip()] = row_values[:len(years)]
     return data_rows, years
 
-def extract_meta(df):
-    meta_start = df[df.iloc[:, 0] == "META"].index[0]
+def extract_meta(df, meta_start=None):
+    if meta_start is None:
+        meta_start = df[df.iloc[:, 0] == "META"].index[0]
     df_meta = df.iloc[meta_start+1:, 0:2].dropna()
     df_meta.columns = ["Label", "Value"]
     raw = df_meta.set_index("Label")["Value"].to_dict()
@@ -67,38 +100,65 @@ def normalize_table(table):
         for k, row in table.items()
     }
 
-def make_json_safe(obj):
-    if isinstance(obj, dict):
-        return {k: make_json_safe(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_json_safe(v) for v in obj]
-    elif isinstance(obj, (pd.Timestamp, pd._libs.tslibs.nattype.NaTType)):
-        return str(obj)
-    else:
-        return obj
-
-def parse_excel(file_bytes):
-    wb = load_workbook(io.BytesIO(file_bytes), data_only=True)
-    ws = wb["Data Sheet"]
-    df_all = pd.DataFrame(ws.values)
-
-    company_name = ws["B1"].value or "Unknown Company"
-    meta = extract_meta(df_all)
+def _workbook_source(src):
+    """openpyxl takes a path or a file-like object; raw bytes get wrapped."""
+    if isinstance(src, (bytes, bytearray)):
+        return io.BytesIO(src)
+    return src
+
+def read_data_sheet(file_bytes, streaming=True):
+    """
+    Load the "Data Sheet" into a DataFrame. file_bytes may also be a filesystem path
+    (e.g. a spooled upload), which read_only mode reads lazily instead of from memory.
+
+    streaming=True opens the workbook read_only and records the first row of every
+    SECTION_ANCHORS label in the same pass that collects the rows, so callers can skip
+    the per-section column scans. streaming=False is the original full-load path.
+
+    Returns (df_all, company_name, anchors); anchors is {} in full mode.
+    """
+    if not streaming:
+        wb = load_workbook(_workbook_source(file_bytes), data_only=True)
+        ws = wb["Data Sheet"]
+        return pd.DataFrame(ws.values), ws["B1"].value, {}
+
+    wb = load_workbook(_workbook_source(file_bytes), read_only=True, data_only=True)
+    try:
+        ws = wb["Data Sheet"]
+        rows = []
+        anchors = {}
+        for i, row in enumerate(ws.iter_rows(values_only=True)):
+            label = row[0] if row else None
+            if label in SECTION_ANCHORS and label not in anchors:
+                anchors[label] = i
+            rows.append(row)
+    finally:
+        # read_only workbooks keep the zip archive open until closed
+        wb.close()
+
+    company_name = rows[0][1] if rows and len(rows[0]) > 1 else None
+    return pd.DataFrame(rows), company_name, anchors
+
+def parse_excel(file_bytes, streaming=True):
+    df_all, company_name, anchors = read_data_sheet(file_bytes, streaming=streaming)
+
+    company_name = company_name or "Unknown Company"
+    meta = extract_meta(df_all, anchors.get("META"))
     #print(f"ℹ️ [BACKEND DEBUG] Meta data: {meta}")
 
-    pnl, pnl_years = extract_table(df_all, "PROFIT & LOSS", 1)
+    pnl, pnl_years = extract_table(df_all, "PROFIT & LOSS", 1, start_row=anchors.get("PROFIT & LOSS"))
     ##print(f"ℹ️ [BACKEND DEBUG] Meta data: {pnl_years}")
     ##print(f"ℹ️ [BACKEND DEBUG] Meta data: {pnl}")
 
-    bs, bs_years = extract_table(df_all, "BALANCE SHEET", 1)
+    bs, bs_years = extract_table(df_all, "BALANCE SHEET", 1, start_row=anchors.get("BALANCE SHEET"))
     ##print(f"ℹ️ [BACKEND DEBUG] Meta data: {bs_years}")
     ##print(f"ℹ️ [BACKEND DEBUG] Meta data: {bs}")
 
-    cf, cf_years = extract_table(df_all, "CASH FLOW:", 1)
+    cf, cf_years = extract_table(df_all, "CASH FLOW:", 1, start_row=anchors.get("CASH FLOW:"))
     ##print(f"ℹ️ [BACKEND DEBUG] Meta data: {cf_years}")
     ##print(f"ℹ️ [BACKEND DEBUG] Meta data: {cf}")
 
-    quarters, quarters_years = extract_table(df_all, "Quarters", 1)
+    quarters, quarters_years = extract_table(df_all, "Quarters", 1, start_row=anchors.get("Quarters"))
     
     
 
@@ -109,7 +169,7 @@ def parse_excel(file_bytes):
     #print(f"ℹ️ [BACKEND DEBUG] Parser PnL : {pnl}")
     #print(f"ℹ️ [BACKEND DEBUG] Parser Quarters : {quarters}")
 
-    return make_json_safe({
+    return {
         "company_name": company_name,
         "meta": meta,
         "pnl": pnl,
@@ -118,4 +178,4 @@ def parse_excel(file_bytes):
         "quarters": quarters,
         "years": [y for y in pnl_years if y in bs_years and y in cf_years],
         "qtrs": [y for y in quarters_years]
-    })
\ No newline at end of file
+    }
\ No newline at end of file
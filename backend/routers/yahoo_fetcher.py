@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Body
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, Query
+from sqlalchemy.orm import Session
+
+from core.db import get_db
 from services.yahoo_financials import fetch_yahoo_financials  
-from services.yahoo_utils import make_json_safe
+from core.serialization import FastJSONResponse
 from metrics.metrics_input_mapper import extract_inputs
-from metrics.metrics_calculator import calculate_metrics
+from metrics.metrics_calculator import metrics_from_statements, parse_metric_fields, select_metrics, with_assumption_metrics
+from metrics.statements import statements_from_yahoo
 from routers.dcf import calculate_dcf as run_dcf
 from routers.sensitivity import dcf_sensitivity as run_dcf_sensitivity
 from calculators.eps_calculator import project_eps as run_eps
@@ -14,89 +20,98 @@ import math
 
 router = APIRouter()
 
-@router.post("/yahoo-profile")
-def get_yahoo_profile(data: dict = Body(...)):
-    try:
-        
-        ticker = data.get("ticker")
-        
-        result = fetch_yahoo_financials(ticker)
-
-        pnl = result.get("pnl", {})
-        bs = result.get("balance_sheet", {})
-        cf = result.get("cashflow", {})
-        years = result.get("years", [])
-        yahoo_info = result.get("info", {})
-        company_info = result.get("company_info", {})
-        reporting_currency= result.get("reporting_currency",{})
-        original_currency= result.get("original_currency",{})
-        source = "yahoo"
-        
-        metrics = calculate_metrics(pnl, bs, cf, years, source=source, yahoo_info=yahoo_info)[0]
-
-        # Derive assumptions from metrics
-        assumptions = {
-            "current_price": metrics["current_price"],
-            "base_revenue": metrics["latest_revenue"],
-            "latest_net_debt": metrics["latest_net_debt"],
-            "shares_outstanding": metrics["shares_outstanding"],
-            "ebit_margin": metrics["ebit_margin"],
-            "depreciation_pct": metrics["depreciation_pct"],
-            "capex_pct": metrics["capex_pct"],
-            "wc_change_pct": metrics["wc_change_pct"],
-            "tax_rate": metrics["tax_rate"],
-            "interest_pct": metrics["interest_pct"],
-            "x_years": 3,
-            "growth_x": metrics["growth_x"],
-            "y_years": 10,
-            "growth_y": metrics["growth_y"],
-            "growth_terminal": metrics["growth_terminal"],
-            "base_year": metrics["base_year"],
-            "interest_exp_pct": metrics["interest_exp_pct"],
-            
-        }
-        # Run DCF and Sensitivity
-        
-
-        dcf_result = run_dcf(DCFInput(**assumptions))
-        
-        dcf_sens_result = run_dcf_sensitivity(SensitivityInput(**assumptions))
-
-        # Run EPS projection
-        eps_input = {
-            "base_revenue": assumptions["base_revenue"],
-            "projection_years": 3,
-            "revenue_growth": assumptions["growth_x"],
-            "ebit_margin": assumptions["ebit_margin"],
-            "interest_exp_pct": assumptions["interest_exp_pct"],
-            "tax_rate": assumptions["tax_rate"],
-            "shares_outstanding": assumptions["shares_outstanding"],
-            "current_price": assumptions["current_price"],
-            "base_year": assumptions["base_year"],
+# same default the report assumptions panel starts from
+DEFAULT_FAIRVALUE_PE = 20
+
+def build_yahoo_profile(ticker: str, fields=None, years: Optional[int] = None, db: Optional[Session] = None) -> dict:
+    """Statements, metrics, assumptions and DCF / EPS valuations for a Yahoo ticker."""
+    return profile_from_financials(fetch_yahoo_financials(ticker, years=years, db=db), fields)
+
+
+def profile_from_financials(result: dict, fields=None) -> dict:
+    """The profile for a fetch_yahoo_financials()-shaped result (no network access)."""
+    company_info = result.get("company_info", {})
+
+    # same canonical statements + metrics path as /upload-excel
+    statements = statements_from_yahoo(result)
+    metrics = metrics_from_statements(statements, with_assumption_metrics(fields))
+
+    # Derive assumptions from metrics
+    assumptions = {
+        "current_price": metrics["current_price"],
+        "base_revenue": metrics["latest_revenue"],
+        "latest_net_debt": metrics["latest_net_debt"],
+        "shares_outstanding": metrics["shares_outstanding"],
+        "ebit_margin": metrics["ebit_margin"],
+        "depreciation_pct": metrics["depreciation_pct"],
+        "capex_pct": metrics["capex_pct"],
+        "wc_change_pct": metrics["wc_change_pct"],
+        "tax_rate": metrics["tax_rate"],
+        "interest_pct": metrics["interest_pct"],
+        "x_years": 3,
+        "growth_x": metrics["growth_x"],
+        "y_years": 10,
+        "growth_y": metrics["growth_y"],
+        "growth_terminal": metrics["growth_terminal"],
+        "base_year": metrics["base_year"],
+        "interest_exp_pct": metrics["interest_exp_pct"],
+
+    }
+    # Run DCF and Sensitivity
+
+
+    dcf_result = run_dcf(DCFInput(**assumptions))
+
+    dcf_sens_result = run_dcf_sensitivity(SensitivityInput(**assumptions))
+
+    # Run EPS projection
+    eps_input = {
+        "base_revenue": assumptions["base_revenue"],
+        "projection_years": 3,
+        "revenue_growth": assumptions["growth_x"],
+        "ebit_margin": assumptions["ebit_margin"],
+        "interest_exp_pct": assumptions["interest_exp_pct"],
+        "tax_rate": assumptions["tax_rate"],
+        "shares_outstanding": assumptions["shares_outstanding"],
+        "current_price": assumptions["current_price"],
+        "base_year": assumptions["base_year"],
+        "fairvalue_pe": DEFAULT_FAIRVALUE_PE,
+    }
+    eps_result = run_eps(
+        eps_input["base_revenue"],
+        eps_input["projection_years"],
+        eps_input["revenue_growth"],
+        eps_input["ebit_margin"],
+        eps_input["interest_exp_pct"],
+        eps_input["tax_rate"],
+        eps_input["shares_outstanding"],
+        eps_input["current_price"],
+        eps_input["base_year"],
+        eps_input["fairvalue_pe"],
+    )
+
+    return {
+        "company_info": company_info,
+        "metrics": select_metrics(metrics, fields),
+        "assumptions": assumptions,
+        "valuationResults": {
+            "dcf": dcf_result,
+            "dcf_sensitivity": dcf_sens_result,
+            "eps": eps_result
         }
-        eps_result = run_eps(
-            eps_input["base_revenue"],
-            eps_input["projection_years"],
-            eps_input["revenue_growth"],
-            eps_input["ebit_margin"],
-            eps_input["interest_exp_pct"],
-            eps_input["tax_rate"],
-            eps_input["shares_outstanding"],
-            eps_input["current_price"],
-            eps_input["base_year"],
-            
-        )
-
-        return make_json_safe({
-            "company_info": company_info,
-            "metrics": metrics,
-            "assumptions": assumptions,
-            "valuationResults": {
-                "dcf": dcf_result,
-                "dcf_sensitivity": dcf_sens_result,
-                "eps": eps_result
-            }
-        })
+    }
+
+
+@router.post("/yahoo-profile", response_class=FastJSONResponse)
+def get_yahoo_profile(
+    data: dict = Body(...),
+    fields: Optional[str] = Query(None, description="Comma-separated metric names; default is every metric"),
+    years: Optional[int] = Query(None, ge=1, le=50, description="Annual periods of history; default YAHOO_HISTORY_YEARS"),
+    db: Session = Depends(get_db),
+):
+    try:
+        fields = parse_metric_fields(fields)
+        return FastJSONResponse(build_yahoo_profile(data.get("ticker"), fields, years=years, db=db))
 
     except Exception as e:
         import traceback
@@ -0,0 +1,111 @@
+# services/blob_store.py
+"""
+Storage for rendered report PDFs.
+
+BlobStore is the small interface the routes use: put / size / read_range / delete on
+string keys such as "<user_id>/<report_id>.pdf". LocalBlobStore keeps blobs as files
+under REPORT_BLOB_DIR. An S3-compatible backend only has to implement the same four
+methods (read_range maps to a ranged GET) and be returned by get_blob_store() for its
+REPORT_BLOB_BACKEND value.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Iterator, Optional
+
+from core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobNotFound(KeyError):
+    pass
+
+
+class BlobStore:
+    def put(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        """Blob length in bytes; raises BlobNotFound."""
+        raise NotImplementedError
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Chunks of bytes start..end inclusive (end=None: to the end); raises BlobNotFound."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove the blob; missing keys are ignored."""
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"Blob key escapes the store: {key!r}")
+        return path
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write-then-rename so a concurrent download never sees a partial file
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._path(key))
+        except FileNotFoundError:
+            raise BlobNotFound(key)
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        try:
+            f = open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFound(key)
+        return self._chunks(f, start, end)
+
+    @staticmethod
+    def _chunks(f, start: int, end: Optional[int]) -> Iterator[bytes]:
+        with f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        backend = settings.REPORT_BLOB_BACKEND.lower()
+        if backend == "local":
+            _store = LocalBlobStore(settings.REPORT_BLOB_DIR)
+        else:
+            raise ValueError(f"Unknown REPORT_BLOB_BACKEND: {settings.REPORT_BLOB_BACKEND}")
+    return _store
@@ -1,5 +1,6 @@
 # Enhanced Simple PDF Generator with Valuation Bars (like webapp)
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import Response
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image, Flowable
@@ -15,6 +16,7 @@ from io import BytesIO
 from typing import Dict, Any, Optional
 import json
 from datetime import datetime
+from services.worker_pool import PoolSaturated, WorkerCrashed
 
 router = APIRouter()
 
@@ -308,14 +310,21 @@ class EnhancedPDFGenerator:
 
     def create_header_footer(self, canvas, doc):
         """Add header and footer to each page"""
-        # Header
+        # Static header/footer text is drawn once per document as a form and reused
+        if not canvas.hasForm("header_footer"):
+            canvas.beginForm("header_footer")
+            canvas.saveState()
+            canvas.setFont('Helvetica-Bold', 10)
+            canvas.drawString(30, A4[1] - 30, "Financial Analysis Report")
+            canvas.drawString(A4[0] - 150, A4[1] - 30, f"Generated: {datetime.now().strftime('%Y-%m-%d')}")
+            canvas.drawString(30, 30, "Confidential - For Internal Use Only")
+            canvas.restoreState()
+            canvas.endForm()
+        canvas.doForm("header_footer")
+        
+        # Footer page number
         canvas.saveState()
         canvas.setFont('Helvetica-Bold', 10)
-        canvas.drawString(30, A4[1] - 30, "Financial Analysis Report")
-        canvas.drawString(A4[0] - 150, A4[1] - 30, f"Generated: {datetime.now().strftime('%Y-%m-%d')}")
-        
-        # Footer
-        canvas.drawString(30, 30, "Confidential - For Internal Use Only")
         canvas.drawString(A4[0] - 100, 30, f"Page {doc.page}")
         canvas.restoreState()
 
@@ -892,29 +901,37 @@ class EnhancedPDFGenerator:
         
         return TableStyle(base_style)
 
-# Initialize generator
-pdf_generator = EnhancedPDFGenerator()
-
 @router.post("/generate-enhanced-report")
-async def generate_enhanced_report(data: Dict[str, Any]):
+async def generate_enhanced_report(data: Dict[str, Any], request: Request):
     """Enhanced endpoint with visual bars matching webapp"""
+    # imported here: services.pdf_rendering loads this module inside the PDF workers
+    from services import report_cache
+    from services.pdf_rendering import content_disposition, render_report_cached, report_filename
     try:
         template_type = data.get('template_type', 'standard')
-        pdf_bytes = pdf_generator.generate_pdf(data, template_type)
+        key, pdf_bytes = await render_report_cached(data, template_type, request.headers.get("if-none-match"))
+        if pdf_bytes is None:
+            return Response(status_code=304, headers={"ETag": report_cache.etag(key)})
         
         # Create descriptive filename
-        company_name = data.get('companyInfo', {}).get('name', 'Report')
-        ticker = data.get('companyInfo', {}).get('ticker', '')
-        filename = f"{company_name.replace(' ', '_')}_{ticker}_Report.pdf"
+        filename = report_filename(data)
         
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(pdf_bytes))
+                "Content-Disposition": content_disposition(filename),
+                "Content-Length": str(len(pdf_bytes)),
+                "ETag": report_cache.etag(key),
+                "Cache-Control": "private, no-cache",
             }
         )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except WorkerCrashed as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Enhanced PDF generation timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Enhanced PDF generation failed: {str(e)}")
 
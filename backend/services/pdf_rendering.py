@@ -0,0 +1,95 @@
+# services/pdf_rendering.py
+"""
+Report rendering off the event loop.
+
+ReportLab is synchronous and CPU-bound; a chart-heavy report takes seconds. Routes await
+`pdf_pool.run(render_enhanced_report, data, template_type)` so the work happens in a
+separate worker pool from uploads, bounded by PDF_WORKERS / PDF_MAX_PENDING /
+PDF_TIMEOUT_SECONDS. A full queue raises PoolSaturated (answer 429 + Retry-After), a
+crashed worker WorkerCrashed (503).
+render_report_cached() checks services.report_cache before queueing a render.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from services import report_cache
+from services.worker_pool import BoundedProcessPool
+
+pdf_pool = BoundedProcessPool(
+    "pdf",
+    max_workers=settings.PDF_WORKERS,
+    max_pending=settings.PDF_MAX_PENDING,
+    timeout=settings.PDF_TIMEOUT_SECONDS,
+)
+
+# one generator per worker process, reused across jobs
+_generator = None
+
+
+def render_enhanced_report(data: Dict[str, Any], template_type: str = "standard") -> bytes:
+    """Worker-side job: EnhancedPDFGenerator.generate_pdf(data, template_type)."""
+    global _generator
+    if _generator is None:
+        from services.enhanced_pdf_generator import EnhancedPDFGenerator
+        _generator = EnhancedPDFGenerator()
+    return _generator.generate_pdf(data, template_type)
+
+
+
+def render_fundalq_report(data: Dict[str, Any], template_type: str = "standard") -> bytes:
+    """Worker-side job: pdf.generator.generate_fundalq_report(data, template_type)."""
+    from pdf.generator import generate_fundalq_report
+    return generate_fundalq_report(data, template_type)
+
+
+def render_combined_report(reports: List[Dict[str, Any]], template_type: str = "standard") -> bytes:
+    """Worker-side job: several reports in one PDF with a table of contents."""
+    from pdf.generator import generate_combined_fundalq_report
+    return generate_combined_fundalq_report(reports, template_type)
+
+def ascii_filename(name: str, default: str = "Report.pdf") -> str:
+    """`name` reduced to ASCII letters, digits, '.', '-' and '_' (accents folded, the rest dropped)."""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", folded.replace(" ", "_")).strip("._")
+    return safe or default
+
+
+def content_disposition(filename: str) -> str:
+    """attachment header with an ASCII filename= fallback and the exact name as filename* (RFC 6266)."""
+    exact = re.sub(r"[\x00-\x1f\x7f/\\]+", "_", filename)
+    return f"attachment; filename=\"{ascii_filename(filename)}\"; filename*=UTF-8''{quote(exact, safe='')}"
+
+
+def report_filename(data: Dict[str, Any]) -> str:
+    company_name = data.get('companyInfo', {}).get('name', 'Report')
+    ticker = data.get('companyInfo', {}).get('ticker', '')
+    return f"{company_name.replace(' ', '_')}_{ticker}_Report.pdf"
+
+
+def _cached_report(data: Dict[str, Any], template_type: str, if_none_match: Optional[str]) -> Tuple[str, Optional[bytes]]:
+    # hashing the canonical payload and reading the cached file both block
+    key = report_cache.digest(data, template_type)
+    if report_cache.matches(if_none_match, key):
+        return key, None
+    return key, report_cache.get(key)
+
+
+async def render_report_cached(
+    data: Dict[str, Any], template_type: str = "standard", if_none_match: Optional[str] = None
+) -> Tuple[str, Optional[bytes]]:
+    """
+    (report_cache key, PDF bytes), rendering in the pool only on a cache miss. The bytes are
+    None when if_none_match already names the key (answer 304 with report_cache.etag(key)).
+    """
+    key, pdf_bytes = await run_in_threadpool(_cached_report, data, template_type, if_none_match)
+    if pdf_bytes is None and not report_cache.matches(if_none_match, key):
+        pdf_bytes = await pdf_pool.run(render_enhanced_report, data, template_type)
+        await run_in_threadpool(report_cache.put, key, pdf_bytes)
+    return key, pdf_bytes
@@ -0,0 +1,158 @@
+# services/report_cache.py
+"""
+Content-addressed disk cache for rendered PDF reports.
+
+Entries are PDF bytes keyed by the SHA-256 of the canonical report payload (sorted keys,
+same value rules as the API JSON), the template type, REPORT_TEMPLATE_VERSION and the
+render date (reports print "Generated: <date>", so yesterday's render is never served
+today), so a re-downloaded report skips ReportLab entirely. The key doubles as the
+response ETag.
+
+Files live in PDF_CACHE_DIR and are shared by every API process. Recency is the file
+mtime (touched on each hit). Each process keeps a running count of the directory's files
+and bytes, re-scanned every _RESCAN_SECONDS to pick up other processes' writes; eviction
+scans and removes the oldest files only once a put takes the directory past
+PDF_CACHE_MAX_ENTRIES files or PDF_CACHE_MAX_BYTES bytes.
+
+These functions do blocking file I/O; async callers run them in a thread.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from core.serialization import json_safe
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the report layout changes so stale renders are not served
+REPORT_TEMPLATE_VERSION = "1"
+
+_SUFFIX = ".pdf"
+_RESCAN_SECONDS = 60
+_lock = threading.Lock()
+_usage = {"entries": 0, "bytes": 0, "scanned_at": None}
+
+
+def cache_dir() -> str:
+    path = settings.PDF_CACHE_DIR or os.path.join(tempfile.gettempdir(), "fundaiq-report-cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def digest(data: Dict[str, Any], template_type: str = "standard") -> str:
+    canonical = json.dumps(
+        json_safe(data), sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    h = hashlib.sha256()
+    h.update(f"{REPORT_TEMPLATE_VERSION}\0{template_type}\0{datetime.now():%Y-%m-%d}\0".encode("utf-8"))
+    h.update(canonical.encode("utf-8"))
+    return h.hexdigest()
+
+
+def etag(key: str) -> str:
+    return f'"{key}"'
+
+
+def matches(if_none_match: Optional[str], key: str) -> bool:
+    """True when an If-None-Match header value names this entry (or is '*')."""
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag(key) in tags
+
+
+def _path(key: str) -> str:
+    return os.path.join(cache_dir(), key + _SUFFIX)
+
+
+def get(key: str) -> Optional[bytes]:
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            contents = f.read()
+        os.utime(path)
+    except OSError:
+        return None
+    return contents
+
+
+def put(key: str, pdf_bytes: bytes) -> None:
+    if len(pdf_bytes) > settings.PDF_CACHE_MAX_BYTES:
+        return
+    path = _path(key)
+    try:
+        replaced = os.path.getsize(path)
+    except OSError:
+        replaced = None
+    try:
+        # write-then-rename so another process never reads a partial file
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=_SUFFIX, dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not cache report %s: %s", key, e)
+        return
+    if _over_limit(len(pdf_bytes), replaced):
+        _evict()
+
+
+def _entries() -> list:
+    """[(mtime, size, path)] for every cached report, oldest first."""
+    out = []
+    with os.scandir(cache_dir()) as it:
+        for entry in it:
+            if entry.name.endswith(_SUFFIX) and not entry.name.startswith("."):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, entry.path))
+    out.sort()
+    return out
+
+
+def _over_limit(added: int, replaced: Optional[int]) -> bool:
+    """Account for one put; True when the directory is now past a limit."""
+    with _lock:
+        scanned_at = _usage["scanned_at"]
+        if scanned_at is None or time.monotonic() - scanned_at > _RESCAN_SECONDS:
+            entries = _entries()   # includes the file just written
+            _usage.update(entries=len(entries), bytes=sum(size for _, size, _ in entries), scanned_at=time.monotonic())
+        elif replaced is None:
+            _usage["entries"] += 1
+            _usage["bytes"] += added
+        else:
+            _usage["bytes"] += added - replaced
+        return _usage["entries"] > settings.PDF_CACHE_MAX_ENTRIES or _usage["bytes"] > settings.PDF_CACHE_MAX_BYTES
+
+
+def _evict() -> None:
+    with _lock:
+        entries = _entries()
+        total = sum(size for _, size, _ in entries)
+        while entries and (
+            len(entries) > settings.PDF_CACHE_MAX_ENTRIES
+            or total > settings.PDF_CACHE_MAX_BYTES
+        ):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        _usage.update(entries=len(entries), bytes=total, scanned_at=time.monotonic())
+
+
+def stats() -> dict:
+    entries = _entries()
+    return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
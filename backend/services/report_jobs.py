@@ -0,0 +1,323 @@
+# services/report_jobs.py
+"""
+Background PDF builds with persisted state.
+
+enqueue() stores a report_jobs row and schedules it; the build runs in the PDF worker
+pool (pdf.generator.EnhancedPDFGenerator), where build_report_job() claims the row,
+writes progress (sections built, pages rendered) as the generator reports it and stores
+the finished PDF in the blob store under report-jobs/<id>-<attempt>.pdf. Jobs belong to
+the user who queued them; each user may have REPORT_JOB_MAX_ACTIVE_PER_USER unfinished.
+
+The row is the source of truth, so jobs outlive the process that queued them: at most
+REPORT_JOB_CONCURRENCY jobs occupy PDF workers at once (interactive renders keep the rest),
+and a sweeper re-schedules rows that are still queued or whose running worker stopped
+reporting for REPORT_JOB_STALE_SECONDS (restart, crashed worker), up to
+REPORT_JOB_MAX_ATTEMPTS. Claiming is a conditional UPDATE, so several API processes can
+sweep the same table without building a job twice; every later write from the builder is
+conditioned on the attempt it claimed, so a builder that outlived its timeout or was
+superseded cannot overwrite the row. The sweeper also deletes finished jobs and their
+PDFs after REPORT_JOB_RETENTION_SECONDS.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.db import SessionLocal
+from core.models import ReportJob
+from core.serialization import dumps
+from services.blob_store import get_blob_store
+from services.pdf_rendering import pdf_pool
+from services.worker_pool import PoolSaturated
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _stale_cutoff() -> datetime:
+    return _now() - timedelta(seconds=settings.REPORT_JOB_STALE_SECONDS)
+
+
+class TooManyJobs(RuntimeError):
+    """Raised when a user already has REPORT_JOB_MAX_ACTIVE_PER_USER unfinished jobs."""
+
+
+def blob_key(job_id, attempt: int) -> str:
+    return f"report-jobs/{job_id}-{attempt}.pdf"
+
+
+def to_dict(job: ReportJob) -> dict:
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "template_type": job.template_type,
+        "progress": {"sections_built": job.sections_built, "pages_rendered": job.pages_rendered},
+        "attempts": job.attempts,
+        "error": job.error,
+        "pdf_size_bytes": job.pdf_size_bytes,
+        "created_at": job.created_at.isoformat(),
+        "updated_at": job.updated_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# ---- worker side (runs inside a PDF pool process) ----
+
+_generator = None
+
+
+def _claim(db: Session, job_id: uuid.UUID) -> bool:
+    """Atomically move a queued (or abandoned running) job to running; job.attempts then names this attempt."""
+    result = db.execute(
+        update(ReportJob)
+        .where(
+            ReportJob.id == job_id,
+            ReportJob.attempts < settings.REPORT_JOB_MAX_ATTEMPTS,
+            or_(
+                ReportJob.status == QUEUED,
+                and_(ReportJob.status == RUNNING, ReportJob.updated_at < _stale_cutoff()),
+            ),
+        )
+        .values(status=RUNNING, attempts=ReportJob.attempts + 1, sections_built=0, pages_rendered=0,
+                error=None, updated_at=_now())
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _owned_update(job_id: uuid.UUID, attempt: int):
+    """UPDATE for a running job, matching only while `attempt` is still the one that owns it."""
+    return update(ReportJob).where(ReportJob.id == job_id, ReportJob.status == RUNNING, ReportJob.attempts == attempt)
+
+
+def build_report_job(job_id: str) -> Optional[int]:
+    """Build one job end to end; returns the PDF size, or None if another worker owns it."""
+    global _generator
+    jid = uuid.UUID(job_id)
+    db = SessionLocal()
+    attempt = None
+    try:
+        if not _claim(db, jid):
+            return None
+        job = db.get(ReportJob, jid)
+        attempt = job.attempts
+
+        def progress(sections: int, pages: int) -> None:
+            values = {"updated_at": _now()}
+            if sections:
+                values["sections_built"] = sections
+            if pages:
+                values["pages_rendered"] = pages
+            db.execute(_owned_update(jid, attempt).values(**values))
+            db.commit()
+
+        if _generator is None:
+            from pdf.generator import EnhancedPDFGenerator
+            _generator = EnhancedPDFGenerator()
+        pdf_bytes = _generator.generate_pdf(json.loads(job.payload), job.template_type, progress)
+
+        # timed out (marked failed) or re-claimed by another worker while we were rendering
+        still_owned = db.execute(_owned_update(jid, attempt).values(updated_at=_now())).rowcount == 1
+        db.commit()
+        if not still_owned:
+            logger.warning("Report job %s attempt %s finished after losing the job; result dropped", job_id, attempt)
+            return None
+
+        key = blob_key(jid, attempt)
+        store = get_blob_store()
+        store.put(key, pdf_bytes)
+        result = db.execute(
+            _owned_update(jid, attempt)
+            .values(status=DONE, pdf_blob_key=key, pdf_size_bytes=len(pdf_bytes),
+                    updated_at=_now(), finished_at=_now())
+        )
+        db.commit()
+        if result.rowcount != 1:
+            store.delete(key)
+            return None
+        return len(pdf_bytes)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Report job {job_id} failed: {str(e)}")
+        if attempt is not None:
+            _mark_failed(db, jid, str(e) or type(e).__name__, attempt)
+        return None
+    finally:
+        db.close()
+
+
+def _mark_failed(db: Session, job_id: uuid.UUID, error: str, attempt: Optional[int] = None) -> None:
+    """Fail an unfinished job; with `attempt`, only while that attempt still owns it."""
+    stmt = _owned_update(job_id, attempt) if attempt is not None else (
+        update(ReportJob).where(ReportJob.id == job_id, ReportJob.status.in_((QUEUED, RUNNING)))
+    )
+    try:
+        db.execute(stmt.values(status=FAILED, error=error[:2000], updated_at=_now(), finished_at=_now()))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Could not mark report job %s failed: %s", job_id, e)
+
+
+# ---- API side ----
+
+_slots = asyncio.Semaphore(max(1, settings.REPORT_JOB_CONCURRENCY))
+_scheduled: set = set()
+_tasks: set = set()
+
+
+async def _dispatch(job_id: uuid.UUID) -> None:
+    try:
+        async with _slots:
+            while True:
+                try:
+                    await pdf_pool.run(build_report_job, str(job_id), timeout=settings.REPORT_JOB_TIMEOUT_SECONDS)
+                    return
+                except PoolSaturated:
+                    # interactive renders hold the pool; wait for a slot instead of failing the job
+                    await asyncio.sleep(1)
+                except asyncio.TimeoutError:
+                    await run_in_threadpool(
+                        _fail_job, job_id, f"Report generation exceeded {settings.REPORT_JOB_TIMEOUT_SECONDS}s"
+                    )
+                    return
+                except Exception as e:
+                    # e.g. the worker process died; the row stays running and the sweeper retries it
+                    logger.warning("Report job %s interrupted: %s", job_id, e)
+                    return
+    finally:
+        _scheduled.discard(job_id)
+
+
+def _fail_job(job_id: uuid.UUID, error: str) -> None:
+    db = SessionLocal()
+    try:
+        _mark_failed(db, job_id, error)
+    finally:
+        db.close()
+
+
+def schedule(job_id: uuid.UUID) -> None:
+    """Start building job_id in the background (no-op if this process already has it)."""
+    if job_id in _scheduled:
+        return
+    _scheduled.add(job_id)
+    task = asyncio.get_running_loop().create_task(_dispatch(job_id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def _insert_job(db: Session, user_id: uuid.UUID, data: Dict[str, Any], template_type: str) -> ReportJob:
+    active = db.execute(
+        select(func.count()).select_from(ReportJob)
+        .where(ReportJob.user_id == user_id, ReportJob.status.in_((QUEUED, RUNNING)))
+    ).scalar_one()
+    if active >= settings.REPORT_JOB_MAX_ACTIVE_PER_USER:
+        raise TooManyJobs(f"{active} report jobs already pending, wait for one to finish")
+    now = _now()
+    job = ReportJob(
+        id=uuid.uuid4(), user_id=user_id, status=QUEUED, template_type=template_type,
+        payload=dumps(data).decode("utf-8"), sections_built=0, pages_rendered=0, attempts=0,
+        created_at=now, updated_at=now,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+async def enqueue(db: Session, user_id: uuid.UUID, data: Dict[str, Any], template_type: str = "standard") -> ReportJob:
+    """Store a job for user_id (TooManyJobs past the per-user limit) and start building it."""
+    # the session is synchronous: query in the threadpool, schedule on the loop
+    job = await run_in_threadpool(_insert_job, db, user_id, data, template_type)
+    schedule(job.id)
+    return job
+
+
+def _pending_job_ids() -> list:
+    """Fail abandoned jobs out of attempts; ids of queued and abandoned ones, oldest first."""
+    db = SessionLocal()
+    try:
+        abandoned = and_(ReportJob.status == RUNNING, ReportJob.updated_at < _stale_cutoff())
+        db.execute(
+            update(ReportJob)
+            .where(abandoned, ReportJob.attempts >= settings.REPORT_JOB_MAX_ATTEMPTS)
+            .values(status=FAILED, error="Report generation was interrupted too many times",
+                    updated_at=_now(), finished_at=_now())
+        )
+        db.commit()
+        return db.execute(
+            select(ReportJob.id).where(or_(ReportJob.status == QUEUED, abandoned)).order_by(ReportJob.created_at)
+        ).scalars().all()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Report jobs unavailable: %s", e)
+        return []
+    finally:
+        db.close()
+
+
+async def resume_jobs() -> int:
+    """Schedule queued and abandoned jobs; fail abandoned ones out of attempts. Returns the number scheduled."""
+    ids = await run_in_threadpool(_pending_job_ids)
+    for job_id in ids:
+        schedule(job_id)
+    return len(ids)
+
+
+def purge_finished_jobs() -> int:
+    """Delete finished jobs older than REPORT_JOB_RETENTION_SECONDS and their PDFs. Returns the number deleted."""
+    cutoff = _now() - timedelta(seconds=settings.REPORT_JOB_RETENTION_SECONDS)
+    db = SessionLocal()
+    try:
+        expired = db.execute(
+            select(ReportJob.id, ReportJob.pdf_blob_key)
+            .where(ReportJob.status.in_((DONE, FAILED)), ReportJob.finished_at < cutoff)
+        ).all()
+        store = get_blob_store()
+        for _, key in expired:
+            if key:
+                store.delete(key)
+        if expired:
+            db.execute(delete(ReportJob).where(ReportJob.id.in_([job_id for job_id, _ in expired])))
+            db.commit()
+        return len(expired)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Report jobs unavailable: %s", e)
+        return 0
+    finally:
+        db.close()
+
+
+async def sweep_forever() -> None:
+    """Resume jobs at startup, then keep picking up abandoned ones and expiring old ones."""
+    while True:
+        resumed = await resume_jobs()
+        if resumed:
+            logger.info("Scheduled %d pending report job(s)", resumed)
+        purged = await run_in_threadpool(purge_finished_jobs)
+        if purged:
+            logger.info("Deleted %d expired report job(s)", purged)
+        await asyncio.sleep(max(settings.REPORT_JOB_STALE_SECONDS / 2, 1))
+
+
+def start_sweeper() -> None:
+    task = asyncio.get_running_loop().create_task(sweep_forever())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
@@ -0,0 +1,137 @@
+# services/statement_history.py
+"""
+Accumulated Yahoo statement history per ticker.
+
+Yahoo only returns the latest few annual (~4) and quarterly (~5) periods. Every period a
+fetch returns is upserted into yahoo_statement_periods, and the tables handed to the
+metrics are rebuilt from everything stored for the ticker, so 10-year charts and
+long-horizon CAGRs come from local storage once enough refreshes have been seen.
+
+Both operate on fetch_yahoo_financials2()-shaped dicts:
+  merge_history(db, ticker, fetched)  - persist fetched periods, return the full history
+  last_periods(result, years)         - the most recent `years` annual periods (and quarters)
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from core.models import YahooStatementPeriod
+
+logger = logging.getLogger(__name__)
+
+ANNUAL_STATEMENTS = ("pnl", "balance_sheet", "cashflow")
+STATEMENTS = ANNUAL_STATEMENTS + ("quarters",)
+
+# Annual labels are "Mar-YYYY", quarterly "Dec-2024"; both parse as month-year
+PERIOD_FORMAT = "%b-%Y"
+
+# same depth as the workbook's Quarters table
+QUARTERS_KEPT = 10
+
+
+def _period_date(label) -> Optional[date]:
+    try:
+        return datetime.strptime(label, PERIOD_FORMAT).date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _labels(result: dict, statement: str) -> list:
+    if statement == "quarters":
+        return result.get("qtrs") or []
+    return (result.get("periods") or {}).get(statement) or []
+
+
+def _by_period(table: dict, labels: list) -> dict:
+    """{period date: {item: value}} for the columns whose label is a month-year."""
+    out = {}
+    for i, label in enumerate(labels):
+        period = _period_date(label)
+        if period is not None:
+            out[period] = {item: values[i] for item, values in table.items() if i < len(values)}
+    return out
+
+
+def _rebuild(fetched: dict, history: dict) -> dict:
+    result = dict(fetched)
+    periods = {}
+    for statement in STATEMENTS:
+        by_period = history[statement]
+        dates = sorted(by_period)
+        # fetched rows keep their mapping order; items only older periods had go last
+        items = list(fetched.get(statement) or {})
+        for line_items in by_period.values():
+            items.extend(item for item in line_items if item not in items)
+        result[statement] = OrderedDict(
+            (item, [by_period[d].get(item, 0) for d in dates]) for item in items
+        )
+        periods[statement] = [d.strftime(PERIOD_FORMAT) for d in dates]
+
+    result["qtrs"] = periods.pop("quarters")
+    result["periods"] = periods
+    result["years"] = periods["pnl"] or periods["balance_sheet"] or periods["cashflow"] or fetched.get("years")
+    return result
+
+
+def merge_history(db: Session, ticker: str, fetched: dict) -> dict:
+    """
+    Upsert every fetched period for `ticker` and return `fetched` with its statements
+    replaced by the full stored history (oldest first). A fresh 0 does not overwrite a
+    stored non-zero value: Yahoo drops line items from older columns over time.
+    If the history table is unavailable the fetched statements are returned unchanged.
+    """
+    key = ticker.strip().upper()
+    try:
+        history = {statement: {} for statement in STATEMENTS}
+        rows = db.execute(
+            select(YahooStatementPeriod).where(YahooStatementPeriod.ticker == key)
+        ).scalars().all()
+        for row in rows:
+            if row.statement in history:
+                history[row.statement][row.period] = json.loads(row.line_items)
+
+        for statement in STATEMENTS:
+            stored = history[statement]
+            fresh = _by_period(fetched.get(statement) or {}, _labels(fetched, statement))
+            for period, line_items in fresh.items():
+                old = stored.get(period, {})
+                merged = {**old, **{k: v for k, v in line_items.items() if v != 0 or not old.get(k)}}
+                if merged != old:
+                    stored[period] = merged
+                    db.merge(YahooStatementPeriod(
+                        ticker=key, statement=statement, period=period, line_items=json.dumps(merged),
+                    ))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Statement history unavailable for %s: %s", key, e)
+        return fetched
+
+    return _rebuild(fetched, history)
+
+
+def last_periods(result: dict, years: int, quarters: int = QUARTERS_KEPT) -> dict:
+    """The latest `years` periods of each annual statement and `quarters` quarters."""
+    out = dict(result)
+    periods = {}
+    for statement in STATEMENTS:
+        labels = _labels(result, statement)
+        keep = years if statement in ANNUAL_STATEMENTS else quarters
+        if len(labels) > keep:
+            cut = len(labels) - keep
+            out[statement] = OrderedDict((item, values[cut:]) for item, values in (result.get(statement) or {}).items())
+            labels = labels[cut:]
+        periods[statement] = labels
+
+    out["qtrs"] = periods.pop("quarters")
+    out["periods"] = periods
+    out["years"] = periods["pnl"] or periods["balance_sheet"] or periods["cashflow"] or result.get("years")
+    return out
@@ -0,0 +1,194 @@
+# services/upload_intake.py
+"""
+Streaming intake for workbook uploads.
+
+Uploads are copied in fixed-size chunks into a SpooledUpload: small files stay in
+memory, anything past UPLOAD_SPOOL_THRESHOLD_BYTES is moved to a temp file on disk so
+openpyxl (in the worker process) can read it lazily by path. The SHA-256 used by the
+workbook cache is computed while copying, and UPLOAD_MAX_BYTES is enforced per file.
+
+The request body itself is capped before FastAPI's multipart parser spools it: routes on
+a CappedBodyRoute router declare a limit with @max_body(n), and a larger Content-Length
+is refused before anything is read, while a body without one (chunked) is cut off with
+413 as soon as the received bytes pass the limit.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import Callable, Optional, Union
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries, part headers and small form fields on top of the file bytes
+
+
+class UploadTooLarge(ValueError):
+    """Raised as soon as an upload grows past its size limit."""
+
+    def __init__(self, name: Optional[str], limit: int):
+        size = f"{limit // (1024 * 1024)} MB" if limit >= 1024 * 1024 else f"{limit} bytes"
+        super().__init__(f"{name or 'Upload'} exceeds the maximum size of {size}")
+
+
+class _BodyTooLarge(HTTPException):
+    # an HTTPException so FastAPI's body parsing lets it through instead of answering 400
+    def __init__(self):
+        super().__init__(status_code=413)
+
+
+def max_body(limit: int) -> Callable:
+    """Endpoint decorator: the most file bytes a request to it may carry (see CappedBodyRoute)."""
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.max_body_bytes = limit
+        return endpoint
+    return decorate
+
+
+class CappedBodyRoute(APIRoute):
+    """Route that refuses request bodies past the endpoint's @max_body limit while they arrive."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        limit = getattr(self.endpoint, "max_body_bytes", None)
+        if limit is None:
+            return handler
+        cap = limit + MULTIPART_OVERHEAD
+
+        def too_large() -> JSONResponse:
+            return JSONResponse(content={"error": str(UploadTooLarge(None, limit))}, status_code=413)
+
+        async def capped_handler(request: Request):
+            declared = request.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > cap:
+                return too_large()
+            received = 0
+
+            async def receive():
+                nonlocal received
+                message = await request.receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > cap:
+                        raise _BodyTooLarge()
+                return message
+
+            try:
+                return await handler(Request(request.scope, receive))
+            except _BodyTooLarge:
+                return too_large()
+
+        return capped_handler
+
+
+class SpooledUpload:
+    def __init__(self, filename: Optional[str], max_bytes: Optional[int] = None, threshold: Optional[int] = None):
+        self.filename = filename
+        self.max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+        self.threshold = settings.UPLOAD_SPOOL_THRESHOLD_BYTES if threshold is None else threshold
+        self.size = 0
+        self.path: Optional[str] = None
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._fh = None
+
+    @property
+    def on_disk(self) -> bool:
+        return self.path is not None
+
+    @property
+    def digest(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def source(self) -> Union[str, bytes]:
+        """What to hand parse_excel: a path once spooled to disk, otherwise the bytes."""
+        return self.path if self.path is not None else bytes(self._buffer)
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(self.filename, self.max_bytes)
+        self._hash.update(chunk)
+        if self._fh is None and self.size > self.threshold:
+            self._fh = tempfile.NamedTemporaryFile(
+                prefix="upload-", suffix=".xlsx", dir=settings.UPLOAD_SPOOL_DIR or None, delete=False
+            )
+            self.path = self._fh.name
+            self._fh.write(self._buffer)
+            self._buffer = bytearray()
+        if self._fh is not None:
+            self._fh.write(chunk)
+        else:
+            self._buffer += chunk
+
+    def finish(self) -> "SpooledUpload":
+        if self._fh is not None:
+            self._fh.close()
+        return self
+
+    def cleanup(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self._buffer = bytearray()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+
+async def spool_upload(file: UploadFile, max_bytes: Optional[int] = None, threshold: Optional[int] = None) -> SpooledUpload:
+    """Copy an UploadFile into a SpooledUpload chunk by chunk, failing early when it is too large."""
+    upload = SpooledUpload(file.filename, max_bytes=max_bytes, threshold=threshold)
+    try:
+        # multipart parsing already knows the part size; refuse before copying anything
+        if file.size is not None and file.size > upload.max_bytes:
+            raise UploadTooLarge(file.filename, upload.max_bytes)
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if upload.on_disk:
+                await run_in_threadpool(upload.write, chunk)
+            else:
+                upload.write(chunk)
+        return upload.finish()
+    except BaseException:
+        upload.cleanup()
+        raise
+    finally:
+        await file.close()
+
+
+def spool_zip_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, max_bytes: Optional[int] = None) -> SpooledUpload:
+    """Extract one archive member into a SpooledUpload; the limit applies to the real, not declared, size."""
+    upload = SpooledUpload(info.filename, max_bytes=max_bytes)
+    try:
+        if info.file_size > upload.max_bytes:
+            raise UploadTooLarge(info.filename, upload.max_bytes)
+        with zf.open(info) as member:
+            while True:
+                chunk = member.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                upload.write(chunk)
+        return upload.finish()
+    except BaseException:
+        upload.cleanup()
+        raise
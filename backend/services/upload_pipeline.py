@@ -0,0 +1,104 @@
+# services/upload_pipeline.py
+"""
+Workbook -> metrics -> valuations pipeline behind /upload-excel.
+
+Kept free of FastAPI objects so it can run inside a worker process
+(see services/worker_pool.py).
+"""
+from routers.upload_parser import parse_excel
+from metrics.metrics_calculator import METRIC_FIELDS, metrics_from_statements, select_metrics, with_assumption_metrics
+from metrics.statements import statements_from_workbook
+from routers.dcf import calculate_dcf as run_dcf
+from routers.sensitivity import dcf_sensitivity as run_dcf_sensitivity
+from calculators.eps_calculator import project_eps as run_eps
+from routers.dcf import DCFInput
+from routers.sensitivity import SensitivityInput
+
+
+def _calculate(parsed: dict, fields=None) -> dict:
+    return metrics_from_statements(statements_from_workbook(parsed), fields)
+
+
+def analyze_workbook(contents, fields=None) -> dict:
+    """
+    The expensive half: parse the workbook (bytes or a spooled file path) and calculate
+    metrics (cacheable by content digest). With fields, only those metrics and the ones
+    the valuation assumptions need are calculated.
+    """
+    parsed = parse_excel(contents)
+    return {"parsed": parsed, "metrics": _calculate(parsed, with_assumption_metrics(fields))}
+
+
+def complete_analysis(analysis: dict, fields=None):
+    """
+    A cached analysis may hold only the metrics an earlier request selected. Returns a copy
+    with the metrics `fields` needs (None = all) added from the parsed statements, or None
+    when nothing is missing.
+    """
+    needed = METRIC_FIELDS if fields is None else with_assumption_metrics(fields)
+    missing = [f for f in needed if f not in analysis["metrics"]]
+    if not missing:
+        return None
+    return {**analysis, "metrics": {**analysis["metrics"], **_calculate(analysis["parsed"], missing)}}
+
+
+def build_upload_response(analysis: dict, fields=None) -> dict:
+    """The cheap half: assumptions and DCF/EPS valuations from analyze_workbook() output."""
+    company_name = analysis["parsed"]["company_name"]
+    calculated_metrics = analysis["metrics"]
+
+    # Derive assumptions from metrics
+    assumptions = {
+        "current_price": calculated_metrics["current_price"],
+        "base_revenue": calculated_metrics["latest_revenue"],
+        "latest_net_debt": calculated_metrics["latest_net_debt"],
+        "shares_outstanding": calculated_metrics["shares_outstanding"],
+        "ebit_margin": calculated_metrics["ebit_margin"],
+        "depreciation_pct": calculated_metrics["depreciation_pct"],
+        "capex_pct": calculated_metrics["capex_pct"],
+        "wc_change_pct": calculated_metrics["wc_change_pct"],
+        "tax_rate": calculated_metrics["tax_rate"],
+        "interest_pct": calculated_metrics["interest_pct"],
+        "x_years": 3,
+        "growth_x": calculated_metrics["growth_x"],
+        "y_years": 10,
+        "growth_y": calculated_metrics["growth_y"],
+        "growth_terminal": calculated_metrics["growth_terminal"],
+        "base_year": calculated_metrics["base_year"],
+        "interest_exp_pct": calculated_metrics["interest_exp_pct"],
+        "fairvalue_pe": calculated_metrics["fairvalue_pe"],
+    }
+
+    # Run DCF and Sensitivity
+    dcf_result = run_dcf(DCFInput(**assumptions))
+    dcf_sens_result = run_dcf_sensitivity(SensitivityInput(**assumptions))
+
+    # Run EPS projection
+    eps_result = run_eps(
+        assumptions["base_revenue"],
+        3,
+        assumptions["growth_x"],
+        assumptions["ebit_margin"],
+        assumptions["interest_exp_pct"],
+        assumptions["tax_rate"],
+        assumptions["shares_outstanding"],
+        assumptions["current_price"],
+        assumptions["base_year"],
+        assumptions["fairvalue_pe"],
+    )
+
+    # NumPy values / NaN are handled by core.serialization when the response is written
+    return {
+        "company_info": company_name,
+        "metrics": select_metrics(calculated_metrics, fields),
+        "assumptions": assumptions,
+        "valuationResults": {
+            "dcf": dcf_result,
+            "dcf_sensitivity": dcf_sens_result,
+            "eps": eps_result
+        }
+    }
+
+
+def process_workbook(contents: bytes) -> dict:
+    return build_upload_response(analyze_workbook(contents))
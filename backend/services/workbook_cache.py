@@ -0,0 +1,58 @@
+# services/workbook_cache.py
+"""
+Content-addressed cache for uploaded workbooks.
+
+Entries are analyze_workbook() results (parsed statements + calculated metrics) keyed by
+the SHA-256 of the uploaded bytes, so re-uploading the same file skips parse_excel and
+calculate_metrics. Eviction is LRU, bounded by entry count and approximate pickled size.
+"""
+from __future__ import annotations
+
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from core.config import settings
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, tuple[int, Any]]" = OrderedDict()
+_total_bytes = 0
+
+
+def digest(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
+def get(key: str) -> Optional[Any]:
+    with _lock:
+        hit = _entries.get(key)
+        if hit is None:
+            return None
+        _entries.move_to_end(key)
+        return hit[1]
+
+
+def put(key: str, value: Any) -> None:
+    global _total_bytes
+    size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    if size > settings.WORKBOOK_CACHE_MAX_BYTES:
+        return
+    with _lock:
+        old = _entries.pop(key, None)
+        if old is not None:
+            _total_bytes -= old[0]
+        _entries[key] = (size, value)
+        _total_bytes += size
+        while _entries and (
+            len(_entries) > settings.WORKBOOK_CACHE_MAX_ENTRIES
+            or _total_bytes > settings.WORKBOOK_CACHE_MAX_BYTES
+        ):
+            _, (evicted, _) = _entries.popitem(last=False)
+            _total_bytes -= evicted
+
+
+def stats() -> dict:
+    with _lock:
+        return {"entries": len(_entries), "bytes": _total_bytes}
@@ -0,0 +1,126 @@
+# services/worker_pool.py
+"""
+Bounded process pools for CPU-heavy request work (workbook parsing, PDF rendering).
+
+Async endpoints await `pool.run(fn, *args)` so the event loop stays free while a worker
+process does the work. Each pool admits at most `max_pending` jobs (running + queued);
+beyond that `PoolSaturated` is raised so the route can answer 429 instead of piling up
+work. Jobs that exceed `timeout` raise `asyncio.TimeoutError`.
+
+A job that has not started yet is cancelled outright on timeout or client cancellation.
+A job that is already running cannot be interrupted inside the worker; it keeps its
+admission slot until it finishes, so runaway jobs still count against the bound.
+
+If a worker process dies (OOM kill, os._exit, segfault) the executor is broken for good:
+the pool drops it so the next job spawns a fresh one, and the job that saw the crash
+raises `WorkerCrashed` (answer 503).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_POOLS: list["BoundedProcessPool"] = []
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when a pool already holds `max_pending` jobs."""
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised when a worker process died while the pool was running or accepting a job."""
+
+
+class BoundedProcessPool:
+    def __init__(self, name: str, max_workers: int, max_pending: int, timeout: Optional[float] = None):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        _POOLS.append(self)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolSaturated(f"{self.name} queue is full ({self.max_pending} jobs), retry shortly")
+            self._pending += 1
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Forget a broken executor so the next job starts a new one."""
+        with self._lock:
+            if executor is None or self._executor is not executor:
+                return  # another caller already replaced it
+            self._executor = None
+        logger.error("%s worker process died; restarting the pool", self.name)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any):
+        self._acquire()
+        executor = None
+        try:
+            executor = self._get_executor()
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            self._release()
+            self._discard(executor)
+            raise WorkerCrashed(f"{self.name} worker process died, retry shortly") from e
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return executor, future
+
+    def submit(self, fn: Callable[..., Any], *args: Any):
+        """Submit without awaiting; returns a concurrent.futures.Future. Raises PoolSaturated."""
+        return self._submit(fn, *args)[1]
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run fn(*args) in a worker process and await the result."""
+        executor, future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except BrokenProcessPool as e:
+            self._discard(executor)
+            raise WorkerCrashed(f"{self.name} worker process died, retry shortly") from e
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if not future.cancel():
+                logger.warning("%s job still running after timeout/cancel; it will finish in the background", self.name)
+            raise
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools() -> None:
+    for pool in _POOLS:
+        pool.shutdown()
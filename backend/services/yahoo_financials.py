@@ -216,17 +216,78 @@
 #     )
 
 
+import threading
+import time
+
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from fastapi import HTTPException
 from collections import OrderedDict
 
+from core.config import settings
+from core.prices import quote_epoch
+from metrics.utils import round2
+from services.statement_history import last_periods, merge_history
+
+# =========================
+# Statement mapping (Screener label -> Yahoo row), in output order
+# =========================
+
+PNL_ROW_MAP = {
+    "Sales": "Total Revenue",
+    "EBITDA": "EBITDA",
+    "EBIT": "EBIT",
+    "Interest": "Interest Expense",
+    "Net profit": "Net Income",
+    "Tax": "Tax Provision",
+    "Depreciation": "Reconciled Depreciation",
+}
+
+BS_ROW_MAP = {
+    "Equity Share Capital": "Common Stock Equity",
+    # "Reserves": "Other Equity Interest",  # keep commented as in your code
+    "Borrowings": "Total Debt",
+    "Investments": "Other Short Term Investments",
+    "Cash & Bank": "Cash And Cash Equivalents",
+    "Net Block": "Net PPE",
+    "Capital Work in Progress": "Construction In Progress",
+    "No. of Equity Shares": "Ordinary Shares Number",
+}
+
+CF_ROW_MAP = {
+    "Cash from Operating Activity": "Operating Cash Flow",
+    "Cash from Investing Activity": "Investing Cash Flow",
+    "Cash from Financing Activity": "Financing Cash Flow",
+    "Net Cash Flow": "Changes In Cash",
+}
+
+# Screener "Quarters" rows; Yahoo's EBITDA already includes other income
+QUARTERLY_ROW_MAP = {
+    "Sales": "Total Revenue",
+    "Operating Profit": "EBITDA",
+    "Depreciation": "Reconciled Depreciation",
+    "Interest": "Interest Expense",
+    "Net profit": "Net Income",
+}
+
+# Counts, not money: metrics divide these by 1e7 themselves, as for the Screener sheet
+UNSCALED_LABELS = frozenset({"No. of Equity Shares"})
+
+# ticker -> (fetched_at, fetch_yahoo_financials2() result). Statements change at most
+# once a quarter, so annual and quarterly tables are reused for YAHOO_STATEMENTS_TTL_SECONDS.
+_STATEMENTS: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+_STATEMENTS_LOCK = threading.Lock()
+
+# ticker -> (quote_epoch, info); info carries the price, so it follows the quote TTL
+_INFO: dict[str, tuple[int, dict]] = {}
+_INFO_LOCK = threading.Lock()
+
 # =========================
 # Public API
 # =========================
 
-def fetch_yahoo_financials(ticker: str):
+def fetch_yahoo_financials(ticker: str, years: int | None = None, db=None):
     """
     Top-level fetch used by your API.
     - Pulls company info
@@ -236,11 +297,11 @@ def fetch_yahoo_financials(ticker: str):
         * parses into OrderedDicts scaled to crores
         * returns years and optional currency meta
     - Returns a dict matching your existing shape, plus optional currency meta.
+    - years: annual periods to return (default YAHOO_HISTORY_YEARS). With a db session,
+      periods seen on earlier refreshes are included (see services/statement_history.py).
     """
     result = {}
-    ticker_obj = yf.Ticker(ticker)
-
-    info = ticker_obj.info or {}
+    info = get_yahoo_info(ticker)
     result["company_info"] = {
         "name": info.get("longName") or info.get("shortName"),
         "ticker": ticker,
@@ -252,15 +313,17 @@ def fetch_yahoo_financials(ticker: str):
     }
 
     try:
-        financials = fetch_yahoo_financials2(ticker)
+        financials = last_periods(get_yahoo_statements(ticker, db), years or settings.YAHOO_HISTORY_YEARS)
 
         # Use parsed dicts (already normalized if .NS/.BO)
         result.update({
             "pnl": financials["pnl"],
             "balance_sheet": financials["balance_sheet"],
             "cashflow": financials["cashflow"],
-            "quarters": {},  # unchanged placeholder
+            "quarters": financials["quarters"],
+            "qtrs": financials["qtrs"],
             "years": financials["years"],
+            "periods": financials["periods"],
             "info": info,
             # Optional meta for UI/debug
             "reporting_currency": financials.get("reporting_currency"),
@@ -273,10 +336,56 @@ def fetch_yahoo_financials(ticker: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def get_yahoo_info(ticker: str) -> dict:
+    """Ticker.info, reused within the current quote epoch (QUOTE_TTL_SECONDS)."""
+    key = ticker.strip().upper()
+    epoch = quote_epoch()
+    with _INFO_LOCK:
+        hit = _INFO.get(key)
+    if hit and hit[0] == epoch:
+        return hit[1]
+
+    info = yf.Ticker(ticker).info or {}
+    with _INFO_LOCK:
+        _INFO[key] = (epoch, info)
+    return info
+
+
+def get_yahoo_statements(ticker: str, db=None) -> dict:
+    """
+    fetch_yahoo_financials2(ticker), cached per ticker for YAHOO_STATEMENTS_TTL_SECONDS
+    (LRU, at most YAHOO_STATEMENTS_CACHE_MAX_ENTRIES tickers). Treat the result as read-only.
+    The cache holds the raw fetch; with a db session it is merged into the stored history on
+    every call (hit or miss), so the result holds every period seen for the ticker.
+    """
+    key = ticker.strip().upper()
+    now = time.time()
+    with _STATEMENTS_LOCK:
+        hit = _STATEMENTS.get(key)
+        if hit and now - hit[0] < settings.YAHOO_STATEMENTS_TTL_SECONDS:
+            _STATEMENTS.move_to_end(key)
+            statements = hit[1]
+        else:
+            statements = None
+
+    if statements is None:
+        statements = fetch_yahoo_financials2(ticker)
+        with _STATEMENTS_LOCK:
+            _STATEMENTS[key] = (now, statements)
+            _STATEMENTS.move_to_end(key)
+            while len(_STATEMENTS) > settings.YAHOO_STATEMENTS_CACHE_MAX_ENTRIES:
+                _STATEMENTS.popitem(last=False)
+    if db is not None:
+        statements = merge_history(db, ticker, statements)
+    return statements
+
+
 def fetch_yahoo_financials2(ticker: str):
     """
     Fetch raw Yahoo statements, normalize to INR only for .NS/.BO,
-    then parse into OrderedDicts with rows in a fixed order and values scaled to crores.
+    then parse into OrderedDicts with rows in a fixed order and values scaled to crores
+    (share counts stay absolute, as in the Screener sheet). Quarterly results are parsed
+    the same way for TTM figures; a ticker without them just gets empty quarters.
     """
     try:
         stock = yf.Ticker(ticker)
@@ -285,6 +394,7 @@ def fetch_yahoo_financials2(ticker: str):
         financials = stock.financials
         balance_sheet = stock.balance_sheet
         cashflow = stock.cashflow
+        quarterly = stock.quarterly_financials
 
         if financials is None or balance_sheet is None or cashflow is None:
             raise ValueError("One or more financial statements are None from Yahoo.")
@@ -297,110 +407,22 @@ def fetch_yahoo_financials2(ticker: str):
             financials, balance_sheet, cashflow, ccy_meta = normalize_statements_to_inr(
                 stock, financials, balance_sheet, cashflow, explicit_currency=None
             )
+            quarterly = _convert_statement_df_to_inr(quarterly, ccy_meta["original_currency"])
         else:
             # If not India ticker, preserve original currency for debug (optional)
             orig = _detect_financial_currency_from_info(stock, fallback=None)
             ccy_meta = {"reporting_currency": None, "original_currency": (orig or None)}
 
-        # -------------------------------
-        # Mapping & Parsing (unchanged)
-        # -------------------------------
-
-        # P&L mapping and order
-        pnl_row_map = {
-            "Sales": "Total Revenue",
-            "EBITDA": "EBITDA",
-            "EBIT": "EBIT",
-            "Interest": "Interest Expense",
-            "Net profit": "Net Income",
-            "Tax": "Tax Provision",
-            "Depreciation": "Reconciled Depreciation",
-        }
-        pnl_row_order = list(pnl_row_map.keys())
-
-        # Balance Sheet mapping and order
-        bs_row_map = {
-            "Equity Share Capital": "Common Stock Equity",
-            # "Reserves": "Other Equity Interest",  # keep commented as in your code
-            "Borrowings": "Total Debt",
-            "Investments": "Other Short Term Investments",
-            "Cash & Bank": "Cash And Cash Equivalents",
-            "Net Block": "Net PPE",
-            "Capital Work in Progress": "Construction In Progress",
-            "No. of Equity Shares": "Ordinary Shares Number",
-        }
-        bs_row_order = list(bs_row_map.keys())
-
-        # Cash Flow mapping and order
-        cf_row_map = {
-            "Cash from Operating Activity": "Operating Cash Flow",
-            "Cash from Investing Activity": "Investing Cash Flow",
-            "Cash from Financing Activity": "Financing Cash Flow",
-            "Net Cash Flow": "Changes In Cash",
-        }
-        cf_row_order = list(cf_row_map.keys())
-
-        def clean_and_parse_df(df: pd.DataFrame, row_map: dict, row_order: list) -> (OrderedDict, list):
-            parsed = OrderedDict()
-            if df is None or df.empty:
-                return parsed, []
-
-            # Fill and ensure numeric where possible
-            df = df.fillna(0)
-
-            # Yahoo frames are usually "items x periods" -> columns are dates; reverse oldest→newest
-            try:
-                df = df[df.columns[::-1]]
-            except Exception:
-                pass  # if columns can’t be reversed, keep as is
-
-            # Drop all-zero or all-NaN columns
-            df = df.loc[:, df.apply(lambda col: not all((v == 0) or pd.isna(v) for v in col))]
-
-            # Keep last 4 periods
-            if df.shape[1] > 4:
-                df = df.iloc[:, -4:]
-
-            if df.empty:
-                return parsed, []
-
-            # Format years as "Mar-YYYY" from column dates (best-effort)
-            try:
-                df.columns = pd.to_datetime(df.columns).strftime("Mar-%Y")
-            except Exception:
-                # Fallback: leave original labels
-                pass
-
-            years = list(df.columns)
-
-            missing_labels = []
-            for label in row_order:
-                yahoo_label = row_map.get(label)
-                if yahoo_label and (yahoo_label in df.index):
-                    values = df.loc[yahoo_label].values
-                    safe_values = []
-                    for v in values:
-                        try:
-                            if isinstance(v, (list, tuple, np.ndarray)):
-                                v = v[0] if len(v) > 0 else 0
-                            # Scale to crores (1e7)
-                            safe_values.append(round(float(v) / 1e7, 2))
-                        except Exception:
-                            safe_values.append(0)
-                    parsed[label] = safe_values
-                else:
-                    missing_labels.append(label)
-
-            if not parsed:
-                # Debug info only; avoid raising to keep flow safe
-                print(f"⚠️ None of the expected labels were found. Missing: {missing_labels}")
-                print("Available rows from Yahoo Finance:", list(df.index))
-
-            return parsed, years
-
-        pnl, pnl_years = clean_and_parse_df(financials, pnl_row_map, pnl_row_order)
-        bs, bs_years = clean_and_parse_df(balance_sheet, bs_row_map, bs_row_order)
-        cf, cf_years = clean_and_parse_df(cashflow, cf_row_map, cf_row_order)
+        # every period Yahoo returns; callers pick the depth (fetch_yahoo_financials years=)
+        pnl, pnl_years = clean_and_parse_df(financials, PNL_ROW_MAP, list(PNL_ROW_MAP), max_periods=None)
+        bs, bs_years = clean_and_parse_df(
+            balance_sheet, BS_ROW_MAP, list(BS_ROW_MAP), max_periods=None, unscaled=UNSCALED_LABELS
+        )
+        cf, cf_years = clean_and_parse_df(cashflow, CF_ROW_MAP, list(CF_ROW_MAP), max_periods=None)
+        # quarter labels match the workbook's "Quarters" headers (e.g. "Dec-2024")
+        quarters, qtrs = clean_and_parse_df(
+            quarterly, QUARTERLY_ROW_MAP, list(QUARTERLY_ROW_MAP), max_periods=10, label_format="%b-%Y"
+        )
 
         # Choose years from first non-empty
         years = pnl_years or bs_years or cf_years or ["Mar-2024"]
@@ -409,7 +431,11 @@ def fetch_yahoo_financials2(ticker: str):
             "pnl": pnl,
             "balance_sheet": bs,
             "cashflow": cf,
+            "quarters": quarters,
+            "qtrs": qtrs,
             "years": years,
+            # each statement's own columns; balance sheet / cash flow can differ from the P&L
+            "periods": {"pnl": pnl_years, "balance_sheet": bs_years, "cashflow": cf_years},
             # Meta bubbled up (optional)
             "reporting_currency": ccy_meta.get("reporting_currency"),
             "original_currency": ccy_meta.get("original_currency"),
@@ -420,6 +446,64 @@ def fetch_yahoo_financials2(ticker: str):
         raise
 
 
+def clean_and_parse_df(
+    df: pd.DataFrame, row_map: dict, row_order: list, max_periods: int | None = 4, label_format: str = "Mar-%Y",
+    unscaled=frozenset(),
+) -> (OrderedDict, list):
+    """
+    Yahoo statement (items x period dates, newest first) -> ({label: [values]}, periods).
+    Keeps the last max_periods (None: all) periods that have any non-zero value, oldest first, labelled
+    with label_format (annual statements are all "Mar-YYYY"); values are scaled
+    to crores (1e7; labels in unscaled as reported) and rounded to 2 decimals. The frame is
+    converted to one float array up front and filtered/scaled as a whole.
+    """
+    parsed = OrderedDict()
+    if df is None or df.empty:
+        return parsed, []
+
+    # Numeric in one pass; text and missing cells count as 0
+    try:
+        values = df.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        values = df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    values = np.where(np.isnan(values), 0.0, values)
+
+    # Yahoo frames are "items x periods" -> columns are dates; reverse oldest→newest,
+    # drop all-zero periods and keep the last max_periods
+    keep = np.flatnonzero((values[:, ::-1] != 0).any(axis=0))
+    if max_periods is not None:
+        keep = keep[-max_periods:]
+    if not len(keep):
+        return parsed, []
+    columns = df.columns[::-1][keep]
+    values = values[:, ::-1][:, keep]
+
+    # Format period labels from column dates (best-effort)
+    try:
+        years = [pd.Timestamp(c).strftime(label_format) for c in columns]
+    except Exception:
+        # Fallback: leave original labels
+        years = list(columns)
+
+    # Repeated Yahoo row names: the first one wins
+    row_of = {}
+    for i, name in enumerate(df.index):
+        row_of.setdefault(name, i)
+
+    labels = [label for label in row_order if row_map.get(label) in row_of]
+    if labels:
+        # Scale to crores (1e7)
+        scale = np.array([1.0 if label in unscaled else 1e7 for label in labels])
+        block = values[[row_of[row_map[label]] for label in labels]] / scale[:, None]
+        parsed.update(zip(labels, round2(block).tolist()))
+    else:
+        # Debug info only; avoid raising to keep flow safe
+        print(f"⚠️ None of the expected labels were found. Missing: {list(row_order)}")
+        print("Available rows from Yahoo Finance:", list(df.index))
+
+    return parsed, years
+
+
 # =========================
 # India detection + normalization (helpers)
 # =========================